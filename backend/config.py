@@ -4,11 +4,65 @@ from pathlib import Path
 
 class Settings(BaseSettings):
     GROK_API_KEY: str
+    GROK_API_URL: str = "https://api.x.ai/v1/chat/completions"
+    GROK_RATE_LIMIT_DELAY: float = 6.0  # Seconds between Grok requests (10 req/min)
+    GROK_MAX_CONCURRENCY: int = 4  # Upper bound for the adaptive concurrency limit
+    GROK_LATENCY_TARGET_SECONDS: float = 30.0  # Slower calls shrink the concurrency limit
+    GROK_MAX_RETRIES: int = 3  # In-call retries for 429, 5xx and timeouts
+    GROK_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open the circuit
+    GROK_CIRCUIT_RESET_SECONDS: float = 60.0  # Open circuit waits this long before probing
+    GROK_STRUCTURED_OUTPUT: bool = True  # Request json_schema output (auto-disabled if rejected)
     DATABASE_PATH: str = "data/arxiv.db"
     PDF_STORAGE_PATH: str = "data/pdfs"
+    DIGEST_PATH: str = "data/digests"  # Prerendered daily digests, served under /digest/
+    PDF_STORAGE_QUOTA_MB: float = 0  # Evict least recently used PDFs above this (0 = unlimited; bookmarks kept)
     ARXIV_SEARCH_QUERY: str = 'cat:cs.CR AND (abs:LLM OR abs:"Large Language Model" OR abs:"Generative AI" OR abs:GenAI)'
     ARXIV_MAX_RESULTS: int = 10
     ARXIV_DAYS_BACK: int = 7
+    ARXIV_API_URL: str = "https://export.arxiv.org/api/query"
+    ARXIV_RATE_LIMIT_DELAY: float = 3.0  # Shared spacing between all arXiv requests
+    ARXIV_MAX_CONCURRENCY: int = 3  # Feeds crawled in parallel
+    ARXIV_OAI_URL: str = "https://oaipmh.arxiv.org/oai"
+    OAI_BATCH_SIZE: int = 500  # Rows per batched insert during bulk harvest
+    JOB_WORKER_IN_PROCESS: bool = True  # Run the job worker pool inside the web server
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_LEASE_SECONDS: int = 300
+    JOB_BACKOFF_BASE_SECONDS: float = 30.0
+    JOB_BACKOFF_MAX_SECONDS: float = 3600.0
+    SCHEDULER_ENABLED: bool = False  # Run the periodic fetch inside the web server
+    SCHEDULER_INTERVAL_MINUTES: int = 1440
+    SCHEDULER_JITTER_SECONDS: int = 300
+    FETCH_LOCK_TTL_SECONDS: int = 600  # Renewed while a fetch runs
+    SLOW_QUERY_MS: float = 100.0  # Log statements at least this slow (0 disables)
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0  # Fraction of slow statements logged
+    SLOW_QUERY_EXPLAIN: bool = True  # Attach EXPLAIN QUERY PLAN to slow-query log lines
+    SQL_ECHO: bool = False  # Print every SQL statement (very noisy)
+    SUGGEST_BUDGET_MS: float = 50.0  # SQL time allowed per search suggestion request
+    SUGGEST_CACHE_SIZE: int = 1024  # Prefixes cached in memory
+    SUGGEST_CACHE_SECONDS: float = 60.0
+    SUGGEST_VOCABULARY_SECONDS: float = 300.0  # Age at which the in-memory term list is rebuilt
+    WORKERS: int = 1  # uvicorn worker processes (reload is disabled when above 1)
+    LEADER_LOCK_TTL_SECONDS: int = 30  # One worker runs jobs and the scheduler; others take over after this
+    CHANGE_POLL_SECONDS: float = 1.0  # How often each worker checks the database for writes by others
+    SYNDICATION_ENTRIES: int = 50  # Papers in /feed.atom and /feed.json
+    SYNDICATION_CACHE_SIZE: int = 64  # Feed documents (format x filter) cached per worker
+    SYNDICATION_REBUILD_SECONDS: float = 3600.0  # Age at which a cached feed is rebuilt to pick up edits
+    EVENTS_RETENTION_HOURS: float = 24.0  # Events kept for /api/events clients resuming with Last-Event-ID
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0  # Comment sent on an idle event stream so proxies keep it open
+    EVENTS_STREAM_SECONDS: float = 300.0  # Event streams end after this; the browser reconnects and resumes
+    EVENTS_QUEUE_SIZE: int = 256  # Events buffered per client before it is told to reload instead
+    FTS_MERGE_DELAY_SECONDS: float = 300.0  # Wait after an ingest before merging search index segments
+    FTS_MERGE_STEP_PAGES: int = 500  # Index pages written per merge transaction
+    FTS_MERGE_JOB_SECONDS: float = 20.0  # Merge time per job run; a longer merge continues in the next run
+    FTS_OPTIMIZE_AFTER_PAPERS: int = 2000  # Papers added since the last full merge that make the next one full
+    EXPORT_BATCH_SIZE: int = 500  # Papers read per cursor round-trip and sent per chunk by /api/export
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # logs/*.log as JSON lines, or "text" (the console format)
+    LOG_MAX_MB: float = 10.0  # Size at which a log file is rotated
+    LOG_ROTATE_DAILY: bool = True  # Also rotate at the first record of each day
+    LOG_BACKUP_COUNT: int = 14  # gzip-compressed rotated files kept per log
+    LOG_RATE_LIMIT_PER_MINUTE: int = 60  # INFO/DEBUG records per call site per minute (0: unlimited)
     HOST: str = "127.0.0.1"
     PORT: int = 8000
     DEBUG: bool = True
@@ -18,10 +72,8 @@ class Settings(BaseSettings):
         case_sensitive = True
 
     def get_database_url(self) -> str:
-        """Get SQLite database URL"""
-        db_path = Path(self.DATABASE_PATH)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        return f"sqlite:///{db_path}"
+        """Get SQLite database URL (the directory is created on first connect)"""
+        return f"sqlite:///{Path(self.DATABASE_PATH)}"
 
     def get_pdf_storage_path(self) -> Path:
         """Get PDF storage directory as Path object"""
@@ -29,5 +81,11 @@ class Settings(BaseSettings):
         pdf_path.mkdir(parents=True, exist_ok=True)
         return pdf_path
 
+    def get_digest_path(self) -> Path:
+        """Get digest directory as Path object"""
+        digest_path = Path(self.DIGEST_PATH)
+        digest_path.mkdir(parents=True, exist_ok=True)
+        return digest_path
+
 
 settings = Settings()
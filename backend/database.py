@@ -1,15 +1,71 @@
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.schema import CreateColumn
 from backend.config import settings
-from backend.models import Base
+from backend.models import Base, content_hash, split_arxiv_id
+from backend import metrics, query_stats
 
-# Create engine
+# Create engine. Statement logging goes through the slow-query log below;
+# SQL_ECHO prints every statement and is meant for short debugging sessions only.
 engine = create_engine(
     settings.get_database_url(),
     connect_args={"check_same_thread": False},  # Needed for SQLite
-    echo=settings.DEBUG
+    echo=settings.SQL_ECHO
 )
 
+slow_query_log = query_stats.SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+    explain=settings.SLOW_QUERY_EXPLAIN
+)
+
+
+@event.listens_for(engine, "do_connect")
+def _ensure_database_dir(dialect, conn_rec, cargs, cparams):
+    """Create the database directory on first connect rather than at import"""
+    Path(settings.DATABASE_PATH).parent.mkdir(parents=True, exist_ok=True)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets the server, the fetch task and job workers read while one of them writes"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=10000")
+    cursor.close()
+
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "WITH", "CREATE", "DROP"}
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _record_statement_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["statement_start"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if operation not in _SQL_OPERATIONS:
+        operation = "OTHER"
+    metrics.db_statement_duration.observe(elapsed, operation=operation)
+    query_stats.record(conn, statement, parameters, elapsed, operation, executemany, slow_query_log)
+
+
+@event.listens_for(engine, "handle_error")
+def _discard_statement_timer(exception_context):
+    """Failed statements never reach after_cursor_execute; drop their start time"""
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None and conn.info.get("statement_start"):
+        conn.info["statement_start"].pop()
+
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -23,9 +79,344 @@ def get_db() -> Session:
         db.close()
 
 
+# Triggers that keep papers_fts in sync with the papers table
+FTS_TRIGGERS = {
+    "papers_fts_insert": """
+        CREATE TRIGGER papers_fts_insert AFTER INSERT ON papers BEGIN
+            INSERT INTO papers_fts(rowid, arxiv_id, title, abstract)
+            VALUES (new.id, new.arxiv_id, new.title, new.abstract);
+        END
+    """,
+    # Only edits to indexed columns touch the index. papers_fts is an external-content
+    # table, so old rows are removed with the 'delete' command and the values they were
+    # indexed with (an UPDATE or DELETE of papers_fts would read the papers row, which
+    # has already changed or gone, and corrupt the index)
+    "papers_fts_update": """
+        CREATE TRIGGER papers_fts_update AFTER UPDATE OF arxiv_id, title, abstract ON papers BEGIN
+            INSERT INTO papers_fts(papers_fts, rowid, arxiv_id, title, abstract)
+            VALUES ('delete', old.id, old.arxiv_id, old.title, old.abstract);
+            INSERT INTO papers_fts(rowid, arxiv_id, title, abstract)
+            VALUES (new.id, new.arxiv_id, new.title, new.abstract);
+        END
+    """,
+    "papers_fts_delete": """
+        CREATE TRIGGER papers_fts_delete AFTER DELETE ON papers BEGIN
+            INSERT INTO papers_fts(papers_fts, rowid, arxiv_id, title, abstract)
+            VALUES ('delete', old.id, old.arxiv_id, old.title, old.abstract);
+        END
+    """,
+}
+
+
+def create_fts_triggers(conn):
+    """Create the FTS sync triggers that are missing; returns how many were created"""
+    return _create_triggers(conn, FTS_TRIGGERS)
+
+
+def drop_fts_triggers(conn):
+    """Drop the FTS sync triggers, e.g. to defer index maintenance during bulk loads"""
+    for name in FTS_TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+def rebuild_fts(conn):
+    """Rebuild papers_fts from the papers table in one pass"""
+    conn.execute(text("INSERT INTO papers_fts(papers_fts) VALUES('rebuild')"))
+
+
+def merge_fts(conn, pages: int) -> bool:
+    """
+    Run one FTS5 'merge' step on papers_fts.
+
+    Args:
+        conn: Connection (the step is as long as the caller's transaction)
+        pages: Pages to write at most; positive merges levels that have
+            accumulated several segments, negative merges every segment into
+            one, a step at a time (an incremental 'optimize')
+
+    Returns:
+        True if the step did any work
+    """
+    before = conn.exec_driver_sql("SELECT total_changes()").scalar()
+    conn.execute(text("INSERT INTO papers_fts(papers_fts, rank) VALUES('merge', :pages)"), {"pages": pages})
+    # FTS5 documents that a merge which did no work changes fewer than two rows
+    return conn.exec_driver_sql("SELECT total_changes()").scalar() - before >= 2
+
+
+def optimize_fts(conn):
+    """Merge every papers_fts segment into one in a single transaction"""
+    conn.execute(text("INSERT INTO papers_fts(papers_fts) VALUES('optimize')"))
+
+
+def check_fts(conn):
+    """
+    Verify papers_fts against the papers table.
+
+    Raises:
+        sqlalchemy.exc.DatabaseError: If the index is corrupt or out of sync with papers
+    """
+    conn.execute(text("INSERT INTO papers_fts(papers_fts, rank) VALUES('integrity-check', 1)"))
+
+
+# Triggers that keep paper_categories / paper_authors in sync with the JSON
+# columns, and category_counts / author_counts in sync with those tables
+FACET_TRIGGERS = {
+    "paper_facets_insert": """
+        CREATE TRIGGER paper_facets_insert AFTER INSERT ON papers BEGIN
+            INSERT OR IGNORE INTO paper_categories (paper_id, category)
+            SELECT new.id, value FROM json_each(new.categories) WHERE type = 'text';
+            INSERT OR IGNORE INTO paper_authors (paper_id, name)
+            SELECT new.id, trim(value) FROM json_each(new.authors) WHERE type = 'text' AND trim(value) != '';
+        END
+    """,
+    "paper_facets_update": """
+        CREATE TRIGGER paper_facets_update AFTER UPDATE OF categories, authors ON papers BEGIN
+            DELETE FROM paper_categories WHERE paper_id = old.id;
+            DELETE FROM paper_authors WHERE paper_id = old.id;
+            INSERT OR IGNORE INTO paper_categories (paper_id, category)
+            SELECT new.id, value FROM json_each(new.categories) WHERE type = 'text';
+            INSERT OR IGNORE INTO paper_authors (paper_id, name)
+            SELECT new.id, trim(value) FROM json_each(new.authors) WHERE type = 'text' AND trim(value) != '';
+        END
+    """,
+    "paper_facets_delete": """
+        CREATE TRIGGER paper_facets_delete AFTER DELETE ON papers BEGIN
+            DELETE FROM paper_categories WHERE paper_id = old.id;
+            DELETE FROM paper_authors WHERE paper_id = old.id;
+        END
+    """,
+    "category_counts_insert": """
+        CREATE TRIGGER category_counts_insert AFTER INSERT ON paper_categories BEGIN
+            INSERT INTO category_counts (category, papers) VALUES (new.category, 1)
+            ON CONFLICT (category) DO UPDATE SET papers = papers + 1;
+        END
+    """,
+    "category_counts_delete": """
+        CREATE TRIGGER category_counts_delete AFTER DELETE ON paper_categories BEGIN
+            UPDATE category_counts SET papers = papers - 1 WHERE category = old.category;
+            DELETE FROM category_counts WHERE category = old.category AND papers <= 0;
+        END
+    """,
+    "author_counts_insert": """
+        CREATE TRIGGER author_counts_insert AFTER INSERT ON paper_authors BEGIN
+            INSERT INTO author_counts (name, papers) VALUES (new.name, 1)
+            ON CONFLICT (name) DO UPDATE SET papers = papers + 1;
+        END
+    """,
+    "author_counts_delete": """
+        CREATE TRIGGER author_counts_delete AFTER DELETE ON paper_authors BEGIN
+            UPDATE author_counts SET papers = papers - 1 WHERE name = old.name;
+            DELETE FROM author_counts WHERE name = old.name AND papers <= 0;
+        END
+    """,
+}
+
+
+# A paper's stats keys: each distinct category plus "*" for all papers
+_STATS_CATEGORIES = """
+    SELECT value FROM json_each({row}.categories) WHERE type = 'text' UNION SELECT '*'
+"""
+_STATS_ADD = """
+    INSERT INTO paper_stats (category, day, papers, analyzed)
+    SELECT value, date(new.published_date), 1, EXISTS (SELECT 1 FROM grok_analyses WHERE paper_id = new.id)
+    FROM ({categories}) WHERE true
+    ON CONFLICT (category, day) DO UPDATE SET papers = papers + 1, analyzed = analyzed + excluded.analyzed;
+""".format(categories=_STATS_CATEGORIES.format(row="new"))
+_STATS_REMOVE = """
+    UPDATE paper_stats
+    SET papers = papers - 1, analyzed = analyzed - EXISTS (SELECT 1 FROM grok_analyses WHERE paper_id = old.id)
+    WHERE day = date(old.published_date) AND category IN ({categories});
+    DELETE FROM paper_stats WHERE day = date(old.published_date) AND papers <= 0;
+""".format(categories=_STATS_CATEGORIES.format(row="old"))
+_STATS_ANALYZED = """
+    UPDATE paper_stats SET analyzed = analyzed {sign} 1
+    WHERE day = (SELECT date(published_date) FROM papers WHERE id = {row}.paper_id)
+      AND category IN (
+          SELECT j.value FROM papers, json_each(papers.categories) AS j
+          WHERE papers.id = {row}.paper_id AND j.type = 'text'
+          UNION SELECT '*'
+      );
+"""
+
+# Triggers that keep paper_stats in step with papers and grok_analyses
+STATS_TRIGGERS = {
+    "paper_stats_insert": f"CREATE TRIGGER paper_stats_insert AFTER INSERT ON papers BEGIN {_STATS_ADD} END",
+    "paper_stats_update": (
+        "CREATE TRIGGER paper_stats_update AFTER UPDATE OF categories, published_date ON papers "
+        f"BEGIN {_STATS_REMOVE} {_STATS_ADD} END"
+    ),
+    "paper_stats_delete": f"CREATE TRIGGER paper_stats_delete AFTER DELETE ON papers BEGIN {_STATS_REMOVE} END",
+    "analysis_stats_insert": (
+        "CREATE TRIGGER analysis_stats_insert AFTER INSERT ON grok_analyses "
+        f"BEGIN {_STATS_ANALYZED.format(sign='+', row='new')} END"
+    ),
+    "analysis_stats_delete": (
+        "CREATE TRIGGER analysis_stats_delete AFTER DELETE ON grok_analyses "
+        f"BEGIN {_STATS_ANALYZED.format(sign='-', row='old')} END"
+    ),
+}
+
+
+def _create_triggers(conn, triggers) -> int:
+    """Create missing triggers and replace ones whose definition changed; returns how many were (re)created"""
+    created = 0
+    for name, ddl in triggers.items():
+        current = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type='trigger' AND name=:name"), {"name": name}
+        ).scalar()
+        if current is not None and current.split() == ddl.split():
+            continue
+        if current is not None:
+            conn.execute(text(f"DROP TRIGGER {name}"))
+        conn.execute(text(ddl))
+        created += 1
+    return created
+
+
+def create_facet_triggers(conn):
+    """Create the category/author sync triggers that are missing; returns how many were created"""
+    return _create_triggers(conn, FACET_TRIGGERS)
+
+
+def drop_facet_triggers(conn):
+    """Drop the category/author sync triggers, e.g. during bulk loads (rebuild_facets restores them)"""
+    for name in FACET_TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+def rebuild_facets(conn):
+    """Refill paper_categories, paper_authors and their counts from the JSON columns, then restore the triggers"""
+    drop_facet_triggers(conn)
+    for table in ("paper_categories", "paper_authors", "category_counts", "author_counts"):
+        conn.execute(text(f"DELETE FROM {table}"))
+    conn.execute(text("""
+        INSERT OR IGNORE INTO paper_categories (paper_id, category)
+        SELECT papers.id, j.value FROM papers, json_each(papers.categories) AS j WHERE j.type = 'text'
+    """))
+    conn.execute(text("""
+        INSERT OR IGNORE INTO paper_authors (paper_id, name)
+        SELECT papers.id, trim(j.value) FROM papers, json_each(papers.authors) AS j
+        WHERE j.type = 'text' AND trim(j.value) != ''
+    """))
+    conn.execute(text(
+        "INSERT INTO category_counts (category, papers) SELECT category, count(*) FROM paper_categories GROUP BY category"
+    ))
+    conn.execute(text(
+        "INSERT INTO author_counts (name, papers) SELECT name, count(*) FROM paper_authors GROUP BY name"
+    ))
+    create_facet_triggers(conn)
+
+
+def create_stats_triggers(conn):
+    """Create the paper_stats triggers that are missing; returns how many were created"""
+    return _create_triggers(conn, STATS_TRIGGERS)
+
+
+def drop_stats_triggers(conn):
+    """Drop the paper_stats triggers, e.g. during bulk loads (rebuild_stats restores them)"""
+    for name in STATS_TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+
+
+def rebuild_stats(conn):
+    """Recompute paper_stats from papers and grok_analyses, then restore the triggers"""
+    drop_stats_triggers(conn)
+    conn.execute(text("DELETE FROM paper_stats"))
+    conn.execute(text("""
+        INSERT INTO paper_stats (category, day, papers, analyzed)
+        SELECT c.category, date(papers.published_date), count(*), count(grok_analyses.paper_id)
+        FROM (
+            SELECT papers.id AS paper_id, j.value AS category
+            FROM papers, json_each(papers.categories) AS j WHERE j.type = 'text'
+            UNION SELECT id, '*' FROM papers
+        ) AS c
+        JOIN papers ON papers.id = c.paper_id
+        LEFT JOIN grok_analyses ON grok_analyses.paper_id = c.paper_id
+        GROUP BY c.category, date(papers.published_date)
+    """))
+    create_stats_triggers(conn)
+
+
+def create_fts_vocab(conn):
+    """Term/document counts over papers_fts, read by search suggestions (no storage of its own)"""
+    conn.execute(text("CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts_vocab USING fts5vocab(papers_fts, 'row')"))
+
+
+def add_missing_columns(conn) -> List[str]:
+    """
+    Add nullable columns declared on tables that already existed (create_all only creates new tables).
+
+    Returns:
+        "table.column" for every column added
+    """
+    added = []
+    for table in Base.metadata.sorted_tables:
+        existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))}
+        if not existing:
+            continue
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def backfill_paper_versions(conn, batch_size: int = 5000) -> int:
+    """
+    Fill base_id and content_hash of papers stored before they existed.
+
+    Neither column is indexed by papers_fts, but the FTS update trigger of older
+    databases fires on any update, so the triggers are dropped meanwhile (and
+    restored, with a rebuild, by init_db if this is interrupted).
+
+    Returns:
+        Number of papers filled
+    """
+    if conn.execute(text("SELECT 1 FROM papers WHERE content_hash IS NULL LIMIT 1")).fetchone() is None:
+        return 0
+
+    drop_fts_triggers(conn)
+    filled = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("""
+                SELECT id, arxiv_id, title, abstract FROM papers
+                WHERE content_hash IS NULL AND id > :last_id ORDER BY id LIMIT :limit
+            """),
+            {"last_id": last_id, "limit": batch_size}
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            text("UPDATE papers SET base_id = :base_id, content_hash = :content_hash WHERE id = :id"),
+            [
+                {"id": row.id, "base_id": split_arxiv_id(row.arxiv_id)[0],
+                 "content_hash": content_hash(row.title, row.abstract)}
+                for row in rows
+            ]
+        )
+        filled += len(rows)
+        last_id = rows[-1].id
+    create_fts_triggers(conn)
+    return filled
+
+
+def create_missing_indexes(conn):
+    """Create indexes declared on tables that already existed (create_all only indexes new tables)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 def init_db():
     """Initialize database with tables and FTS5 virtual table"""
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for column in add_missing_columns(conn):
+            print(f"Added column {column}")
+        create_missing_indexes(conn)
 
     # Create FTS5 virtual table for full-text search
     with engine.connect() as conn:
@@ -46,28 +437,55 @@ def init_db():
             """))
 
             # Create triggers to keep FTS in sync with papers table
-            conn.execute(text("""
-                CREATE TRIGGER papers_fts_insert AFTER INSERT ON papers BEGIN
-                    INSERT INTO papers_fts(rowid, arxiv_id, title, abstract)
-                    VALUES (new.id, new.arxiv_id, new.title, new.abstract);
-                END
-            """))
+            create_fts_triggers(conn)
 
-            conn.execute(text("""
-                CREATE TRIGGER papers_fts_update AFTER UPDATE ON papers BEGIN
-                    UPDATE papers_fts SET
-                        arxiv_id = new.arxiv_id,
-                        title = new.title,
-                        abstract = new.abstract
-                    WHERE rowid = new.id;
-                END
-            """))
+            conn.commit()
+            print("FTS5 virtual table and triggers created successfully")
+        elif create_fts_triggers(conn):
+            # Triggers missing (e.g. an interrupted bulk import): index may be stale
+            rebuild_fts(conn)
+            conn.commit()
+            print("FTS5 triggers restored and index rebuilt")
 
-            conn.execute(text("""
-                CREATE TRIGGER papers_fts_delete AFTER DELETE ON papers BEGIN
-                    DELETE FROM papers_fts WHERE rowid = old.id;
-                END
-            """))
+        create_fts_vocab(conn)
+        conn.commit()
 
+        if create_facet_triggers(conn):
+            # New category/author tables, or triggers lost in an interrupted bulk load
+            rebuild_facets(conn)
             conn.commit()
-            print("FTS5 virtual table and triggers created successfully")
+            print("Category and author tables filled from papers")
+
+        if create_stats_triggers(conn):
+            rebuild_stats(conn)
+            conn.commit()
+            print("Timeline statistics computed from papers")
+
+        filled = backfill_paper_versions(conn)
+        if filled:
+            conn.commit()
+            print(f"Version keys and content hashes computed for {filled} papers")
+
+        seed_default_feed(conn)
+
+
+def seed_default_feed(conn):
+    """
+    Create the 'default' feed from ARXIV_SEARCH_QUERY when no feeds exist yet.
+
+    Papers already in the database were fetched with that query, so they are
+    tagged with the new feed.
+    """
+    if conn.execute(text("SELECT 1 FROM feeds LIMIT 1")).fetchone() is not None:
+        return
+
+    conn.execute(
+        text("INSERT INTO feeds (name, query, enabled, created_at) VALUES ('default', :query, 1, :now)"),
+        {"query": settings.ARXIV_SEARCH_QUERY, "now": datetime.utcnow()}
+    )
+    conn.execute(text("""
+        INSERT INTO paper_feeds (paper_id, feed_id)
+        SELECT papers.id, feeds.id FROM papers, feeds WHERE feeds.name = 'default'
+    """))
+    conn.commit()
+    print("Default feed created from ARXIV_SEARCH_QUERY")
@@ -0,0 +1,165 @@
+"""
+Service providers for FastAPI dependencies, scripts and background tasks.
+
+Services are built on first use and then shared, so importing the app does
+not pay for the arXiv client or httpx until something needs them.
+"""
+from functools import lru_cache
+
+from backend.config import settings
+from backend.services.job_queue import JobQueue
+from backend.services.paper_service import PaperService
+
+
+@lru_cache(maxsize=None)
+def get_arxiv_service():
+    """Shared ArxivService (imports the arxiv client on first call)"""
+    from backend.services.arxiv_service import ArxivService
+    return ArxivService(
+        api_url=settings.ARXIV_API_URL,
+        rate_limit_delay=settings.ARXIV_RATE_LIMIT_DELAY,
+        max_concurrency=settings.ARXIV_MAX_CONCURRENCY
+    )
+
+
+@lru_cache(maxsize=None)
+def get_grok_service():
+    """Shared GrokService (imports httpx on first call)"""
+    from backend.services.grok_service import GrokService
+    from backend.services.resilience import AdaptiveLimiter, CircuitBreaker
+    return GrokService(
+        api_key=settings.GROK_API_KEY,
+        rate_limit_delay=settings.GROK_RATE_LIMIT_DELAY,
+        base_url=settings.GROK_API_URL,
+        max_retries=settings.GROK_MAX_RETRIES,
+        structured_output=settings.GROK_STRUCTURED_OUTPUT,
+        limiter=AdaptiveLimiter(
+            "grok",
+            initial=min(2, settings.GROK_MAX_CONCURRENCY),
+            max_limit=settings.GROK_MAX_CONCURRENCY,
+            latency_target=settings.GROK_LATENCY_TARGET_SECONDS
+        ),
+        breaker=CircuitBreaker(
+            "grok",
+            failure_threshold=settings.GROK_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.GROK_CIRCUIT_RESET_SECONDS
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def get_pdf_store():
+    """Shared PdfStore rooted at PDF_STORAGE_PATH"""
+    from backend.database import SessionLocal
+    from backend.services.pdf_store import PdfStore
+    return PdfStore(
+        settings.get_pdf_storage_path(),
+        SessionLocal,
+        quota_bytes=int(settings.PDF_STORAGE_QUOTA_MB * 1024 * 1024)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_job_queue() -> JobQueue:
+    """Shared job queue configured from settings"""
+    return JobQueue(
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        backoff_base=settings.JOB_BACKOFF_BASE_SECONDS,
+        backoff_max=settings.JOB_BACKOFF_MAX_SECONDS
+    )
+
+
+@lru_cache(maxsize=None)
+def get_change_watcher():
+    """Shared ChangeWatcher; in-process caches subscribe to it to drop entries other processes made stale"""
+    from backend.services.change_watcher import ChangeWatcher
+    return ChangeWatcher(settings.DATABASE_PATH, poll_interval=settings.CHANGE_POLL_SECONDS)
+
+
+@lru_cache(maxsize=None)
+def get_suggest_service():
+    """Shared SuggestService, so its prefix cache is shared by all requests"""
+    from backend.services.suggest_service import SuggestService
+    service = SuggestService(
+        budget_ms=settings.SUGGEST_BUDGET_MS,
+        cache_size=settings.SUGGEST_CACHE_SIZE,
+        cache_ttl=settings.SUGGEST_CACHE_SECONDS,
+        vocabulary_ttl=settings.SUGGEST_VOCABULARY_SECONDS
+    )
+    get_change_watcher().subscribe(service.invalidate)
+    return service
+
+
+@lru_cache(maxsize=None)
+def get_stats_service():
+    """Shared StatsService"""
+    from backend.services.stats_service import StatsService
+    return StatsService()
+
+
+@lru_cache(maxsize=None)
+def get_syndication_service():
+    """Shared SyndicationService, so cached feed documents are shared by all requests"""
+    from backend.services.syndication_service import SyndicationService
+    return SyndicationService(
+        get_change_watcher(),
+        entries=settings.SYNDICATION_ENTRIES,
+        cache_size=settings.SYNDICATION_CACHE_SIZE,
+        rebuild_seconds=settings.SYNDICATION_REBUILD_SECONDS
+    )
+
+
+@lru_cache(maxsize=None)
+def get_digest_service():
+    """Shared DigestService writing to DIGEST_PATH"""
+    from backend.services.digest_service import DigestService
+    return DigestService(settings.get_digest_path())
+
+
+@lru_cache(maxsize=None)
+def get_bootstrap_service():
+    """Shared BootstrapService, so the rendered index.html is shared by all requests"""
+    from backend.services.bootstrap_service import BootstrapService
+    return BootstrapService("frontend/index.html", get_paper_service(), get_change_watcher())
+
+
+@lru_cache(maxsize=None)
+def get_event_bus():
+    """Shared EventBus, so every /api/events client of this worker is fed from one database read"""
+    from backend.database import SessionLocal
+    from backend.services.event_bus import EventBus
+    bus = EventBus(
+        SessionLocal,
+        queue_size=settings.EVENTS_QUEUE_SIZE,
+        retention_hours=settings.EVENTS_RETENTION_HOURS
+    )
+    get_change_watcher().subscribe(bus.notify)
+    return bus
+
+
+@lru_cache(maxsize=None)
+def get_fts_maintenance():
+    """Shared FtsMaintenance configured from settings"""
+    from backend.database import engine
+    from backend.services.fts_maintenance import FtsMaintenance
+    return FtsMaintenance(
+        engine,
+        step_pages=settings.FTS_MERGE_STEP_PAGES,
+        job_seconds=settings.FTS_MERGE_JOB_SECONDS,
+        optimize_after_papers=settings.FTS_OPTIMIZE_AFTER_PAPERS
+    )
+
+
+@lru_cache(maxsize=None)
+def get_export_service():
+    """Shared ExportService reading through the application engine"""
+    from backend.database import engine
+    from backend.services.export_service import ExportService
+    return ExportService(engine, batch_size=settings.EXPORT_BATCH_SIZE)
+
+
+@lru_cache(maxsize=None)
+def get_paper_service() -> PaperService:
+    """Shared PaperService; its arXiv and Grok services are resolved when first used"""
+    return PaperService(job_queue=get_job_queue())
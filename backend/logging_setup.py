@@ -0,0 +1,236 @@
+"""
+Logging for the server and the daily fetch.
+
+Loggers only put records on a queue; a QueueListener thread formats them and
+does the file and console I/O, so a slow disk never stalls a request or the
+event loop. Log files are JSON lines (LOG_FORMAT=json) or the console text
+format, rotated when they reach LOG_MAX_MB or a new day starts, and rotated
+files are gzip-compressed (app.log.1.gz is the newest). A file is written
+and rotated by one process only: with several server workers each writes its
+own file, named after its pid (app.<pid>.log). Pids change with every
+restart, so at startup the files of processes that are gone are pruned to the
+newest LOG_BACKUP_COUNT; those files are not rotated any more.
+
+Messages below WARNING are rate limited per call site: per-paper messages
+("Added Grok analysis: ...") are f-strings, so the call site, not the
+message text, identifies them. Past LOG_RATE_LIMIT_PER_MINUTE records in a
+minute the rest are dropped, and the next record let through says how many.
+"""
+import os
+import re
+import gzip
+import json
+import queue
+import atexit
+import shutil
+import logging
+import logging.handlers
+import threading
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from backend.config import settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, per_minute: int):
+        """
+        Args:
+            per_minute: Records below WARNING let through per call site per minute
+        """
+        super().__init__()
+        self.per_minute = per_minute
+        # (pathname, lineno) -> [window start, records let through, records dropped]
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get((record.pathname, record.lineno))
+            if site is None or now - site[0] >= 60:
+                dropped = site[2] if site else 0
+                self._sites[(record.pathname, record.lineno)] = [now, 1, 0]
+            elif site[1] < self.per_minute:
+                site[1] += 1
+                dropped = 0
+            else:
+                site[2] += 1
+                return False
+
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The console format, noting records dropped by the rate limit"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" ({suppressed} similar messages suppressed)"
+        return text
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    def __init__(self, filename: Path, max_bytes: int, backup_count: int, daily: bool = True):
+        """
+        Args:
+            filename: Log file
+            max_bytes: Size at which the file is rotated
+            backup_count: Compressed rotated files kept
+            daily: Also rotate when the first record of a new (local) day is written
+        """
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.daily = daily
+        self._day: Optional[date] = None
+
+    def _open(self):
+        stream = super()._open()
+        stat = os.fstat(stream.fileno())
+        # A file left from an earlier day is rotated by the first record written today
+        self._day = date.fromtimestamp(stat.st_mtime) if stat.st_size else date.today()
+        return stream
+
+    def namer(self, name: str) -> str:
+        return name + ".gz"
+
+    def rotator(self, source: str, dest: str):
+        with open(source, "rb") as original, gzip.open(dest, "wb") as compressed:
+            shutil.copyfileobj(original, compressed)
+        os.remove(source)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if super().shouldRollover(record):  # Opens the file on the first record
+            return True
+        return self.daily and self._day is not None and date.today() != self._day
+
+
+def _pid_running(pid: int) -> bool:
+    if os.name == "nt":
+        # Signal 0 would stop the process on Windows; a live process's open log
+        # file cannot be removed there, so pruning skips it anyway
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _prune_process_logs(log_dir: Path, stem: str, suffix: str, keep: int):
+    """Delete all but the newest `keep` per-process log files of processes that are gone"""
+    pattern = re.compile(rf"{re.escape(stem)}\.(\d+){re.escape(suffix)}(\.\d+\.gz)?")
+    stale = []
+    for path in log_dir.glob(f"{stem}.*{suffix}*"):
+        match = pattern.fullmatch(path.name)
+        if not match or int(match.group(1)) == os.getpid() or _pid_running(int(match.group(1))):
+            continue
+        try:
+            stale.append((path.stat().st_mtime, path))
+        except FileNotFoundError:  # Pruned by a sibling worker starting at the same time
+            pass
+    stale.sort(reverse=True)
+    for _, path in stale[keep:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now (they may change after this call returns), but keep the
+        # traceback separate from the message so the JSON formatter can give it its own field
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(filename: str, per_process: bool = False) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to logs/<filename> and the console.
+
+    Args:
+        filename: Log file name under logs/
+        per_process: Put the pid in the file name (app.log -> app.<pid>.log), for
+            processes that run side by side; rotation is not safe across processes.
+            Files left by earlier processes are pruned to LOG_BACKUP_COUNT.
+
+    Returns:
+        The running QueueListener (stopped, flushing the queue, at exit)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+
+    if per_process:
+        path = Path(filename)
+        filename = f"{path.stem}.{os.getpid()}{path.suffix}"
+        _prune_process_logs(log_dir, path.stem, path.suffix, settings.LOG_BACKUP_COUNT)
+
+    file_handler = CompressingRotatingFileHandler(
+        log_dir / filename,
+        max_bytes=int(settings.LOG_MAX_MB * 1024 * 1024),
+        backup_count=settings.LOG_BACKUP_COUNT,
+        daily=settings.LOG_ROTATE_DAILY
+    )
+    file_handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter(TEXT_FORMAT))
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(TextFormatter(TEXT_FORMAT))
+
+    queue_handler = _QueueHandler(queue.SimpleQueue())
+    if settings.LOG_RATE_LIMIT_PER_MINUTE > 0:
+        queue_handler.addFilter(RateLimitFilter(settings.LOG_RATE_LIMIT_PER_MINUTE))
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, console_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
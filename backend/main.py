@@ -1,34 +1,124 @@
-from fastapi import FastAPI
+import time
+import signal
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
-from pathlib import Path
+from sqlalchemy.orm import Session
 
-from backend.routers import papers, bookmarks
+from backend.routers import papers, bookmarks, feeds, facets, stats, jobs, admin, syndication, events, export
 from backend.config import settings
+from backend.database import get_db
+from backend import metrics, query_stats
+from backend.logging_setup import configure_logging
+from backend.dependencies import get_paper_service, get_change_watcher, get_bootstrap_service, get_event_bus
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO if not settings.DEBUG else logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
-)
+# Log to logs/app.log (logs/app.<pid>.log per worker) from a background thread
+configure_logging("app.log", per_process=settings.WORKERS > 1)
 
 logger = logging.getLogger(__name__)
 
-# Create logs directory
-Path("logs").mkdir(exist_ok=True)
+
+def _on_exit_signal(callback):
+    """
+    Call callback when the server is told to stop, before it waits for open
+    connections to finish (the lifespan shutdown only runs after that).
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return  # Signal handlers can only be set from the main thread (e.g. not under TestClient)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            callback()
+            previous(signum, frame)
+        signal.signal(sig, handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Watch the database for changes and, on the elected leader worker only, run
+    the in-process job worker pool and fetch scheduler
+    """
+    from backend.database import SessionLocal
+    from backend.tasks.scheduler import FetchScheduler
+    from backend.tasks.leader import LeaderElection
+
+    settings.get_digest_path()
+    paper_service = get_paper_service()
+    watcher = get_change_watcher()
+    watcher_task = asyncio.create_task(watcher.run())
+
+    # Event streams never finish on their own; end them so shutdown is not held up
+    event_bus = get_event_bus()
+    loop = asyncio.get_running_loop()
+    _on_exit_signal(lambda: loop.call_soon_threadsafe(event_bus.close))
+
+    # Always available for manual runs; the periodic loop is opt-in
+    scheduler = FetchScheduler(
+        paper_service,
+        SessionLocal,
+        interval_minutes=settings.SCHEDULER_INTERVAL_MINUTES,
+        jitter_seconds=settings.SCHEDULER_JITTER_SECONDS,
+        days_back=settings.ARXIV_DAYS_BACK,
+        lock_ttl=settings.FETCH_LOCK_TTL_SECONDS
+    )
+    app.state.scheduler = scheduler
+
+    # (stop, task) pairs of the tasks running while this worker is leader
+    leader_tasks = []
+
+    async def start_leader_tasks():
+        if settings.JOB_WORKER_IN_PROCESS:
+            from backend.tasks.worker import create_worker
+            worker = create_worker(paper_service)
+            leader_tasks.append((worker.stop, asyncio.create_task(worker.run())))
+        if settings.SCHEDULER_ENABLED:
+            leader_tasks.append((scheduler.stop, asyncio.create_task(scheduler.run())))
+
+    async def stop_leader_tasks():
+        while leader_tasks:
+            stop, task = leader_tasks.pop()
+            stopped = stop()
+            if asyncio.iscoroutine(stopped):
+                await stopped
+            await task
+
+    election, election_task = None, None
+    if settings.JOB_WORKER_IN_PROCESS or settings.SCHEDULER_ENABLED:
+        election = LeaderElection(
+            SessionLocal,
+            on_elected=start_leader_tasks,
+            on_deposed=stop_leader_tasks,
+            ttl_seconds=settings.LEADER_LOCK_TTL_SECONDS
+        )
+        election_task = asyncio.create_task(election.run())
+    app.state.election = election
+
+    yield
+
+    if election is not None:
+        election.stop()
+        await election_task
+    await scheduler.stop()  # Waits for a manual run in progress
+    watcher.stop()
+    await watcher_task
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Gothic arXiv GenAI×Cybersecurity Feed",
     description="A techno-gothic interface for arXiv papers on GenAI and Cybersecurity",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # CORS middleware for local development
@@ -40,18 +130,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Time every request, labelled by route template so /api/papers/{id} is one series"""
+    metrics.http_requests_in_flight.inc()
+    db_stats = query_stats.begin_request()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        # Statements run by the handler; a streamed body may issue more after this point
+        response.headers["X-DB-Queries"] = str(db_stats.queries)
+        response.headers["X-DB-Time"] = f"{db_stats.seconds * 1000:.2f}ms"
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.http_requests_in_flight.dec()
+        metrics.http_request_duration.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status)
+        )
+
+
 # Include routers
 app.include_router(papers.router)
 app.include_router(bookmarks.router)
+app.include_router(feeds.router)
+app.include_router(facets.router)
+app.include_router(stats.router)
+app.include_router(jobs.router)
+app.include_router(admin.router)
+app.include_router(syndication.router)
+app.include_router(events.router)
+app.include_router(export.router)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
+# Created at startup (the lifespan), so importing the app does not touch the filesystem
+app.mount("/digest", StaticFiles(directory=settings.DIGEST_PATH, html=True, check_dir=False), name="digest")
 
 
 @app.get("/")
-async def serve_frontend():
-    """Serve the main HTML page"""
-    return FileResponse("frontend/index.html")
+def serve_frontend(
+    request: Request,
+    db: Session = Depends(get_db),
+    bootstrap_service=Depends(get_bootstrap_service)
+):
+    """Serve the main HTML page with the first page of papers and first paper inlined"""
+    body, etag = bootstrap_service.index(db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html; charset=utf-8", headers=headers)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Process metrics in the Prometheus text format"""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
 
 @app.get("/health")
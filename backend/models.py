@@ -1,35 +1,136 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
+import re
+import hashlib
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, Boolean, Table
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
+from typing import Tuple
 
 Base = declarative_base()
 
+_VERSION_SUFFIX = re.compile(r"v(\d+)$")
+
+
+def split_arxiv_id(arxiv_id: str) -> Tuple[str, int]:
+    """Split "2401.12345v2" into ("2401.12345", 2); an id without a version is version 1"""
+    match = _VERSION_SUFFIX.search(arxiv_id)
+    if match is None:
+        return arxiv_id, 1
+    return arxiv_id[:match.start()], int(match.group(1))
+
+
+def content_hash(title: str, abstract: str) -> str:
+    """
+    SHA-256 of the text Grok analyzes, with whitespace collapsed.
+
+    The arXiv API and OAI-PMH wrap titles and abstracts differently, so only
+    a change to the words themselves changes the hash.
+    """
+    text = " ".join(title.split()) + "\n" + " ".join(abstract.split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Feeds that matched each paper; (feed_id, paper_id) index serves ?feed= filtering
+paper_feeds = Table(
+    "paper_feeds",
+    Base.metadata,
+    Column("paper_id", Integer, ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True),
+    Column("feed_id", Integer, ForeignKey("feeds.id", ondelete="CASCADE"), primary_key=True),
+    Index("idx_paper_feeds_feed", "feed_id", "paper_id"),
+)
+
+
+# Normalized copies of Paper.categories and Paper.authors, kept in sync with the
+# JSON columns by triggers (database.FACET_TRIGGERS); the (value, paper_id)
+# indexes serve ?category= and ?author= filtering
+paper_categories = Table(
+    "paper_categories",
+    Base.metadata,
+    Column("paper_id", Integer, ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True),
+    Column("category", String(50), primary_key=True),
+    Index("idx_paper_categories_category", "category", "paper_id"),
+    sqlite_with_rowid=False,
+)
+
+paper_authors = Table(
+    "paper_authors",
+    Base.metadata,
+    Column("paper_id", Integer, ForeignKey("papers.id", ondelete="CASCADE"), primary_key=True),
+    Column("name", String(300, collation="NOCASE"), primary_key=True),
+    Index("idx_paper_authors_name", "name", "paper_id"),
+    sqlite_with_rowid=False,
+)
+
+# Papers per category / author, maintained by triggers on the tables above so
+# unfiltered facet counts are a lookup rather than a GROUP BY
+category_counts = Table(
+    "category_counts",
+    Base.metadata,
+    Column("category", String(50), primary_key=True),
+    Column("papers", Integer, nullable=False),
+    Index("idx_category_counts_papers", "papers"),
+)
+
+author_counts = Table(
+    "author_counts",
+    Base.metadata,
+    Column("name", String(300, collation="NOCASE"), primary_key=True),
+    Column("papers", Integer, nullable=False),
+    Index("idx_author_counts_papers", "papers"),
+)
+
+# Papers and analyzed papers per (category, publication day); category "*"
+# counts every paper once. Maintained by triggers (database.STATS_TRIGGERS)
+# in the same transaction as the paper or analysis write
+paper_stats = Table(
+    "paper_stats",
+    Base.metadata,
+    Column("category", String(50), primary_key=True),
+    Column("day", String(10), primary_key=True),  # YYYY-MM-DD of published_date
+    Column("papers", Integer, nullable=False),
+    Column("analyzed", Integer, nullable=False),
+    sqlite_with_rowid=False,
+)
+
 
 class Paper(Base):
     __tablename__ = "papers"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    arxiv_id = Column(String(50), unique=True, nullable=False, index=True)
+    arxiv_id = Column(String(50), unique=True, nullable=False, index=True)  # Versioned, e.g. 2401.12345v2
+    base_id = Column(String(50), nullable=True, index=True)  # arxiv_id without the version
+    content_hash = Column(String(64), nullable=True)  # content_hash(title, abstract); a change queues re-analysis
     title = Column(Text, nullable=False)
     authors = Column(JSON, nullable=False)  # List of author names
     abstract = Column(Text, nullable=False)
     published_date = Column(DateTime, nullable=False, index=True)
     updated_date = Column(DateTime, nullable=True)
     pdf_url = Column(String(500), nullable=False)
-    pdf_local_path = Column(String(500), nullable=True)
+    pdf_local_path = Column(String(500), nullable=True)  # Blob in the PDF store (see PdfBlob)
     categories = Column(JSON, nullable=False)  # List of category codes
     primary_category = Column(String(50), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Digest days, FTS merge policy
 
     # Relationships
     grok_analysis = relationship("GrokAnalysis", back_populates="paper", cascade="all, delete-orphan", uselist=False)
     bookmark = relationship("Bookmark", back_populates="paper", cascade="all, delete-orphan", uselist=False)
+    feeds = relationship("Feed", secondary=paper_feeds, back_populates="papers")
 
     __table_args__ = (
         Index('idx_published_date_desc', published_date.desc()),
+        Index('idx_papers_pdf_local_path', pdf_local_path),
     )
 
 
+class PdfBlob(Base):
+    __tablename__ = "pdf_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(500), unique=True, nullable=False)  # What Paper.pdf_local_path holds
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # LRU eviction order
+
+
 class GrokAnalysis(Base):
     __tablename__ = "grok_analyses"
 
@@ -37,7 +138,7 @@ class GrokAnalysis(Base):
     paper_id = Column(Integer, ForeignKey("papers.id", ondelete="CASCADE"), nullable=False, unique=True)
     key_points = Column(JSON, nullable=False)  # List of strings (5-7 bullet points)
     summary = Column(Text, nullable=True)  # Optional summary field
-    analyzed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    analyzed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Feed watermark
     model_version = Column(String(50), nullable=False, default="grok-4-1-fast-reasoning")
 
     # Relationship
@@ -54,3 +155,98 @@ class Bookmark(Base):
 
     # Relationship
     paper = relationship("Paper", back_populates="bookmark")
+
+
+class Feed(Base):
+    __tablename__ = "feeds"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), unique=True, nullable=False)
+    query = Column(Text, nullable=False)  # arXiv API search query
+    max_results = Column(Integer, nullable=True)  # Falls back to ARXIV_MAX_RESULTS
+    enabled = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Relationship
+    papers = relationship("Paper", secondary=paper_feeds, back_populates="feeds")
+
+
+class HarvestCheckpoint(Base):
+    __tablename__ = "harvest_checkpoints"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(200), unique=True, nullable=False)
+    params = Column(JSON, nullable=False)  # set, from, until, categories of the harvest
+    resumption_token = Column(Text, nullable=True)  # Next page; NULL before the first page
+    page_position = Column(Integer, nullable=True)  # Records of that page already stored; NULL at its start
+    records_seen = Column(Integer, default=0, nullable=False)
+    papers_added = Column(Integer, default=0, nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)  # Handler name, e.g. "analyze_paper"
+    payload = Column(JSON, nullable=False)
+    dedupe_key = Column(String(200), nullable=True)  # At most one queued/running job per key
+    state = Column(String(20), nullable=False, default="queued")  # queued, running, done, dead
+    priority = Column(Integer, nullable=False, default=100)  # Lower runs first
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_jobs_claim', 'state', 'priority', 'run_after'),
+        Index('idx_jobs_finished', 'state', 'finished_at'),
+        Index('idx_jobs_dedupe', 'dedupe_key'),
+    )
+
+
+class Lock(Base):
+    __tablename__ = "locks"
+
+    name = Column(String(100), primary_key=True)
+    owner = Column(String(200), nullable=False)
+    acquired_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class Event(Base):
+    __tablename__ = "events"
+
+    id = Column(Integer, primary_key=True)  # Server-sent event id; never reused (AUTOINCREMENT)
+    kind = Column(String(30), nullable=False)  # paper_added, analysis_ready, bookmark_changed
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Pruned after EVENTS_RETENTION_HOURS
+
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+class TaskRun(Base):
+    __tablename__ = "task_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task = Column(String(50), nullable=False)  # e.g. "fetch"
+    trigger = Column(String(50), nullable=False)  # schedule, manual, task-scheduler
+    owner = Column(String(200), nullable=False)
+    status = Column(String(20), nullable=False, default="running")  # running, success, failed, skipped
+    papers_added = Column(Integer, nullable=True)
+    papers_updated = Column(Integer, nullable=True)  # Existing papers whose metadata changed
+    papers_skipped = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_task_runs_task_started', 'task', 'started_at'),
+    )
@@ -0,0 +1,109 @@
+"""
+Per-request query accounting and the sampled slow-query log.
+
+The SQLAlchemy cursor events in backend.database call record() for every
+statement. The HTTP middleware opens a RequestQueryStats per request, so the
+number of statements and the time spent in SQLite can be returned in response
+headers. The same holds for sync endpoints running in the threadpool, because
+the context (and with it the stats object) is copied into the worker thread.
+"""
+import re
+import random
+import logging
+from contextvars import ContextVar
+from typing import Any, List, Optional
+
+from backend import metrics
+
+logger = logging.getLogger("backend.sql.slow")
+
+slow_queries = metrics.REGISTRY.counter(
+    "db_slow_queries_total", "Statements slower than SLOW_QUERY_MS", labels=("operation",))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Collapse a statement to its shape so that log lines group by query.
+
+    Literals become ?, placeholder lists such as IN (?, ?, ?) become (...)
+    and whitespace is collapsed.
+    """
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _PLACEHOLDER_LIST.sub("(...)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class RequestQueryStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def begin_request() -> RequestQueryStats:
+    """Start counting statements for the current request"""
+    stats = RequestQueryStats()
+    _current.set(stats)
+    return stats
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float = 100.0, sample_rate: float = 1.0, explain: bool = True):
+        """
+        Log statements slower than a threshold, with their query plan.
+
+        Args:
+            threshold_ms: Statements at or above this duration are slow (0 disables the log)
+            sample_rate: Fraction of slow statements that are logged
+            explain: Capture EXPLAIN QUERY PLAN for logged statements
+        """
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.explain = explain
+
+    def _query_plan(self, dbapi_connection, statement: str, parameters: Any) -> List[str]:
+        """EXPLAIN QUERY PLAN on a separate raw cursor, so no events fire and results in flight are untouched"""
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            return [row[-1] for row in cursor.fetchall()]
+        except Exception as e:
+            return [f"(plan unavailable: {e})"]
+        finally:
+            cursor.close()
+
+    def observe(self, conn, statement: str, parameters: Any, elapsed: float,
+                operation: str, executemany: bool):
+        if not self.threshold or elapsed < self.threshold:
+            return
+        slow_queries.inc(operation=operation)
+        if random.random() >= self.sample_rate:
+            return
+
+        message = f"Slow query ({elapsed * 1000:.1f} ms): {normalize_statement(statement)}"
+        if self.explain and not executemany and operation in _EXPLAINABLE:
+            plan = self._query_plan(conn.connection.dbapi_connection, statement, parameters)
+            message += "\n  plan: " + "\n        ".join(plan)
+        logger.warning(message)
+
+
+def record(conn, statement: str, parameters: Any, elapsed: float, operation: str,
+           executemany: bool, slow_log: SlowQueryLog):
+    """Account one executed statement; called from the after_cursor_execute event"""
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+    slow_log.observe(conn, statement, parameters, elapsed, operation, executemany)
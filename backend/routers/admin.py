@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.schemas import SchedulerStatusResponse
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/scheduler", response_model=SchedulerStatusResponse)
+def scheduler_status(request: Request, db: Session = Depends(get_db)):
+    """
+    Get the fetch scheduler state with the last and next run times.
+
+    The last run covers every process (scheduler, manual or Task Scheduler).
+    With several server workers only the leader runs the schedule, so
+    enabled and next_run_at are only set when is_leader is true.
+
+    Args:
+        request: Current request (the scheduler lives on app.state)
+        db: Database session
+    """
+    from backend.tasks.leader import LeaderElection
+
+    election = request.app.state.election
+    return {
+        **request.app.state.scheduler.status(db),
+        "leader": LeaderElection.current_leader(db),
+        "is_leader": election is not None and election.is_leader,
+    }
+
+
+@router.post("/scheduler/run", status_code=202)
+async def trigger_fetch(request: Request):
+    """
+    Start a fetch now in the background.
+
+    The run is recorded as skipped if another process holds the fetch lock.
+
+    Args:
+        request: Current request (the scheduler lives on app.state)
+    """
+    if not request.app.state.scheduler.trigger():
+        raise HTTPException(status_code=409, detail="A fetch is already running")
+
+    return {"status": "started"}
@@ -5,6 +5,7 @@ from typing import List
 from backend.database import get_db
 from backend.schemas import BookmarkCreate, BookmarkResponse, PaperList
 from backend.models import Bookmark, Paper
+from backend.services.event_bus import record_event
 
 router = APIRouter(prefix="/api/bookmarks", tags=["bookmarks"])
 
@@ -38,6 +39,10 @@ def create_bookmark(
     )
 
     db.add(bookmark)
+    # Open viewers add the paper to their bookmark list from the summary
+    summary = PaperList.model_validate(paper).model_dump(mode="json")
+    summary["is_bookmarked"] = True
+    record_event(db, "bookmark_changed", {"paper_id": paper.id, "bookmarked": True, "paper": summary})
     db.commit()
     db.refresh(bookmark)
 
@@ -59,6 +64,7 @@ def delete_bookmark(paper_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Bookmark not found")
 
     db.delete(bookmark)
+    record_event(db, "bookmark_changed", {"paper_id": paper_id, "bookmarked": False})
     db.commit()
 
     return None
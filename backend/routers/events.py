@@ -0,0 +1,66 @@
+import asyncio
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from backend.config import settings
+from backend.dependencies import get_event_bus
+from backend.services.event_bus import CLOSED, EventBus
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+RETRY_MS = 3000  # Reconnect delay the browser is told to use
+
+
+async def _event_stream(bus: EventBus, last_event_id: Optional[int]):
+    queue, missed = await bus.subscribe(last_event_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        sent = last_event_id or 0
+        for event_id, _, frame in missed:
+            sent = event_id
+            yield frame
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.EVENTS_STREAM_SECONDS
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break  # The browser reconnects with Last-Event-ID and misses nothing
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=min(settings.EVENTS_HEARTBEAT_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if item is CLOSED:
+                break  # Server shutting down
+            event_id, _, frame = item
+            if event_id > sent:  # Already replayed, or sent by a worker that had read further
+                sent = event_id
+                yield frame
+    finally:
+        bus.unsubscribe(queue)
+
+
+@router.get("")
+async def stream_events(
+    last_event_id: Optional[str] = Header(None),
+    bus: EventBus = Depends(get_event_bus)
+):
+    """
+    Server-sent events announcing new papers, finished analyses and bookmark changes.
+
+    Args:
+        last_event_id: Last-Event-ID header a reconnecting EventSource sends
+        bus: Event bus of this worker
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+
+    return StreamingResponse(
+        _event_stream(bus, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
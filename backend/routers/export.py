@@ -0,0 +1,68 @@
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Literal, Optional
+
+from backend.dependencies import get_export_service
+from backend.services.export_service import FORMATS, ExportService, ExportStream
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+
+class _ExportResponse(StreamingResponse):
+    """Closes the export when the response ends, also when the client disconnects midway"""
+
+    def __init__(self, stream: ExportStream, **kwargs):
+        super().__init__(stream, **kwargs)
+        self.stream = stream
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await run_in_threadpool(self.stream.close)
+
+
+@router.get("")
+def export_papers(
+    format: Literal["bibtex", "csv", "jsonl"] = Query("bibtex"),
+    bookmarked: bool = Query(False),
+    q: Optional[str] = Query(None, min_length=2, max_length=200),
+    category: Optional[str] = Query(None, max_length=50),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_until: Optional[date] = Query(None, alias="until"),
+    limit: Optional[int] = Query(None, ge=1),
+    export_service: ExportService = Depends(get_export_service)
+):
+    """
+    Download papers as BibTeX, CSV or JSON Lines, newest first.
+
+    The file is streamed as it is read from the database, so large exports
+    start at once and use little memory.
+
+    Args:
+        format: "bibtex", "csv" or "jsonl"
+        bookmarked: If true, only export bookmarked papers
+        q: Optional full-text query (as in search)
+        category: Optional arXiv category (e.g. cs.CR)
+        date_from: Optional first publication day, YYYY-MM-DD (query parameter "from")
+        date_until: Optional last publication day, inclusive (query parameter "until")
+        limit: Optional maximum number of papers
+        export_service: Export service (injected)
+    """
+    if date_from and date_until and date_from > date_until:
+        raise HTTPException(status_code=400, detail="'from' is after 'until'")
+
+    try:
+        stream = export_service.stream(format, bookmarked, q, category, date_from, date_until, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    media_type, extension = FORMATS[format]
+    filename = f"arxiv-{'bookmarks' if bookmarked else 'papers'}-{datetime.utcnow():%Y%m%d}.{extension}"
+    return _ExportResponse(
+        stream,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Accel-Buffering": "no"}
+    )
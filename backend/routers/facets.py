@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from backend.database import get_db
+from backend.schemas import FacetsResponse
+from backend.services.paper_service import PaperService
+from backend.dependencies import get_paper_service
+
+router = APIRouter(prefix="/api/facets", tags=["facets"])
+
+
+@router.get("/", response_model=FacetsResponse)
+def get_facets(
+    limit: int = Query(20, ge=1, le=200),
+    bookmarked: bool = Query(False),
+    feed: Optional[str] = Query(None),
+    category: Optional[str] = Query(None, max_length=50),
+    author: Optional[str] = Query(None, max_length=300),
+    db: Session = Depends(get_db),
+    paper_service: PaperService = Depends(get_paper_service)
+):
+    """
+    Paper counts per category and per author for the papers /api/papers would list.
+
+    Takes the same filters as /api/papers.
+
+    Args:
+        limit: Maximum categories and maximum authors returned (most papers first)
+        bookmarked: If true, count only bookmarked papers
+        feed: If set, count only papers matched by this feed name
+        category: If set, count only papers in this arXiv category
+        author: If set, count only papers by this author
+        db: Database session
+        paper_service: Paper service (injected)
+    """
+    return FacetsResponse(**paper_service.get_facets(db, limit, bookmarked, feed, category, author))
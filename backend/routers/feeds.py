@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List
+
+from backend.database import get_db
+from backend.schemas import FeedCreate, FeedResponse
+from backend.models import Feed, paper_feeds
+
+router = APIRouter(prefix="/api/feeds", tags=["feeds"])
+
+
+@router.get("/", response_model=List[FeedResponse])
+def list_feeds(db: Session = Depends(get_db)):
+    """
+    Get all saved feeds with the number of papers each one matched.
+
+    Args:
+        db: Database session
+    """
+    counts = dict(
+        db.query(paper_feeds.c.feed_id, func.count())
+        .group_by(paper_feeds.c.feed_id)
+        .all()
+    )
+
+    feed_list = []
+    for feed in db.query(Feed).order_by(Feed.id).all():
+        feed_dict = FeedResponse.model_validate(feed).model_dump()
+        feed_dict["paper_count"] = counts.get(feed.id, 0)
+        feed_list.append(FeedResponse(**feed_dict))
+
+    return feed_list
+
+
+@router.post("/", response_model=FeedResponse, status_code=201)
+def create_feed(feed_data: FeedCreate, db: Session = Depends(get_db)):
+    """
+    Add a saved feed; it is crawled on the next fetch.
+
+    Args:
+        feed_data: Feed creation data
+        db: Database session
+    """
+    existing = db.query(Feed).filter(Feed.name == feed_data.name).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Feed name already exists")
+
+    feed = Feed(**feed_data.model_dump())
+
+    db.add(feed)
+    db.commit()
+    db.refresh(feed)
+
+    return feed
+
+
+@router.delete("/{feed_id}", status_code=204)
+def delete_feed(feed_id: int, db: Session = Depends(get_db)):
+    """
+    Remove a saved feed. Papers stay; only their tag for this feed is removed.
+
+    Args:
+        feed_id: Feed ID
+        db: Database session
+    """
+    feed = db.query(Feed).filter(Feed.id == feed_id).first()
+
+    if not feed:
+        raise HTTPException(status_code=404, detail="Feed not found")
+
+    db.delete(feed)
+    db.commit()
+
+    return None
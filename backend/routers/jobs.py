@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from backend.database import get_db
+from backend.schemas import JobStatsResponse, JobResponse
+from backend.models import Job
+from backend.services.job_queue import JobQueue
+from backend.dependencies import get_job_queue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/", response_model=JobStatsResponse)
+def job_stats(db: Session = Depends(get_db), job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    Get queue depth per job kind and state, plus recent throughput.
+
+    Args:
+        db: Database session
+        job_queue: Job queue (injected)
+    """
+    return job_queue.stats(db)
+
+
+@router.get("/dead", response_model=List[JobResponse])
+def list_dead_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Get dead-lettered jobs, most recent first.
+
+    Args:
+        limit: Maximum number of jobs to return
+        db: Database session
+    """
+    return db.query(Job).filter(Job.state == "dead")\
+             .order_by(Job.finished_at.desc())\
+             .limit(limit)\
+             .all()
+
+
+@router.post("/{job_id}/retry", status_code=204)
+def retry_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Requeue a dead job with a fresh set of attempts.
+
+    Args:
+        job_id: Job ID
+        db: Database session
+        job_queue: Job queue (injected)
+    """
+    if not job_queue.retry(db, job_id):
+        raise HTTPException(status_code=404, detail="Dead job not found")
+
+    return None
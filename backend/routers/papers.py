@@ -1,28 +1,27 @@
+from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, RedirectResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from backend.database import get_db
-from backend.schemas import PaperListResponse, PaperDetail, PaperList
+from backend.schemas import PaperListResponse, PaperDetail, PaperList, SuggestResponse
 from backend.services.paper_service import PaperService
-from backend.services.arxiv_service import ArxivService
-from backend.services.grok_service import GrokService
-from backend.config import settings
+from backend.dependencies import get_paper_service, get_suggest_service, get_pdf_store
 
 router = APIRouter(prefix="/api/papers", tags=["papers"])
 
-# Initialize services
-arxiv_service = ArxivService()
-grok_service = GrokService(api_key=settings.GROK_API_KEY)
-paper_service = PaperService(arxiv_service, grok_service)
-
 
 @router.get("/", response_model=PaperListResponse)
 def list_papers(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     bookmarked: bool = Query(False),
-    db: Session = Depends(get_db)
+    feed: Optional[str] = Query(None),
+    category: Optional[str] = Query(None, max_length=50),
+    author: Optional[str] = Query(None, max_length=300),
+    db: Session = Depends(get_db),
+    paper_service: PaperService = Depends(get_paper_service)
 ):
     """
     Get paginated list of papers, newest first.
@@ -31,9 +30,13 @@ def list_papers(
         limit: Number of papers per page (1-100)
         offset: Offset for pagination
         bookmarked: If true, only return bookmarked papers
+        feed: If set, only return papers matched by this feed name
+        category: If set, only return papers in this arXiv category (e.g. cs.CR)
+        author: If set, only return papers by this author (case-insensitive)
         db: Database session
+        paper_service: Paper service (injected)
     """
-    papers, total = paper_service.get_papers(db, limit, offset, bookmarked)
+    papers, total = paper_service.get_papers(db, limit, offset, bookmarked, feed, category, author)
 
     # Convert to response schema with bookmark status
     paper_list = []
@@ -54,7 +57,8 @@ def list_papers(
 def search_papers(
     q: str = Query(..., min_length=2),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    paper_service: PaperService = Depends(get_paper_service)
 ):
     """
     Full-text search papers by keyword.
@@ -63,6 +67,7 @@ def search_papers(
         q: Search query string
         limit: Maximum number of results
         db: Database session
+        paper_service: Paper service (injected)
     """
     papers = paper_service.search_papers(db, q, limit)
 
@@ -76,14 +81,41 @@ def search_papers(
     return paper_list
 
 
+@router.get("/suggest", response_model=SuggestResponse)
+def suggest_papers(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(5, ge=1, le=10),
+    db: Session = Depends(get_db),
+    suggest_service=Depends(get_suggest_service)
+):
+    """
+    Search-as-you-type: completions for the word being typed and the best title matches.
+
+    Answers within SUGGEST_BUDGET_MS; a slower lookup is cut short and the
+    response is marked partial.
+
+    Args:
+        q: Text typed so far
+        limit: Maximum terms and maximum papers
+        db: Database session
+        suggest_service: Suggestion service (injected)
+    """
+    return suggest_service.suggest(db, q, limit)
+
+
 @router.get("/{paper_id}", response_model=PaperDetail)
-def get_paper(paper_id: int, db: Session = Depends(get_db)):
+def get_paper(
+    paper_id: int,
+    db: Session = Depends(get_db),
+    paper_service: PaperService = Depends(get_paper_service)
+):
     """
     Get single paper by ID with Grok analysis.
 
     Args:
         paper_id: Paper ID
         db: Database session
+        paper_service: Paper service (injected)
     """
     paper = paper_service.get_paper_by_id(db, paper_id)
 
@@ -95,3 +127,38 @@ def get_paper(paper_id: int, db: Session = Depends(get_db)):
     paper_dict["is_bookmarked"] = paper.bookmark is not None
 
     return PaperDetail(**paper_dict)
+
+
+@router.get("/{paper_id}/pdf")
+def get_paper_pdf(
+    paper_id: int,
+    db: Session = Depends(get_db),
+    paper_service: PaperService = Depends(get_paper_service),
+    pdf_store=Depends(get_pdf_store)
+):
+    """
+    Serve the paper's PDF from the local store, or redirect to arXiv if it is not stored.
+
+    Serving a stored PDF marks it recently used, so it is evicted last.
+
+    Args:
+        paper_id: Paper ID
+        db: Database session
+        paper_service: Paper service (injected)
+        pdf_store: PDF store (injected)
+    """
+    paper = paper_service.get_paper_by_id(db, paper_id)
+
+    if not paper:
+        raise HTTPException(status_code=404, detail="Paper not found")
+
+    if paper.pdf_local_path and Path(paper.pdf_local_path).is_file():
+        pdf_store.touch(paper.pdf_local_path)
+        return FileResponse(
+            paper.pdf_local_path,
+            media_type="application/pdf",
+            filename=f"{paper.arxiv_id.replace('/', '_')}.pdf",
+            content_disposition_type="inline"
+        )
+
+    return RedirectResponse(paper.pdf_url, status_code=307)
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from backend.database import get_db
+from backend.schemas import TimelineResponse
+from backend.services.stats_service import StatsService
+from backend.dependencies import get_stats_service
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+MAX_TIMELINE_DAYS = 3660
+MAX_TIMELINE_CATEGORIES = 20
+
+
+@router.get("/timeline", response_model=TimelineResponse)
+def get_timeline(
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    category: Optional[List[str]] = Query(None),
+    since: Optional[date] = Query(None),
+    until: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+    stats_service: StatsService = Depends(get_stats_service)
+):
+    """
+    Papers published and papers analyzed per day, week or month.
+
+    Answered from the paper_stats aggregate table, so the cost depends on the
+    range and number of categories, not on how many papers are stored.
+
+    Args:
+        bucket: day, week (starting Monday) or month
+        category: Categories to report, repeatable; "*" (the default) counts every paper once
+        since: First publication day (default: 90 days before until)
+        until: Last publication day (default: today)
+        db: Database session
+        stats_service: Stats service (injected)
+    """
+    if since and until and since > until:
+        raise HTTPException(status_code=400, detail="since is after until")
+    if since and (until or date.today()) - since > timedelta(days=MAX_TIMELINE_DAYS):
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_TIMELINE_DAYS} days")
+    if category and len(category) > MAX_TIMELINE_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TIMELINE_CATEGORIES} categories")
+
+    return TimelineResponse(**stats_service.timeline(db, bucket, category, since, until))
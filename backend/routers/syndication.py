@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from backend.database import get_db
+from backend.dependencies import get_syndication_service
+from backend.services.syndication_service import SyndicationService
+
+router = APIRouter(tags=["syndication"])
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the document's validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return last_modified <= since
+    return False
+
+
+def _feed_response(fmt: str, request: Request, q, category, db: Session, service: SyndicationService):
+    try:
+        document = service.document(db, fmt, str(request.base_url), q, category)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {
+        "ETag": document.etag,
+        "Last-Modified": format_datetime(document.last_modified.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(request, document.etag, document.last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(document.body, media_type=document.media_type, headers=headers)
+
+
+@router.get("/feed.atom")
+def atom_feed(
+    request: Request,
+    q: Optional[str] = Query(None, min_length=2, max_length=200),
+    category: Optional[str] = Query(None, max_length=50),
+    db: Session = Depends(get_db),
+    syndication_service: SyndicationService = Depends(get_syndication_service)
+):
+    """
+    Atom feed of the newest papers with their Grok key points.
+
+    Supports conditional GET: pollers that send back the ETag or
+    Last-Modified get a 304, usually without a database query.
+
+    Args:
+        q: Optional full-text query the papers must match
+        category: Optional arXiv category the papers must be in
+        db: Database session
+        syndication_service: Syndication service (injected)
+    """
+    return _feed_response("atom", request, q, category, db, syndication_service)
+
+
+@router.get("/feed.json")
+def json_feed(
+    request: Request,
+    q: Optional[str] = Query(None, min_length=2, max_length=200),
+    category: Optional[str] = Query(None, max_length=50),
+    db: Session = Depends(get_db),
+    syndication_service: SyndicationService = Depends(get_syndication_service)
+):
+    """
+    JSON Feed 1.1 of the newest papers with their Grok key points.
+
+    Args:
+        q: Optional full-text query the papers must match
+        category: Optional arXiv category the papers must be in
+        db: Database session
+        syndication_service: Syndication service (injected)
+    """
+    return _feed_response("json", request, q, category, db, syndication_service)
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 
 
 class GrokAnalysisSchema(BaseModel):
@@ -48,6 +48,13 @@ class PaperDetail(PaperBase):
     grok_analysis: Optional[GrokAnalysisSchema] = None
     bookmark: Optional[BookmarkSchema] = None
     is_bookmarked: bool = False
+    feeds: List[str] = []
+
+    @field_validator("feeds", mode="before")
+    @classmethod
+    def feed_names(cls, value):
+        """Accept Feed rows from the ORM relationship and keep only their names"""
+        return [getattr(feed, "name", feed) for feed in value or []]
 
     class Config:
         from_attributes = True
@@ -60,6 +67,54 @@ class PaperListResponse(BaseModel):
     offset: int
 
 
+class TermSuggestion(BaseModel):
+    term: str
+    completion: str
+    papers: int
+
+
+class PaperSuggestion(BaseModel):
+    id: int
+    arxiv_id: str
+    title: str
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    terms: List[TermSuggestion]
+    papers: List[PaperSuggestion]
+    partial: bool = False
+
+
+class FacetCount(BaseModel):
+    value: str
+    papers: int
+
+
+class FacetsResponse(BaseModel):
+    total: int
+    categories: List[FacetCount]
+    authors: List[FacetCount]
+
+
+class TimelinePoint(BaseModel):
+    start: date
+    papers: int
+    analyzed: int
+
+
+class TimelineSeries(BaseModel):
+    category: str
+    points: List[TimelinePoint]
+
+
+class TimelineResponse(BaseModel):
+    bucket: str
+    since: date
+    until: date
+    series: List[TimelineSeries]
+
+
 class BookmarkCreate(BaseModel):
     paper_id: int
     notes: Optional[str] = None
@@ -73,3 +128,75 @@ class BookmarkResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class FeedCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    query: str = Field(..., min_length=1)
+    max_results: Optional[int] = Field(None, ge=1, le=1000)
+    enabled: bool = True
+
+
+class FeedResponse(BaseModel):
+    id: int
+    name: str
+    query: str
+    max_results: Optional[int] = None
+    enabled: bool
+    created_at: datetime
+    paper_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+class JobStatsResponse(BaseModel):
+    depth: Dict[str, Dict[str, int]]
+    queued: int
+    running: int
+    dead: int
+    done_last_5m: int
+    done_last_hour: int
+    dead_last_hour: int
+    throughput_per_minute: float
+    oldest_runnable_age_seconds: float
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    state: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    last_error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TaskRunSchema(BaseModel):
+    id: int
+    trigger: str
+    owner: Optional[str] = None
+    status: str
+    papers_added: Optional[int] = None
+    papers_updated: Optional[int] = None
+    papers_skipped: Optional[int] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class SchedulerStatusResponse(BaseModel):
+    enabled: bool
+    running: bool
+    interval_minutes: float
+    jitter_seconds: int
+    next_run_at: Optional[datetime] = None
+    last_run: Optional[TaskRunSchema] = None
+    leader: Optional[str] = None  # Worker that runs the schedule and the job pool
+    is_leader: bool = False  # Whether the worker answering is that worker
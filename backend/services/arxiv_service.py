@@ -1,30 +1,94 @@
-import arxiv
+import asyncio
+import threading
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 import logging
 
+from backend import metrics
+
+if TYPE_CHECKING:
+    import arxiv
+    from backend.services.pdf_store import PdfStore
+
 logger = logging.getLogger(__name__)
 
 
+class RateBudget:
+    """Minimum spacing between requests, shared by every thread that uses it"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        """Block until the caller's request slot comes up"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            logger.debug(f"Rate budget: sleeping {slot - now:.2f}s")
+            time.sleep(slot - now)
+
+
+@lru_cache(maxsize=None)
+def _budgeted_client_class():
+    """
+    arxiv.Client whose page requests (including retries) draw from a RateBudget.
+
+    Built on first use so that importing this module does not import arxiv.
+    """
+    import arxiv
+
+    class BudgetedClient(arxiv.Client):
+        def __init__(self, budget: RateBudget, **kwargs):
+            super().__init__(delay_seconds=0, **kwargs)
+            self._budget = budget
+
+        def _parse_feed(self, url, first_page=True, _try_index=0):
+            self._budget.acquire()
+            return super()._parse_feed(url, first_page=first_page, _try_index=_try_index)
+
+    return BudgetedClient
+
+
 class ArxivService:
-    def __init__(self, rate_limit_delay: float = 3.0):
+    def __init__(
+        self,
+        rate_limit_delay: float = 3.0,
+        max_concurrency: int = 3,
+        api_url: str = "https://export.arxiv.org/api/query"
+    ):
         """
         Initialize arXiv service with rate limiting.
 
         Args:
             rate_limit_delay: Seconds to wait between requests (default 3.0)
+            max_concurrency: Maximum number of feed searches in flight at once
+            api_url: arXiv API query endpoint
         """
+        self.api_url = api_url
         self.rate_limit_delay = rate_limit_delay
-        self.client = arxiv.Client()
+        self.max_concurrency = max_concurrency
+        self.budget = RateBudget(rate_limit_delay)
+
+    def _client(self, page_size: int) -> "arxiv.Client":
+        """Build a client for one search; clients are not shared across threads"""
+        client = _budgeted_client_class()(self.budget, page_size=min(max(page_size, 1), 100))
+        client.query_url_format = f"{self.api_url}?{{}}"
+        return client
 
     def search_papers(
         self,
         query: str,
         max_results: int = 50,
         days_back: int = 7
-    ) -> List[arxiv.Result]:
+    ) -> List["arxiv.Result"]:
         """
         Search arXiv for papers matching query within date range.
 
@@ -36,6 +100,8 @@ class ArxivService:
         Returns:
             List of arxiv.Result objects
         """
+        import arxiv
+
         # Calculate date range (timezone-aware)
         from datetime import timezone
         end_date = datetime.now(timezone.utc)
@@ -52,7 +118,7 @@ class ArxivService:
         )
 
         results = []
-        for result in self.client.results(search):
+        for result in self._client(max_results).results(search):
             # Filter by date range (published or updated)
             paper_date = result.updated if result.updated else result.published
 
@@ -66,44 +132,97 @@ class ArxivService:
         logger.info(f"Found {len(results)} papers matching criteria")
         return results
 
+    async def search_feeds(
+        self,
+        feeds: Sequence[Tuple[Optional[int], str, int]],
+        days_back: int = 7
+    ) -> "OrderedDict[str, Tuple[arxiv.Result, List[int]]]":
+        """
+        Search several feeds concurrently under the shared rate budget.
+
+        Results are deduplicated by arXiv id, so a paper matched by several
+        feeds is returned once together with every feed that matched it.
+
+        Args:
+            feeds: (feed_id, query, max_results) per feed; feed_id may be None
+            days_back: How many days back to search
+
+        Returns:
+            Ordered mapping of arxiv_id -> (arxiv.Result, matching feed ids)
+        """
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+
+        async def run(query: str, max_results: int) -> List["arxiv.Result"]:
+            async with semaphore:
+                return await asyncio.to_thread(self.search_papers, query, max_results, days_back)
+
+        outcomes = await asyncio.gather(
+            *(run(query, max_results) for _, query, max_results in feeds),
+            return_exceptions=True
+        )
+
+        merged: "OrderedDict[str, Tuple[arxiv.Result, List[int]]]" = OrderedDict()
+        for (feed_id, query, _), outcome in zip(feeds, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Feed search failed (feed={feed_id}, query='{query}'): {outcome}")
+                continue
+            for result in outcome:
+                arxiv_id = result.get_short_id()
+                if arxiv_id not in merged:
+                    merged[arxiv_id] = (result, [])
+                if feed_id is not None and feed_id not in merged[arxiv_id][1]:
+                    merged[arxiv_id][1].append(feed_id)
+
+        logger.info(f"{len(feeds)} feeds returned {len(merged)} unique papers")
+        return merged
+
     def download_pdf(
         self,
-        paper: arxiv.Result,
-        save_dir: Path
+        paper: "arxiv.Result",
+        store: "PdfStore"
     ) -> Optional[Path]:
         """
-        Download PDF for a paper to local storage.
+        Download PDF for a paper into the PDF store.
 
         Args:
             paper: arXiv result object
-            save_dir: Directory to save PDFs
+            store: Content-addressed store; an identical PDF already stored is reused
 
         Returns:
-            Path to downloaded PDF or None if failed
+            Path to the stored PDF or None if failed
         """
-        try:
-            # Sanitize arxiv_id for filename (replace / and : with _)
-            safe_id = paper.get_short_id().replace("/", "_").replace(":", "_")
-            pdf_filename = f"{safe_id}.pdf"
-            pdf_path = save_dir / pdf_filename
+        import httpx
 
-            # Skip if already downloaded
-            if pdf_path.exists():
-                logger.info(f"PDF already exists: {pdf_path}")
-                return pdf_path
+        started = None
+        try:
+            if not paper.pdf_url:
+                logger.error(f"No PDF link for {paper.get_short_id()}")
+                return None
 
-            # Download with rate limiting
+            # Download with rate limiting (same budget as the search requests)
             logger.info(f"Downloading PDF: {paper.title[:50]}...")
-            paper.download_pdf(dirpath=str(save_dir), filename=pdf_filename)
-            time.sleep(self.rate_limit_delay)  # Rate limiting
-
-            if pdf_path.exists():
-                logger.info(f"Successfully downloaded: {pdf_path}")
-                return pdf_path
-            else:
-                logger.error(f"PDF download failed (file not found): {paper.get_short_id()}")
-                return None
+            self.budget.acquire()
+            started = time.perf_counter()
+            with httpx.stream("GET", paper.pdf_url, follow_redirects=True, timeout=60.0) as response:
+                response.raise_for_status()
+
+                def chunks():
+                    for chunk in response.iter_bytes():
+                        metrics.pdf_download_bytes.inc(len(chunk))
+                        yield chunk
+
+                stored = store.save(chunks())
+
+            elapsed = time.perf_counter() - started
+            metrics.pdf_download_duration.observe(elapsed, outcome="success")
+            if elapsed > 0:
+                metrics.pdf_download_throughput.observe(stored.size / elapsed)
+            reused = " (identical PDF already stored)" if stored.deduplicated else ""
+            logger.info(f"Successfully downloaded: {stored.path} ({stored.size / 1e6:.1f} MB in {elapsed:.1f}s){reused}")
+            return stored.path
 
         except Exception as e:
+            if started is not None:
+                metrics.pdf_download_duration.observe(time.perf_counter() - started, outcome="error")
             logger.error(f"Error downloading PDF for {paper.get_short_id()}: {e}")
             return None
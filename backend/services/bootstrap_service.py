@@ -0,0 +1,85 @@
+"""
+index.html with the first page of papers and the first paper's details inlined.
+
+The page the frontend would request first (GET /api/papers?limit=100) and the
+detail of its first paper are embedded as JSON, so the first paper renders
+without any API round-trip. The rendered page is cached in memory until the
+ChangeWatcher sees a write to the database.
+"""
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.schemas import PaperDetail, PaperList
+
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_MARKER = "<!-- bootstrap -->"
+
+
+class BootstrapService:
+    def __init__(self, index_path: Path, paper_service, watcher, page_size: int = 100):
+        """
+        Args:
+            index_path: index.html template containing BOOTSTRAP_MARKER
+            paper_service: Paper service used for the first page and detail
+            watcher: ChangeWatcher whose generation says whether the database changed
+            page_size: Papers in the inlined first page (the frontend's PAGE_SIZE)
+        """
+        self.index_path = Path(index_path)
+        self.paper_service = paper_service
+        self.watcher = watcher
+        self.page_size = page_size
+        self._cached: Optional[Tuple[int, bytes, str]] = None  # (generation, body, etag)
+        self._lock = threading.Lock()
+
+    def index(self, db: Session) -> Tuple[bytes, str]:
+        """
+        Rendered index.html and its ETag, from the cache while the database is unchanged.
+
+        Args:
+            db: Database session (not used when the cached page is current)
+        """
+        with self._lock:
+            if self._cached and self.watcher.running and self._cached[0] == self.watcher.generation:
+                return self._cached[1], self._cached[2]
+
+            generation = self.watcher.generation
+            script = self._bootstrap_script(self.bootstrap(db))
+            template = self.index_path.read_text(encoding="utf-8")
+            body = template.replace(BOOTSTRAP_MARKER, script, 1).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+            self._cached = (generation, body, etag)
+            return body, etag
+
+    def bootstrap(self, db: Session) -> Dict[str, Any]:
+        """First list page and first paper detail, shaped exactly like their API responses"""
+        papers, total = self.paper_service.get_papers(db, self.page_size, 0)
+
+        page = []
+        for paper in papers:
+            paper_dict = PaperList.model_validate(paper).model_dump(mode="json")
+            paper_dict["is_bookmarked"] = paper.bookmark is not None
+            page.append(paper_dict)
+
+        detail = None
+        if papers:
+            detail = PaperDetail.model_validate(papers[0]).model_dump(mode="json")
+            detail["is_bookmarked"] = papers[0].bookmark is not None
+
+        return {
+            "papers": {"limit": self.page_size, "offset": 0, "bookmarked": False,
+                       "response": {"papers": page, "total": total, "limit": self.page_size, "offset": 0}},
+            "paper": detail,
+        }
+
+    @staticmethod
+    def _bootstrap_script(data: Dict[str, Any]) -> str:
+        # "<" is escaped so no title or abstract can close the script element
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+        return f"<script id=\"bootstrap\" type=\"application/json\">{payload}</script>"
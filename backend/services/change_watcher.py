@@ -0,0 +1,96 @@
+"""
+Cross-process change detection for in-process caches.
+
+Every server worker keeps one private SQLite connection and polls
+PRAGMA data_version on it. The value changes whenever any other connection
+commits - another worker, the daily fetch, a separate job worker or this
+worker's own request sessions - so caches that subscribe are invalidated
+within one poll interval of a write anywhere, at the cost of one cheap
+pragma per interval.
+"""
+import asyncio
+import logging
+import sqlite3
+import threading
+from typing import Callable, List, Optional
+
+from backend import metrics
+
+logger = logging.getLogger(__name__)
+
+cache_invalidations = metrics.REGISTRY.counter(
+    "cache_invalidations_total", "Database changes that cleared this process's caches")
+
+
+class ChangeWatcher:
+    def __init__(self, database_path: str, poll_interval: float = 1.0):
+        """
+        Args:
+            database_path: SQLite database file to watch
+            poll_interval: Seconds between data_version checks
+        """
+        self.database_path = database_path
+        self.poll_interval = poll_interval
+        self.generation = 0  # Incremented on every detected change
+        self.running = False  # Only while polling does an unchanged generation prove nothing was written
+        self._callbacks: List[Callable[[], None]] = []
+        self._connection: Optional[sqlite3.Connection] = None
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stopping: Optional[asyncio.Event] = None
+
+    def subscribe(self, callback: Callable[[], None]):
+        """Call callback (from the event loop thread) whenever the database changed"""
+        self._callbacks.append(callback)
+
+    def _data_version(self) -> int:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.database_path, check_same_thread=False)
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def check(self) -> bool:
+        """
+        Poll once and notify subscribers if the database changed since the last poll.
+
+        Returns:
+            True if a change was detected
+        """
+        with self._lock:
+            try:
+                version = self._data_version()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not read data_version: {e}")
+                return False
+            changed = self._version is not None and version != self._version
+            self._version = version
+
+        if changed:
+            self.generation += 1
+            cache_invalidations.inc()
+            for callback in self._callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Cache invalidation callback failed: {e}", exc_info=True)
+        return changed
+
+    async def run(self):
+        """Poll until stop() is called"""
+        self._stopping = asyncio.Event()
+        self.check()
+        self.running = True
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                self.check()
+        self.running = False
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
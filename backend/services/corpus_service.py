@@ -0,0 +1,276 @@
+import gzip
+import json
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from backend.database import (
+    create_fts_triggers, drop_fts_triggers, rebuild_fts,
+    drop_facet_triggers, rebuild_facets, drop_stats_triggers, rebuild_stats
+)
+from backend.models import Paper, GrokAnalysis, Bookmark, Feed, paper_feeds, split_arxiv_id
+from backend.services.paper_versions import upsert_papers
+
+if TYPE_CHECKING:
+    from backend.services.paper_service import PaperService
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+papers_t = Paper.__table__
+analyses_t = GrokAnalysis.__table__
+bookmarks_t = Bookmark.__table__
+feeds_t = Feed.__table__
+
+# pdf_local_path is exported but not imported: it points into the exporting machine's PDF store
+PAPER_FIELDS = [
+    "arxiv_id", "title", "authors", "abstract", "published_date", "updated_date",
+    "pdf_url", "pdf_local_path", "categories", "primary_category", "created_at",
+]
+# Derived from the exported fields on import, so they are not exported
+DERIVED_PAPER_FIELDS = ["base_id", "content_hash"]
+DATETIME_FIELDS = {"published_date", "updated_date", "created_at", "analyzed_at", "bookmarked_at"}
+
+
+def _encode(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+
+
+def _decode(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: datetime.fromisoformat(v) if k in DATETIME_FIELDS and isinstance(v, str) else v
+        for k, v in row.items()
+    }
+
+
+class CorpusTransfer:
+    def __init__(self, engine: Engine, batch_size: int = 1000, paper_service: Optional["PaperService"] = None):
+        """
+        Stream the corpus to and from compressed JSONL.
+
+        Args:
+            engine: SQLAlchemy engine of the local database
+            batch_size: Rows fetched per cursor round-trip and per upsert batch
+            paper_service: Queues re-analysis of imported papers; the shared one if omitted
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+        self._paper_service = paper_service
+
+    @property
+    def paper_service(self) -> "PaperService":
+        if self._paper_service is None:
+            from backend.dependencies import get_paper_service
+            self._paper_service = get_paper_service()
+        return self._paper_service
+
+    def _stream(self, conn: Connection, stmt) -> Iterator[Dict[str, Any]]:
+        """Iterate a SELECT through a server-side cursor, one partition at a time"""
+        result = conn.execution_options(stream_results=True, yield_per=self.batch_size).execute(stmt)
+        for partition in result.mappings().partitions():
+            yield from partition
+
+    def export_to(self, path: Path) -> Dict[str, int]:
+        """
+        Write feeds, papers, analyses and bookmarks to a gzip JSONL file.
+
+        Each line is {"table": ..., "row": {...}}; analyses and bookmarks refer
+        to papers by arxiv_id so the file can be merged into another instance.
+
+        Args:
+            path: Output file (.jsonl.gz)
+
+        Returns:
+            Rows written per table
+        """
+        counts = {"feeds": 0, "papers": 0, "grok_analyses": 0, "bookmarks": 0}
+        feed_names = (
+            select(func.json_group_array(feeds_t.c.name))
+            .select_from(paper_feeds.join(feeds_t, feeds_t.c.id == paper_feeds.c.feed_id))
+            .where(paper_feeds.c.paper_id == papers_t.c.id)
+            .scalar_subquery()
+        )
+        queries = {
+            "feeds": select(feeds_t.c.name, feeds_t.c.query, feeds_t.c.max_results, feeds_t.c.enabled),
+            "papers": select(*[papers_t.c[f] for f in PAPER_FIELDS], feed_names.label("feeds"))
+            .order_by(papers_t.c.id),
+            "grok_analyses": select(
+                papers_t.c.arxiv_id, analyses_t.c.key_points, analyses_t.c.summary,
+                analyses_t.c.analyzed_at, analyses_t.c.model_version
+            ).join(papers_t, papers_t.c.id == analyses_t.c.paper_id).order_by(analyses_t.c.id),
+            "bookmarks": select(
+                papers_t.c.arxiv_id, bookmarks_t.c.bookmarked_at, bookmarks_t.c.notes
+            ).join(papers_t, papers_t.c.id == bookmarks_t.c.paper_id).order_by(bookmarks_t.c.id),
+        }
+
+        started = time.perf_counter()
+        with gzip.open(path, "wt", encoding="utf-8") as out, self.engine.connect() as conn:
+            out.write(json.dumps({"format": "arxiv-feed-corpus", "version": FORMAT_VERSION}) + "\n")
+            for table, stmt in queries.items():
+                for row in self._stream(conn, stmt):
+                    row = dict(row)
+                    if table == "papers":
+                        row["feeds"] = json.loads(row["feeds"] or "[]")
+                    out.write(json.dumps({"table": table, "row": _encode(row)}, ensure_ascii=False) + "\n")
+                    counts[table] += 1
+
+        logger.info(f"Exported {counts} to {path} in {time.perf_counter() - started:.1f}s")
+        return counts
+
+    def import_from(self, path: Path) -> Dict[str, int]:
+        """
+        Merge a gzip JSONL export into the local database.
+
+        Papers are matched on base_id, as fetches match them: a paper stored
+        under another version is updated in place when the imported version is
+        newer, and kept when it is older. Local PDF paths in the file refer to
+        another machine's PDF store and are not imported. Analyses are merged
+        only into the version they were written for (newer ones win), bookmarks
+        into the paper whatever its version. A paper whose title or abstract
+        changed is queued for re-analysis, unless the file has an analysis of
+        the new version. The FTS triggers are dropped for the duration and the
+        index is rebuilt once at the end.
+
+        Args:
+            path: Input file (.jsonl.gz) written by export_to
+
+        Returns:
+            Rows read per table
+        """
+        counts = {"feeds": 0, "papers": 0, "grok_analyses": 0, "bookmarks": 0}
+        started = time.perf_counter()
+        reanalyze: Set[int] = set()  # Papers whose content changed and that have no analysis of it yet
+
+        with self.engine.connect() as conn:
+            drop_fts_triggers(conn)
+            drop_facet_triggers(conn)
+            drop_stats_triggers(conn)
+            conn.commit()
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as src:
+                    header = json.loads(src.readline() or "{}")
+                    if header.get("format") != "arxiv-feed-corpus":
+                        raise ValueError(f"{path} is not a corpus export")
+
+                    table, batch = None, []
+                    for line in src:
+                        record = json.loads(line)
+                        if record["table"] != table or len(batch) >= self.batch_size:
+                            self._upsert(conn, table, batch, reanalyze)
+                            table, batch = record["table"], []
+                        batch.append(_decode(record["row"]))
+                        counts[record["table"]] += 1
+                    self._upsert(conn, table, batch, reanalyze)
+            finally:
+                fts_started = time.perf_counter()
+                create_fts_triggers(conn)
+                rebuild_fts(conn)
+                rebuild_facets(conn)
+                rebuild_stats(conn)
+                conn.commit()
+                logger.info(f"FTS index, facets and stats rebuilt in {time.perf_counter() - fts_started:.1f}s")
+
+        if reanalyze:
+            with Session(self.engine) as db:
+                for paper_id in sorted(reanalyze):
+                    self.paper_service.enqueue_analysis(db, paper_id)
+                db.commit()
+            logger.info(f"Queued re-analysis of {len(reanalyze)} papers whose title or abstract changed")
+
+        logger.info(f"Imported {counts} from {path} in {time.perf_counter() - started:.1f}s")
+        return counts
+
+    def _paper_ids(self, conn: Connection, arxiv_ids: List[str]) -> Dict[str, int]:
+        """Local paper id for each arxiv_id stored as exactly that version"""
+        rows = conn.execute(select(papers_t.c.arxiv_id, papers_t.c.id).where(papers_t.c.arxiv_id.in_(arxiv_ids)))
+        return dict(rows.all())
+
+    def _paper_ids_any_version(self, conn: Connection, arxiv_ids: List[str]) -> Dict[str, int]:
+        """Local paper id for each arxiv_id, whichever version of the paper is stored"""
+        base_ids = {arxiv_id: split_arxiv_id(arxiv_id)[0] for arxiv_id in arxiv_ids}
+        rows = conn.execute(
+            select(papers_t.c.base_id, papers_t.c.id)
+            .where(papers_t.c.base_id.in_(set(base_ids.values())))
+            .order_by(papers_t.c.id)
+        )
+        by_base = dict(rows.all())
+        return {arxiv_id: by_base[base_id] for arxiv_id, base_id in base_ids.items() if base_id in by_base}
+
+    def _upsert_papers(self, conn: Connection, batch: List[Dict[str, Any]], reanalyze: Set[int]):
+        """Store papers by base id (see upsert_papers) and tag them with their feeds"""
+        _, changed = upsert_papers(conn, batch)
+        reanalyze.update(changed)
+
+        ids = self._paper_ids_any_version(conn, [row["arxiv_id"] for row in batch])
+        feed_ids = dict(conn.execute(select(feeds_t.c.name, feeds_t.c.id)).all())
+        tags = [
+            {"paper_id": ids[row["arxiv_id"]], "feed_id": feed_ids[name]}
+            for row in batch if row["arxiv_id"] in ids
+            for name in row.get("feeds") or [] if name in feed_ids
+        ]
+        if tags:
+            conn.execute(insert(paper_feeds).on_conflict_do_nothing(), tags)
+
+    def _upsert(self, conn: Connection, table: str, batch: List[Dict[str, Any]], reanalyze: Set[int]):
+        """
+        Write one batch of rows of a single table and commit.
+
+        Args:
+            conn: Connection of the import
+            table: Table the rows belong to
+            batch: Decoded rows
+            reanalyze: Papers to queue for re-analysis; updated as papers and analyses are written
+        """
+        if not batch:
+            return
+
+        if table == "feeds":
+            conn.execute(insert(feeds_t).on_conflict_do_nothing(index_elements=["name"]),
+                         [dict(row, created_at=datetime.utcnow()) for row in batch])
+
+        elif table == "papers":
+            self._upsert_papers(conn, batch, reanalyze)
+
+        elif table == "grok_analyses":
+            ids = self._paper_ids(conn, [row["arxiv_id"] for row in batch])
+            rows = [
+                {k: v for k, v in row.items() if k != "arxiv_id"} | {"paper_id": ids[row["arxiv_id"]]}
+                for row in batch if row["arxiv_id"] in ids
+            ]
+            # A stored analysis of a paper whose content changed describes the old text:
+            # an analysis of the new version replaces it whatever its age
+            current = [row for row in rows if row["paper_id"] in reanalyze]
+            rows = [row for row in rows if row["paper_id"] not in reanalyze]
+            reanalyze.difference_update(row["paper_id"] for row in current)
+            stmt = insert(analyses_t)
+            update_all = {f: stmt.excluded[f] for f in ("key_points", "summary", "analyzed_at", "model_version")}
+            if rows:
+                conn.execute(stmt.on_conflict_do_update(
+                    index_elements=["paper_id"], set_=update_all,
+                    where=stmt.excluded.analyzed_at > analyses_t.c.analyzed_at
+                ), rows)
+            if current:
+                conn.execute(stmt.on_conflict_do_update(index_elements=["paper_id"], set_=update_all), current)
+
+        elif table == "bookmarks":
+            ids = self._paper_ids_any_version(conn, [row["arxiv_id"] for row in batch])
+            rows = [
+                {k: v for k, v in row.items() if k != "arxiv_id"} | {"paper_id": ids[row["arxiv_id"]]}
+                for row in batch if row["arxiv_id"] in ids
+            ]
+            if rows:
+                conn.execute(insert(bookmarks_t).on_conflict_do_nothing(index_elements=["paper_id"]), rows)
+
+        else:
+            logger.warning(f"Skipping {len(batch)} rows of unknown table '{table}'")
+            return
+
+        conn.commit()
@@ -0,0 +1,151 @@
+"""
+Prerendered daily digest of newly fetched papers.
+
+After a fetch, a render_digest job writes the papers added that day, with
+their Grok key points, to DIGEST_PATH as <day>.html and <day>.json, and
+copies the newest day to index.html / index.json. The files are served as
+static files under /digest/, so reading a digest costs no database work.
+Files are written to a temporary name and renamed into place, so readers
+never see a partial digest.
+"""
+import os
+import json
+import logging
+from html import escape
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session, joinedload
+
+from backend.models import Paper, Job
+from backend.schemas import PaperDetail
+from backend.services.job_queue import ACTIVE_STATES, RetryLater
+
+logger = logging.getLogger(__name__)
+
+
+class DigestService:
+    def __init__(self, root: Path, pending_retry_seconds: float = 120.0):
+        """
+        Args:
+            root: Directory the digest files are written to
+            pending_retry_seconds: Delay before re-rendering a digest whose analyses are still queued
+        """
+        self.root = Path(root)
+        self.pending_retry_seconds = pending_retry_seconds
+
+    def papers_added_on(self, db: Session, day: date) -> List[Paper]:
+        """Papers stored on day (UTC), newest publication first, with their analyses"""
+        start = datetime(day.year, day.month, day.day)
+        return db.query(Paper)\
+                 .options(joinedload(Paper.grok_analysis), joinedload(Paper.bookmark))\
+                 .filter(Paper.created_at >= start, Paper.created_at < start + timedelta(days=1))\
+                 .order_by(Paper.published_date.desc(), Paper.id.desc())\
+                 .all()
+
+    def render(self, db: Session, day: date) -> Dict[str, Any]:
+        """
+        Write the digest of papers added on day, and make it the latest if it is the newest day.
+
+        Args:
+            db: Database session
+            day: UTC day the papers were fetched
+
+        Returns:
+            Digest document (as written to <day>.json)
+        """
+        papers = self.papers_added_on(db, day)
+        digest = {
+            "date": day.isoformat(),
+            "generated_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+            "analyzed": sum(1 for paper in papers if paper.grok_analysis),
+            "papers": [self._paper_json(paper) for paper in papers],
+        }
+        html = self._render_html(digest)
+        body = json.dumps(digest, ensure_ascii=False, indent=1)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._write(self.root / f"{day.isoformat()}.json", body)
+        self._write(self.root / f"{day.isoformat()}.html", html)
+
+        if day.isoformat() >= self.latest_day():
+            self._write(self.root / "index.json", body)
+            self._write(self.root / "index.html", html)
+
+        logger.info(f"Rendered digest for {day}: {len(papers)} papers, {digest['analyzed']} analyzed")
+        return digest
+
+    def latest_day(self) -> str:
+        """ISO date of the newest rendered digest ("" if none)"""
+        days = [path.stem for path in self.root.glob("????-??-??.json")]
+        return max(days, default="")
+
+    async def run_render_job(self, db: Session, payload: dict):
+        """
+        Job handler: render the digest for payload["day"].
+
+        The digest is written straight away. If analyses of its papers are
+        still queued or running, the job is run again later so the digest
+        picks up their key points.
+
+        Raises:
+            RetryLater: If analyses of the day's papers are still pending
+        """
+        day = date.fromisoformat(payload["day"])
+        digest = self.render(db, day)
+
+        pending_keys = [f"analyze_paper:{paper['id']}" for paper in digest["papers"] if not paper["grok_analysis"]]
+        if pending_keys:
+            pending = db.query(Job.id)\
+                        .filter(Job.dedupe_key.in_(pending_keys), Job.state.in_(ACTIVE_STATES))\
+                        .count()
+            if pending:
+                raise RetryLater(self.pending_retry_seconds, f"{pending} analyses still pending for {day}")
+
+    @staticmethod
+    def _paper_json(paper: Paper) -> Dict[str, Any]:
+        data = PaperDetail.model_validate(paper).model_dump(mode="json", exclude={"pdf_local_path", "bookmark"})
+        data["is_bookmarked"] = paper.bookmark is not None
+        return data
+
+    @staticmethod
+    def _write(path: Path, content: str):
+        temporary = path.with_name(f".{path.name}.tmp")
+        temporary.write_text(content, encoding="utf-8")
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _render_html(digest: Dict[str, Any]) -> str:
+        sections = []
+        for paper in digest["papers"]:
+            analysis = paper["grok_analysis"]
+            key_points = "".join(f"<li>{escape(point)}</li>" for point in analysis["key_points"]) if analysis else ""
+            sections.append(
+                "<article class=\"digest-paper\">"
+                f"<h2><a href=\"https://arxiv.org/abs/{escape(paper['arxiv_id'])}\">{escape(paper['title'])}</a></h2>"
+                f"<p class=\"digest-meta\">{escape(', '.join(paper['authors']))}"
+                f" &middot; {escape(' '.join(paper['categories']))}"
+                f" &middot; published {paper['published_date'][:10]}"
+                f" &middot; <a href=\"/api/papers/{paper['id']}/pdf\">PDF</a></p>"
+                + (f"<ul class=\"key-points\">{key_points}</ul>" if key_points else
+                   "<p class=\"digest-pending\">Analysis pending</p>")
+                + f"<details><summary>Abstract</summary><p>{escape(paper['abstract'])}</p></details>"
+                "</article>"
+            )
+
+        title = f"arXiv digest {digest['date']}"
+        return (
+            "<!DOCTYPE html>\n"
+            "<html lang=\"en\"><head><meta charset=\"UTF-8\">"
+            "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">"
+            f"<title>{escape(title)}</title>"
+            "<link rel=\"stylesheet\" href=\"/static/css/gothic.css\">"
+            "</head><body><div class=\"container digest\">"
+            f"<header><h1>{escape(title)}</h1>"
+            f"<p>{len(digest['papers'])} new papers, {digest['analyzed']} analyzed &middot; "
+            f"generated {digest['generated_at']} &middot; "
+            f"<a href=\"/digest/{digest['date']}.json\">JSON</a> &middot; <a href=\"/\">Viewer</a></p></header>"
+            + ("".join(sections) or "<p>No new papers.</p>")
+            + "</div></body></html>\n"
+        )
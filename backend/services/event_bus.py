@@ -0,0 +1,215 @@
+"""
+Live updates for open viewers, sent as server-sent events.
+
+Writers append a row to the events table with record_event() in the same
+transaction as the change itself, so an event exists exactly when the change
+committed, whichever process made it (the leader's job worker, a manual
+fetch, scripts/daily_fetch.py). Each worker's EventBus reads rows added since
+its last read when the ChangeWatcher sees a write, formats each one once and
+fans it out to the worker's connected clients through one bounded queue per
+client. A reconnecting client is sent the events after the Last-Event-ID it
+reports; a client that fell too far behind, or resumes from an event that has
+been pruned, is sent a "reset" event and reloads its lists instead.
+"""
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from backend import metrics
+from backend.models import Event
+
+logger = logging.getLogger(__name__)
+
+events_delivered = metrics.REGISTRY.counter(
+    "events_delivered_total",
+    "Server-sent events queued to connected clients, by kind",
+    labels=("kind",))
+event_streams = metrics.REGISTRY.gauge(
+    "event_streams",
+    "Open /api/events connections on this worker")
+
+RESET = "reset"  # Sent instead of events a client can no longer be given; it reloads
+CLOSED = None  # Queued to every client when the server stops, ending its stream
+
+# (event id, kind, formatted server-sent event)
+Frame = Tuple[int, str, str]
+
+
+def record_event(db: Session, kind: str, payload: Dict[str, Any]):
+    """
+    Append an event to be pushed to open viewers (the caller commits).
+
+    Args:
+        db: Database session holding the change the event describes
+        kind: paper_added, analysis_ready or bookmark_changed
+        payload: JSON-serializable event data
+    """
+    db.add(Event(kind=kind, payload=payload))
+
+
+def format_event(event_id: int, kind: str, payload: Dict[str, Any]) -> str:
+    """One event in the text/event-stream format"""
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {kind}\ndata: {data}\n\n"
+
+
+class EventBus:
+    def __init__(
+        self,
+        session_factory,
+        queue_size: int = 256,
+        retention_hours: float = 24.0,
+        batch_size: int = 500
+    ):
+        """
+        Args:
+            session_factory: Callable returning a new database session
+            queue_size: Events buffered per client before it is sent a reset
+            retention_hours: Age at which events are pruned
+            batch_size: Events read from the database per query
+        """
+        self.session_factory = session_factory
+        self.queue_size = queue_size
+        self.retention_hours = retention_hours
+        self.batch_size = batch_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._last_id: Optional[int] = None  # Newest event fanned out (or skipped while nobody listened)
+        self._pump_task: Optional[asyncio.Task] = None
+        self._dirty = False
+        self._next_prune = 0.0
+        self._closed = False
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> Tuple[asyncio.Queue, List[Frame]]:
+        """
+        Register a client.
+
+        Args:
+            last_event_id: Last event the client received before reconnecting
+
+        Returns:
+            Tuple of (queue of live events, events the client missed since last_event_id)
+        """
+        if not self._subscribers:
+            # Nobody listened, so nothing read since; start from the newest event
+            self._last_id = await asyncio.to_thread(self._max_id)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._closed:
+            queue.put_nowait(CLOSED)
+            return queue, []
+        self._subscribers.add(queue)
+        event_streams.inc()
+        position = self._last_id  # Live events fanned out from now on come after this one
+
+        if last_event_id is None or last_event_id == position:
+            return queue, []
+        if last_event_id > position:
+            # Another worker may have read further already; only an id no worker can have sent is stale
+            newest = await asyncio.to_thread(self._max_id)
+            if last_event_id > newest:
+                return queue, [self._reset(position)]
+            return queue, []
+
+        missed = await asyncio.to_thread(self._read, last_event_id, position, self.queue_size + 1)
+        # Ids are consecutive (AUTOINCREMENT) unless pruned, so a gap means events were lost
+        if len(missed) > self.queue_size or not missed or missed[0][0] != last_event_id + 1:
+            return queue, [self._reset(position)]
+        return queue, missed
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.discard(queue)
+            event_streams.dec()
+
+    def close(self):
+        """End every open stream, so clients do not hold up server shutdown (they reconnect to another worker or after restart)"""
+        self._closed = True
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(CLOSED)
+
+    def notify(self):
+        """ChangeWatcher callback: read new events if any client is listening"""
+        if not self._subscribers or self._last_id is None or self._closed:
+            return
+        self._dirty = True
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.get_running_loop().create_task(self._pump())
+
+    async def _pump(self):
+        while self._dirty and self._subscribers:
+            self._dirty = False
+            try:
+                frames = await asyncio.to_thread(self._read, self._last_id, None, self.batch_size)
+            except SQLAlchemyError as e:
+                logger.warning(f"Could not read events: {e}")
+                return
+            for frame in frames:
+                self._publish(frame)
+            if len(frames) == self.batch_size:
+                self._dirty = True
+
+        if time.monotonic() >= self._next_prune:
+            self._next_prune = time.monotonic() + 3600
+            try:
+                await asyncio.to_thread(self.prune)
+            except SQLAlchemyError as e:
+                logger.warning(f"Could not prune events: {e}")
+
+    def _publish(self, frame: Frame):
+        event_id, kind, _ = frame
+        if event_id <= self._last_id:
+            return  # Read before a new first subscriber moved the position past it
+        self._last_id = event_id
+        if self._closed:
+            return
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # The client is not keeping up; everything it missed is replaced by a reload
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._reset(event_id))
+            events_delivered.inc(kind=kind)
+
+    @staticmethod
+    def _reset(event_id: int) -> Frame:
+        """Reset sent with the id it replaces everything up to, so a reconnect resumes after it"""
+        return event_id, RESET, format_event(event_id, RESET, {})
+
+    def _max_id(self) -> int:
+        with self.session_factory() as db:
+            return db.query(func.max(Event.id)).scalar() or 0
+
+    def _read(self, after_id: int, up_to_id: Optional[int], limit: int) -> List[Frame]:
+        """Formatted events with after_id < id <= up_to_id, oldest first"""
+        with self.session_factory() as db:
+            query = db.query(Event.id, Event.kind, Event.payload).filter(Event.id > after_id)
+            if up_to_id is not None:
+                query = query.filter(Event.id <= up_to_id)
+            rows = query.order_by(Event.id).limit(limit).all()
+        return [(event_id, kind, format_event(event_id, kind, payload)) for event_id, kind, payload in rows]
+
+    def prune(self) -> int:
+        """
+        Delete events older than the retention period.
+
+        Returns:
+            Number of events deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(hours=self.retention_hours)
+        with self.session_factory() as db:
+            deleted = db.query(Event).filter(Event.created_at < cutoff).delete(synchronize_session=False)
+            db.commit()
+        if deleted:
+            logger.info(f"Pruned {deleted} events older than {self.retention_hours}h")
+        return deleted
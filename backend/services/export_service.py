@@ -0,0 +1,280 @@
+"""
+BibTeX, CSV and JSON Lines exports of papers.
+
+An export is one SELECT read through a server-side cursor, yield_per rows at
+a time; each batch is rendered and handed to the response as one chunk, so
+the first bytes go out as soon as the first batch is read and memory does not
+grow with the number of papers. Papers come newest first, with their Grok key
+points and, when bookmarked, the bookmark time and notes.
+"""
+import io
+import csv
+import json
+import time
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection, Engine, Result
+from sqlalchemy.exc import OperationalError
+
+from backend import metrics
+from backend.models import Paper, GrokAnalysis, Bookmark, paper_categories, split_arxiv_id
+
+logger = logging.getLogger(__name__)
+
+export_rows = metrics.REGISTRY.counter(
+    "export_rows_total",
+    "Papers written by /api/export, by format",
+    labels=("format",))
+
+papers_t = Paper.__table__
+analyses_t = GrokAnalysis.__table__
+bookmarks_t = Bookmark.__table__
+
+# format -> (media type, file extension)
+FORMATS = {
+    "bibtex": ("application/x-bibtex; charset=utf-8", "bib"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson; charset=utf-8", "jsonl"),
+}
+
+CSV_COLUMNS = [
+    "arxiv_id", "title", "authors", "published", "updated", "primary_category", "categories",
+    "url", "pdf_url", "abstract", "key_points", "summary", "bookmarked_at", "notes",
+]
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+
+def _abs_url(arxiv_id: str) -> str:
+    return f"https://arxiv.org/abs/{arxiv_id}"
+
+
+def _bibtex_value(value: str) -> str:
+    """Field text for a {...} value: collapse whitespace, escape LaTeX specials, keep braces balanced"""
+    value = " ".join(value.split())
+    for char in "&%#":
+        value = value.replace(f"\\{char}", char).replace(char, f"\\{char}")
+    if "{" not in value and "}" not in value:
+        return value
+    depth = 0
+    for char in value:
+        depth += {"{": 1, "}": -1}.get(char, 0)
+        if depth < 0:
+            break
+    if depth != 0:
+        value = value.replace("{", "").replace("}", "")
+    return value
+
+
+def render_bibtex(row: Dict[str, Any]) -> str:
+    base_id = row["base_id"] or split_arxiv_id(row["arxiv_id"])[0]
+    published = row["published_date"]
+    fields = [
+        ("title", "{" + _bibtex_value(row["title"]) + "}"),  # Inner braces keep the title's capitalisation
+        ("author", " and ".join(_bibtex_value(name) for name in row["authors"])),
+        ("year", str(published.year)),
+        ("month", MONTHS[published.month - 1]),
+        ("eprint", base_id),
+        ("archivePrefix", "arXiv"),
+        ("primaryClass", row["primary_category"]),
+        ("url", _abs_url(row["arxiv_id"])),
+        ("keywords", ", ".join(row["categories"])),
+        ("abstract", _bibtex_value(row["abstract"])),
+    ]
+    if row["notes"]:
+        fields.append(("annote", _bibtex_value(row["notes"])))
+    body = ",\n".join(f"  {name} = {{{value}}}" for name, value in fields)
+    return f"@misc{{arxiv_{base_id.replace('/', '_')},\n{body}\n}}\n\n"
+
+
+def render_jsonl(row: Dict[str, Any]) -> str:
+    entry = {
+        "arxiv_id": row["arxiv_id"],
+        "title": row["title"],
+        "authors": row["authors"],
+        "abstract": row["abstract"],
+        "published": row["published_date"].isoformat(),
+        "updated": row["updated_date"].isoformat() if row["updated_date"] else None,
+        "primary_category": row["primary_category"],
+        "categories": row["categories"],
+        "url": _abs_url(row["arxiv_id"]),
+        "pdf_url": row["pdf_url"],
+        "key_points": row["key_points"] or [],
+        "summary": row["summary"],
+        "bookmarked_at": row["bookmarked_at"].isoformat() if row["bookmarked_at"] else None,
+        "notes": row["notes"],
+    }
+    return json.dumps(entry, ensure_ascii=False) + "\n"
+
+
+def _csv_line(cells: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(cells)
+    return buffer.getvalue()
+
+
+def render_csv(row: Dict[str, Any]) -> str:
+    return _csv_line([
+        row["arxiv_id"],
+        row["title"],
+        "; ".join(row["authors"]),
+        row["published_date"].date().isoformat(),
+        row["updated_date"].date().isoformat() if row["updated_date"] else "",
+        row["primary_category"],
+        "; ".join(row["categories"]),
+        _abs_url(row["arxiv_id"]),
+        row["pdf_url"],
+        row["abstract"],
+        "\n".join(row["key_points"] or []),
+        row["summary"] or "",
+        row["bookmarked_at"].isoformat() if row["bookmarked_at"] else "",
+        row["notes"] or "",
+    ])
+
+
+RENDERERS = {"bibtex": render_bibtex, "csv": render_csv, "jsonl": render_jsonl}
+
+
+class ExportService:
+    def __init__(self, engine: Engine, batch_size: int = 500):
+        """
+        Args:
+            engine: SQLAlchemy engine of the local database
+            batch_size: Rows fetched per cursor round-trip and rendered per response chunk
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _query(
+        bookmarked: bool,
+        q: Optional[str],
+        category: Optional[str],
+        date_from: Optional[date],
+        date_until: Optional[date],
+        limit: Optional[int]
+    ):
+        """Papers matching the filters, newest first, with their analysis and bookmark columns"""
+        stmt = select(
+            papers_t.c.arxiv_id, papers_t.c.base_id, papers_t.c.title, papers_t.c.authors,
+            papers_t.c.abstract, papers_t.c.published_date, papers_t.c.updated_date,
+            papers_t.c.pdf_url, papers_t.c.categories, papers_t.c.primary_category,
+            analyses_t.c.key_points, analyses_t.c.summary,
+            bookmarks_t.c.bookmarked_at, bookmarks_t.c.notes
+        ).select_from(
+            papers_t.outerjoin(analyses_t, analyses_t.c.paper_id == papers_t.c.id)
+            .join(bookmarks_t, bookmarks_t.c.paper_id == papers_t.c.id, isouter=not bookmarked)
+        )
+        if q:
+            stmt = stmt.where(papers_t.c.id.in_(
+                text("SELECT rowid FROM papers_fts WHERE papers_fts MATCH :q").bindparams(q=q)
+            ))
+        if category:
+            stmt = stmt.where(papers_t.c.id.in_(
+                select(paper_categories.c.paper_id).where(paper_categories.c.category == category)
+            ))
+        if date_from:
+            stmt = stmt.where(papers_t.c.published_date >= datetime.combine(date_from, datetime.min.time()))
+        if date_until:
+            stmt = stmt.where(papers_t.c.published_date < datetime.combine(date_until + timedelta(days=1),
+                                                                           datetime.min.time()))
+        stmt = stmt.order_by(papers_t.c.published_date.desc())
+        if limit:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def stream(
+        self,
+        fmt: str,
+        bookmarked: bool = False,
+        q: Optional[str] = None,
+        category: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_until: Optional[date] = None,
+        limit: Optional[int] = None
+    ) -> "ExportStream":
+        """
+        Start an export. The query runs before this returns, so a bad search
+        query fails here instead of halfway through a response.
+
+        Args:
+            fmt: "bibtex", "csv" or "jsonl"
+            bookmarked: Only export bookmarked papers
+            q: Optional full-text query (as in search)
+            category: Optional arXiv category
+            date_from: Optional first publication day (inclusive)
+            date_until: Optional last publication day (inclusive)
+            limit: Optional maximum number of papers
+
+        Returns:
+            The export's encoded chunks
+
+        Raises:
+            ValueError: If q is not a valid full-text query
+        """
+        stmt = self._query(bookmarked, q, category, date_from, date_until, limit)
+        conn = self.engine.connect()
+        try:
+            result = conn.execution_options(stream_results=True, yield_per=self.batch_size).execute(stmt)
+        except OperationalError as e:
+            conn.close()
+            if not q:
+                raise
+            raise ValueError(f"Invalid search query: {e.orig}")
+        except Exception:
+            conn.close()
+            raise
+        return ExportStream(conn, result, fmt)
+
+
+class ExportStream:
+    def __init__(self, conn: Connection, result: Result, fmt: str):
+        """
+        Encoded chunks of a running export. Holds a database connection (and
+        its read snapshot) until iterated to the end or closed.
+
+        Args:
+            conn: Connection the query runs on, closed with the stream
+            result: Streaming result of the export query
+            fmt: "bibtex", "csv" or "jsonl"
+        """
+        self.conn = conn
+        self.result = result
+        self.fmt = fmt
+        self.rows = 0
+        self._started = time.perf_counter()
+        self._closed = False
+        # close() may be called from another thread (the response ending on a client
+        # disconnect) while a threadpool thread is fetching; it waits for the fetch
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[bytes]:
+        render = RENDERERS[self.fmt]
+        partitions = self.result.mappings().partitions()
+        try:
+            if self.fmt == "csv":
+                yield _csv_line(CSV_COLUMNS).encode("utf-8")
+            while True:
+                with self._lock:
+                    partition = None if self._closed else next(partitions, None)
+                    if partition is None:
+                        return
+                    chunk = "".join(render(row) for row in partition).encode("utf-8")
+                self.rows += len(partition)
+                export_rows.inc(len(partition), format=self.fmt)
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the connection; safe to call more than once and from any thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self.conn.close()
+        logger.info(f"Exported {self.rows} papers as {self.fmt} in {time.perf_counter() - self._started:.1f}s")
@@ -0,0 +1,110 @@
+"""
+Background merging of the papers_fts index.
+
+Every transaction that writes papers adds a small segment to the FTS5 index.
+FTS5 merges segments as it goes, but an index grown by fetches still ends up
+with many of them, and every search reads all of them. After each ingest a
+merge_fts job runs 'merge' steps, each in its own short transaction so that
+searches and writers are never held up for long. Normally only levels that
+have accumulated several segments are merged; once FTS_OPTIMIZE_AFTER_PAPERS
+papers were added since the last full merge, every segment is merged into
+one. Full merges (and rebuilds) are recorded as "fts_optimize" task runs.
+"""
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.database import merge_fts
+from backend.models import Paper, TaskRun
+from backend.services.job_queue import RetryLater
+from backend.services.locks import default_owner
+
+logger = logging.getLogger(__name__)
+
+
+class FtsMaintenance:
+    def __init__(
+        self,
+        engine,
+        step_pages: int = 500,
+        job_seconds: float = 20.0,
+        optimize_after_papers: int = 2000
+    ):
+        """
+        Args:
+            engine: SQLAlchemy engine of the database holding papers_fts
+            step_pages: Index pages written per merge step (one transaction)
+            job_seconds: Merge time per job run; longer merges continue in a later run
+            optimize_after_papers: Papers added since the last full merge that make the next merge full
+        """
+        self.engine = engine
+        self.step_pages = step_pages
+        self.job_seconds = job_seconds
+        self.optimize_after_papers = optimize_after_papers
+
+    def merge(self, full: bool, seconds: Optional[float] = None) -> Tuple[int, bool]:
+        """
+        Run merge steps until there is nothing left to merge or time runs out.
+
+        Args:
+            full: Merge every segment into one instead of only crowded levels
+            seconds: Time limit (None: until done)
+
+        Returns:
+            Tuple of (steps that did work, whether the merge is complete)
+        """
+        deadline = None if seconds is None else time.monotonic() + seconds
+        steps = 0
+        while True:
+            with self.engine.begin() as conn:
+                worked = merge_fts(conn, -self.step_pages if full else self.step_pages)
+            if not worked:
+                return steps, True
+            steps += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                return steps, False
+
+    @staticmethod
+    def papers_since_optimize(db: Session) -> int:
+        """Papers added since the last full merge or rebuild of the index"""
+        last = db.query(func.max(TaskRun.started_at))\
+                 .filter(TaskRun.task == "fts_optimize", TaskRun.status == "success")\
+                 .scalar()
+        query = db.query(func.count(Paper.id))
+        if last is not None:
+            query = query.filter(Paper.created_at >= last)
+        return query.scalar()
+
+    @staticmethod
+    def record_optimize(db: Session, trigger: str, started_at: datetime):
+        """Record a completed full merge or rebuild, resetting papers_since_optimize"""
+        db.add(TaskRun(task="fts_optimize", trigger=trigger, owner=default_owner(), status="success",
+                       started_at=started_at, finished_at=datetime.utcnow()))
+        db.commit()
+
+    async def run_merge_job(self, db: Session, payload: dict):
+        """
+        Job handler: merge index segments after an ingest.
+
+        Raises:
+            RetryLater: If the merge is not complete after job_seconds (it continues in the next run)
+        """
+        started_at = datetime.utcnow()
+        pending = self.papers_since_optimize(db)
+        full = pending >= self.optimize_after_papers
+        db.commit()  # Do not hold a read transaction while the steps write
+
+        started = time.perf_counter()
+        steps, complete = await asyncio.to_thread(self.merge, full, self.job_seconds)
+        logger.info(f"FTS {'full ' if full else ''}merge: {steps} steps in "
+                    f"{time.perf_counter() - started:.1f}s ({pending} papers since last full merge)")
+
+        if not complete:
+            raise RetryLater(1.0, f"FTS merge continues after {steps} steps")
+        if full:
+            self.record_optimize(db, "job", started_at)
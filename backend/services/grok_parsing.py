@@ -0,0 +1,130 @@
+"""
+Tolerant parsing of Grok key-point replies.
+
+Grok is asked for a JSON object ({"key_points": [...]}) through the
+json_schema response format, or for a bare JSON array on servers without it.
+Replies that are not valid JSON (truncated at max_tokens, wrapped in prose or
+markdown fences, or written as a bullet list) are salvaged here rather than
+thrown away with the paid completion.
+"""
+import re
+import json
+from json.decoder import scanstring
+from typing import Any, List, Optional, Tuple
+
+MAX_POINT_LENGTH = 120
+
+CLEAN, RECOVERED = "clean", "recovered"
+
+KEY_POINTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "key_points": {
+            "type": "array",
+            "items": {"type": "string"}
+        }
+    },
+    "required": ["key_points"],
+    "additionalProperties": False
+}
+
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "key_points", "strict": True, "schema": KEY_POINTS_SCHEMA}
+}
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+?)\s*$", re.MULTILINE)
+_WHITESPACE = " \t\r\n"
+
+
+def _clean(points: List[Any]) -> List[str]:
+    """Keep non-empty strings, truncated to MAX_POINT_LENGTH"""
+    return [p.strip()[:MAX_POINT_LENGTH] for p in points if isinstance(p, str) and p.strip()]
+
+
+def _points_from_object(value: Any) -> Optional[List[Any]]:
+    """The key-point list in a decoded reply: the array itself or the first list of strings in an object"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        if isinstance(value.get("key_points"), list):
+            return value["key_points"]
+        for item in value.values():
+            if isinstance(item, list) and any(isinstance(p, str) for p in item):
+                return item
+    return None
+
+
+def scan_string_array(text: str, start: int) -> List[str]:
+    """
+    Read string elements of a JSON array incrementally, stopping at the first error.
+
+    Complete elements before a truncation or a syntax error are kept; a string
+    cut off mid-way is dropped.
+
+    Args:
+        text: Reply text
+        start: Index of the opening '['
+
+    Returns:
+        Decoded strings, possibly empty
+    """
+    decoder = json.JSONDecoder()
+    items = []
+    pos = start + 1
+    while pos < len(text):
+        while pos < len(text) and text[pos] in _WHITESPACE + ",":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            break
+        try:
+            if text[pos] == '"':
+                item, pos = scanstring(text, pos + 1)
+                items.append(item)
+            else:
+                _, pos = decoder.raw_decode(text, pos)  # skip non-string elements
+        except (json.JSONDecodeError, ValueError):
+            break
+    return items
+
+
+def parse_key_points(content: str) -> Tuple[Optional[List[str]], str]:
+    """
+    Extract key points from a Grok reply.
+
+    Tries, in order: the whole reply (or its fenced block) as JSON, the string
+    elements of the first array in the text, then markdown bullet or numbered
+    lines.
+
+    Args:
+        content: Message content from the chat completion
+
+    Returns:
+        (points, outcome) where outcome is "clean" for valid JSON, "recovered"
+        when the points had to be salvaged, or (None, "failed")
+    """
+    content = (content or "").strip()
+    if not content:
+        return None, "failed"
+
+    fenced = _FENCE.search(content)
+    body = fenced.group(1).strip() if fenced else content
+
+    try:
+        points = _points_from_object(json.loads(body))
+        if points is not None and _clean(points):
+            return _clean(points), CLEAN
+    except json.JSONDecodeError:
+        pass
+
+    for match in re.finditer(r"\[\s*\"", body):
+        points = _clean(scan_string_array(body, match.start()))
+        if points:
+            return points, RECOVERED
+
+    points = _clean(_BULLET.findall(body))
+    if points:
+        return points, RECOVERED
+
+    return None, "failed"
@@ -1,15 +1,50 @@
 import httpx
-import json
+import random
+import asyncio
 import time
 import logging
-from typing import List, Optional, Dict, Any
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from typing import List, Optional, Dict, Any, Tuple
+
+from backend import metrics
+from backend.services.grok_parsing import RESPONSE_FORMAT, parse_key_points
+from backend.services.resilience import AdaptiveLimiter, CircuitBreaker, CircuitOpenError, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+# 429 and transient server errors are retried; other 4xx will not succeed on retry
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class GrokRequestError(Exception):
+    """Grok rejected the request or kept failing; counts as a failed job attempt"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class GrokUnavailable(Exception):
+    """Grok asked us to back off or its circuit is open; try again after retry_after seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 class GrokService:
-    def __init__(self, api_key: str, model: str = "grok-4-1-fast-reasoning", rate_limit_delay: float = 6.0):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "grok-4-1-fast-reasoning",
+        rate_limit_delay: float = 6.0,
+        base_url: str = "https://api.x.ai/v1/chat/completions",
+        max_retries: int = 3,
+        max_retry_wait: float = 60.0,
+        timeout: float = 30.0,
+        structured_output: bool = True,
+        limiter: Optional[AdaptiveLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Initialize Grok xAI service.
 
@@ -17,28 +52,186 @@ class GrokService:
             api_key: Grok xAI API key
             model: Model name (default: grok-4-1-fast-reasoning)
             rate_limit_delay: Seconds between requests (default 6.0 for 10 req/min)
+            base_url: Chat completions endpoint (any OpenAI-compatible server)
+            max_retries: Retries per call for 429, 5xx and timeouts
+            max_retry_wait: Longest Retry-After honoured in-call; longer waits raise GrokUnavailable
+            timeout: Per-request timeout in seconds
+            structured_output: Request the json_schema response format (turned off if the server rejects it)
+            limiter: Adaptive concurrency limit (default: AIMD between 1 and 4)
+            breaker: Circuit breaker (default: opens after 5 consecutive failures for 60s)
         """
         self.api_key = api_key
         self.model = model
         self.rate_limit_delay = rate_limit_delay
-        self.base_url = "https://api.x.ai/v1/chat/completions"
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.timeout = timeout
+        self.structured_output = structured_output
+        self.limiter = limiter or AdaptiveLimiter("grok", initial=2, max_limit=4)
+        self.breaker = breaker or CircuitBreaker("grok")
         self.last_request_time = 0
+        self._not_before = 0.0  # Shared pause set by Retry-After / exhausted rate-limit headers
+        self._rate_lock = None
+
+    async def _rate_limit(self):
+        """Implement rate limiting between requests without blocking the event loop"""
+        if self._rate_lock is None:
+            self._rate_lock = asyncio.Lock()
+        async with self._rate_lock:
+            wait = max(self.rate_limit_delay - (time.time() - self.last_request_time),
+                       self._not_before - time.time())
+            if wait > 0:
+                logger.debug(f"Rate limiting: sleeping {wait:.2f}s")
+                await asyncio.sleep(wait)
+            self.last_request_time = time.time()
+
+    def _pause_until(self, delay: float):
+        """Hold every caller back for `delay` seconds"""
+        self._not_before = max(self._not_before, time.time() + delay)
+
+    def _read_rate_headers(self, response: httpx.Response):
+        """Pause when the x-ratelimit-* headers say the request budget is spent"""
+        remaining = response.headers.get("x-ratelimit-remaining-requests")
+        if remaining is not None and remaining.strip() == "0":
+            reset = parse_retry_after(response.headers.get("x-ratelimit-reset-requests"))
+            if reset:
+                logger.info(f"Grok request budget exhausted, pausing {reset:.1f}s")
+                self._pause_until(min(reset, self.max_retry_wait))
+
+    def _backoff(self, attempt: int) -> float:
+        return min(2.0 ** attempt, 30.0) * random.uniform(0.5, 1.0)
+
+    async def _post(self, body: Dict[str, Any]) -> httpx.Response:
+        """
+        POST a chat completion with retries, adaptive concurrency and the circuit breaker.
+
+        Returns:
+            The successful response
+
+        Raises:
+            GrokUnavailable: Circuit open, or throttled for longer than max_retry_wait
+            GrokRequestError: Non-retryable status, or retries exhausted
+        """
+        last_error = ""
+        retry_after = None
+        for attempt in range(self.max_retries + 1):
+            # Wait for a slot before claiming the breaker: a half-open probe claimed and then
+            # cancelled while waiting would never be freed and keep the circuit rejecting calls
+            await self.limiter.acquire()
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                await self.limiter.release()
+                raise GrokUnavailable(str(e), e.retry_after)
+
+            outcome, latency, retry_after = None, None, None
+            started = time.perf_counter()
+            try:
+                await self._rate_limit()
+                started = time.perf_counter()
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.post(
+                        self.base_url,
+                        headers={
+                            "Authorization": f"Bearer {self.api_key}",
+                            "Content-Type": "application/json"
+                        },
+                        json=body
+                    )
+                latency = time.perf_counter() - started
+                self._read_rate_headers(response)
+                status = response.status_code
+
+                if status < 400:
+                    outcome = "success"
+                    self.breaker.record_success()
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                last_error = f"HTTP {status}"
+                if status == 429:
+                    outcome = "throttled"
+                    self.breaker.record_neutral()
+                    if retry_after is not None:
+                        self._pause_until(min(retry_after, self.max_retry_wait))
+                elif status in RETRYABLE_STATUS:
+                    outcome = "server_error"
+                    self.breaker.record_failure(last_error)
+                else:
+                    outcome = "client_error"
+                    self.breaker.record_neutral()
+                    raise GrokRequestError(f"Grok API returned {status}: {response.text[:200]}", status)
+
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                outcome = "timeout" if isinstance(e, httpx.TimeoutException) else "transport_error"
+                last_error = f"{type(e).__name__}: {e}"
+                self.breaker.record_failure(last_error)
+            finally:
+                if outcome is None:
+                    self.breaker.record_neutral()  # cancelled: free a half-open probe
+                # Only successes grow the limit; 429s shrink it; server errors are the breaker's job
+                await self.limiter.release(latency if outcome == "success" else None,
+                                           throttled=outcome == "throttled")
+                metrics.grok_request_duration.observe(time.perf_counter() - started, outcome=outcome or "cancelled")
+
+            if self.breaker.state == CircuitBreaker.OPEN:
+                raise GrokUnavailable(f"Grok circuit opened ({last_error})", self.breaker.reset_timeout)
+            if attempt == self.max_retries:
+                break
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            if delay > self.max_retry_wait:
+                raise GrokUnavailable(f"Grok asked to retry in {delay:.0f}s ({last_error})", delay)
+            metrics.grok_retries.inc()
+            logger.warning(f"Grok call failed ({last_error}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        if last_error == "HTTP 429":
+            raise GrokUnavailable("Grok still throttling after retries", retry_after or self._backoff(self.max_retries))
+        raise GrokRequestError(f"Grok call failed after {self.max_retries + 1} attempts: {last_error}")
+
+    async def _complete(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        """
+        Run one chat completion and return the message content.
+
+        Uses the json_schema response format while structured_output is on; a
+        400 naming response_format switches it off for good and the call is
+        sent again without it.
+
+        Returns:
+            The reply content ("" if the response has none)
+        """
+        body = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if self.structured_output:
+            try:
+                response = await self._post({**body, "response_format": RESPONSE_FORMAT})
+            except GrokRequestError as e:
+                if e.status != 400 or "response_format" not in str(e):
+                    raise
+                logger.warning(f"Grok rejected structured output, falling back to plain JSON: {e}")
+                self.structured_output = False
+                response = await self._post(body)
+        else:
+            response = await self._post(body)
+
+        try:
+            data = response.json()
+            self._record_usage(data.get("usage") or {})
+            return data["choices"][0]["message"]["content"] or ""
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            logger.error(f"Unexpected Grok response: {type(e).__name__}: {e}")
+            return ""
+
+    def _format_hint(self) -> str:
+        if self.structured_output:
+            return 'Return a JSON object with a "key_points" array of strings, nothing else.'
+        return 'Return ONLY a JSON array of strings, nothing else. Example format:\n["Point 1 here", "Point 2 here", "Point 3 here"]'
 
-    def _rate_limit(self):
-        """Implement rate limiting between requests"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - elapsed
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-        reraise=True
-    )
     async def analyze_paper(
         self,
         title: str,
@@ -47,15 +240,20 @@ class GrokService:
         """
         Analyze a paper using Grok AI to extract key insights.
 
+        Replies that are not clean JSON are salvaged by grok_parsing; only if
+        that fails is a short repair call made with the broken reply.
+
         Args:
             title: Paper title
             abstract: Paper abstract
 
         Returns:
-            List of 5-7 key insight strings (max 120 chars each) or None if failed
-        """
-        self._rate_limit()
+            List of 5-7 key insight strings (max 120 chars each) or None if the reply was unusable
 
+        Raises:
+            GrokUnavailable: Grok is throttling or down; retry later
+            GrokRequestError: The request failed and retrying it here did not help
+        """
         prompt = f"""You are analyzing an academic paper about GenAI and cybersecurity. Extract 5-7 key technical insights as concise bullet points.
 
 Title: {title}
@@ -68,70 +266,69 @@ Requirements:
 - Be specific and actionable
 - Avoid generic statements
 
-Return ONLY a JSON array of strings, nothing else. Example format:
-["Point 1 here", "Point 2 here", "Point 3 here"]"""
+{self._format_hint()}"""
 
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.base_url,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a technical research analyst specializing in AI security. Return only valid JSON arrays."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 500
-                    }
-                )
-
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract content from response
-                content = data["choices"][0]["message"]["content"].strip()
-
-                # Parse JSON array
-                # Remove markdown code blocks if present
-                if content.startswith("```"):
-                    content = content.split("```")[1]
-                    if content.startswith("json"):
-                        content = content[4:]
-                    content = content.strip()
-
-                key_points = json.loads(content)
-
-                # Validate response
-                if not isinstance(key_points, list):
-                    logger.error(f"Invalid response format: expected list, got {type(key_points)}")
-                    return None
-
-                if not (5 <= len(key_points) <= 7):
-                    logger.warning(f"Expected 5-7 points, got {len(key_points)}")
-
-                # Truncate points to 120 chars
-                key_points = [point[:120] for point in key_points if isinstance(point, str)]
-
-                logger.info(f"Successfully analyzed paper: {len(key_points)} key points extracted")
-                return key_points
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Grok response as JSON: {e}")
-            return None
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error calling Grok API: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error in Grok analysis: {e}")
+        content = await self._complete(
+            [
+                {
+                    "role": "system",
+                    "content": "You are a technical research analyst specializing in AI security. Return only valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.7,
+            max_tokens=500
+        )
+
+        key_points, outcome = parse_key_points(content)
+        if key_points is None and content.strip():
+            logger.warning(f"Unparseable Grok reply, asking for a repair: {content[:80]!r}")
+            key_points, outcome = await self._repair(content)
+        metrics.grok_parse_outcomes.inc(outcome=outcome)
+
+        if key_points is None:
+            logger.error(f"Failed to parse Grok response: {content[:200]!r}")
             return None
+        if not (5 <= len(key_points) <= 7):
+            logger.warning(f"Expected 5-7 points, got {len(key_points)}")
+
+        logger.info(f"Successfully analyzed paper ({outcome}): {len(key_points)} key points extracted")
+        return key_points
+
+    async def _repair(self, content: str) -> Tuple[Optional[List[str]], str]:
+        """
+        Ask Grok to reformat a reply it got wrong.
+
+        The request carries only the broken reply, not the paper, so it costs a
+        fraction of the original call.
+
+        Returns:
+            (points, "repaired") or (None, "failed")
+        """
+        repaired = await self._complete(
+            [
+                {
+                    "role": "system",
+                    "content": "You convert text into valid JSON. Do not add information."
+                },
+                {
+                    "role": "user",
+                    "content": f"Rewrite these key points as 5-7 strings of at most 120 characters.\n"
+                               f"{self._format_hint()}\n\n{content[:2000]}"
+                }
+            ],
+            temperature=0.0,
+            max_tokens=500
+        )
+        key_points, _ = parse_key_points(repaired)
+        return (key_points, "repaired") if key_points else (None, "failed")
+
+    @staticmethod
+    def _record_usage(usage: Dict[str, Any]):
+        """Count prompt/completion tokens reported in the response's usage block"""
+        for token_type in ("prompt_tokens", "completion_tokens"):
+            if isinstance(usage.get(token_type), int):
+                metrics.grok_tokens.inc(usage[token_type], type=token_type.split("_")[0])
@@ -0,0 +1,252 @@
+import uuid
+import random
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import func, select, update, and_, or_
+from sqlalchemy.orm import Session
+
+from backend.models import Job
+
+logger = logging.getLogger(__name__)
+
+jobs_t = Job.__table__
+
+ACTIVE_STATES = ("queued", "running")
+
+
+class RetryLater(Exception):
+    """Raised by a job handler to run the job again later without using up an attempt"""
+
+    def __init__(self, delay: float, reason: str = ""):
+        super().__init__(reason or f"retry in {delay:.0f}s")
+        self.delay = delay
+
+
+class PermanentFailure(Exception):
+    """Raised by a job handler for a failure that retrying cannot fix; the job is dead-lettered at once"""
+
+
+class JobQueue:
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        lease_seconds: int = 300,
+        backoff_base: float = 30.0,
+        backoff_max: float = 3600.0
+    ):
+        """
+        Durable job queue stored in the jobs table.
+
+        Args:
+            max_attempts: Attempts before a job is moved to the dead-letter state
+            lease_seconds: How long a claimed job stays leased to its worker
+            backoff_base: Delay before the first retry; doubles per attempt
+            backoff_max: Upper bound for the retry delay
+        """
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def enqueue(
+        self,
+        db: Session,
+        kind: str,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+        priority: int = 100,
+        delay: float = 0
+    ) -> Job:
+        """
+        Add a job in the caller's transaction (the caller commits).
+
+        If dedupe_key is given and a queued or running job with the same key
+        exists, that job is returned instead of adding a duplicate.
+        """
+        if dedupe_key:
+            existing = db.query(Job).filter(
+                Job.dedupe_key == dedupe_key,
+                Job.state.in_(ACTIVE_STATES)
+            ).first()
+            if existing:
+                return existing
+
+        job = Job(
+            kind=kind,
+            payload=payload,
+            dedupe_key=dedupe_key,
+            priority=priority,
+            max_attempts=self.max_attempts,
+            run_after=datetime.utcnow() + timedelta(seconds=delay)
+        )
+        db.add(job)
+        return job
+
+    def claim(self, db: Session, kinds: Sequence[str], worker_id: str) -> Optional[Job]:
+        """
+        Atomically lease the next runnable job.
+
+        The candidate is selected and leased in a single UPDATE, so concurrent
+        workers (in any process) never receive the same job. Running jobs whose
+        lease expired are picked up again.
+
+        Returns:
+            The claimed job, or None if nothing is runnable
+        """
+        now = datetime.utcnow()
+        token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+
+        candidate = (
+            select(jobs_t.c.id)
+            .where(
+                jobs_t.c.kind.in_(kinds),
+                or_(
+                    and_(jobs_t.c.state == "queued", jobs_t.c.run_after <= now),
+                    and_(
+                        jobs_t.c.state == "running",
+                        jobs_t.c.lease_expires_at < now,
+                        jobs_t.c.attempts < jobs_t.c.max_attempts
+                    ),
+                )
+            )
+            .order_by(jobs_t.c.priority, jobs_t.c.run_after, jobs_t.c.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            update(jobs_t)
+            .where(jobs_t.c.id == candidate)
+            .values(
+                state="running",
+                lease_owner=token,
+                lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                attempts=jobs_t.c.attempts + 1,
+                updated_at=now
+            )
+        )
+        db.commit()
+
+        if result.rowcount == 0:
+            return None
+        return db.query(Job).filter(Job.lease_owner == token).first()
+
+    def complete(self, db: Session, job: Job):
+        """Mark a claimed job done, provided the lease is still ours"""
+        now = datetime.utcnow()
+        db.execute(
+            update(jobs_t)
+            .where(jobs_t.c.id == job.id, jobs_t.c.lease_owner == job.lease_owner)
+            .values(state="done", lease_owner=None, lease_expires_at=None,
+                    last_error=None, updated_at=now, finished_at=now)
+        )
+        db.commit()
+
+    def fail(self, db: Session, job: Job, error: str, permanent: bool = False):
+        """
+        Record a failed attempt.
+
+        The job is retried after an exponential backoff with jitter, or moved
+        to the dead-letter state once it has used all its attempts, or at once
+        if the failure is permanent.
+        """
+        now = datetime.utcnow()
+        if permanent:
+            values = dict(state="dead", finished_at=now)
+            logger.error(f"Job {job.id} ({job.kind}) dead, not retryable: {error}")
+        elif job.attempts >= job.max_attempts:
+            values = dict(state="dead", finished_at=now)
+            logger.error(f"Job {job.id} ({job.kind}) dead after {job.attempts} attempts: {error}")
+        else:
+            delay = min(self.backoff_base * 2 ** (job.attempts - 1), self.backoff_max)
+            delay *= random.uniform(0.5, 1.0)
+            values = dict(state="queued", run_after=now + timedelta(seconds=delay))
+            logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, "
+                           f"retrying in {delay:.0f}s: {error}")
+
+        db.execute(
+            update(jobs_t)
+            .where(jobs_t.c.id == job.id, jobs_t.c.lease_owner == job.lease_owner)
+            .values(lease_owner=None, lease_expires_at=None, last_error=error[:2000],
+                    updated_at=now, **values)
+        )
+        db.commit()
+
+    def defer(self, db: Session, job: Job, delay: float, reason: str):
+        """
+        Requeue a claimed job after `delay` seconds and give back its attempt.
+
+        For failures that are not the job's fault, e.g. an upstream that is
+        throttling or behind an open circuit breaker.
+        """
+        now = datetime.utcnow()
+        logger.info(f"Job {job.id} ({job.kind}) deferred {delay:.0f}s: {reason}")
+        db.execute(
+            update(jobs_t)
+            .where(jobs_t.c.id == job.id, jobs_t.c.lease_owner == job.lease_owner)
+            .values(state="queued", attempts=jobs_t.c.attempts - 1,
+                    run_after=now + timedelta(seconds=delay), lease_owner=None,
+                    lease_expires_at=None, last_error=reason[:2000], updated_at=now)
+        )
+        db.commit()
+
+    def reap_expired(self, db: Session) -> int:
+        """Dead-letter running jobs whose lease expired on their last attempt"""
+        now = datetime.utcnow()
+        result = db.execute(
+            update(jobs_t)
+            .where(
+                jobs_t.c.state == "running",
+                jobs_t.c.lease_expires_at < now,
+                jobs_t.c.attempts >= jobs_t.c.max_attempts
+            )
+            .values(state="dead", lease_owner=None, lease_expires_at=None,
+                    last_error="Lease expired on final attempt", updated_at=now, finished_at=now)
+        )
+        db.commit()
+        return result.rowcount
+
+    def retry(self, db: Session, job_id: int) -> bool:
+        """Put a dead job back in the queue with a fresh set of attempts"""
+        result = db.execute(
+            update(jobs_t)
+            .where(jobs_t.c.id == job_id, jobs_t.c.state == "dead")
+            .values(state="queued", attempts=0, run_after=datetime.utcnow(),
+                    finished_at=None, updated_at=datetime.utcnow())
+        )
+        db.commit()
+        return result.rowcount > 0
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """Queue depth per state and kind, plus recent throughput"""
+        now = datetime.utcnow()
+
+        depth: Dict[str, Dict[str, int]] = {}
+        for kind, state, count in db.query(Job.kind, Job.state, func.count())\
+                .filter(Job.state.in_(("queued", "running", "dead")))\
+                .group_by(Job.kind, Job.state):
+            depth.setdefault(kind, {})[state] = count
+
+        def finished_since(state: str, minutes: int) -> int:
+            return db.query(func.count(Job.id)).filter(
+                Job.state == state,
+                Job.finished_at >= now - timedelta(minutes=minutes)
+            ).scalar()
+
+        oldest = db.query(func.min(Job.run_after)).filter(
+            Job.state == "queued", Job.run_after <= now
+        ).scalar()
+
+        done_last_hour = finished_since("done", 60)
+        return {
+            "depth": depth,
+            "queued": sum(d.get("queued", 0) for d in depth.values()),
+            "running": sum(d.get("running", 0) for d in depth.values()),
+            "dead": sum(d.get("dead", 0) for d in depth.values()),
+            "done_last_5m": finished_since("done", 5),
+            "done_last_hour": done_last_hour,
+            "dead_last_hour": finished_since("dead", 60),
+            "throughput_per_minute": round(done_last_hour / 60, 2),
+            "oldest_runnable_age_seconds": (now - oldest).total_seconds() if oldest else 0.0,
+        }
@@ -0,0 +1,91 @@
+import os
+import socket
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import update, delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import Lock
+
+logger = logging.getLogger(__name__)
+
+locks_t = Lock.__table__
+
+
+def default_owner() -> str:
+    """Lock owner id unique to this process"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class DbLock:
+    def __init__(self, session_factory: sessionmaker, name: str, ttl_seconds: int = 600,
+                 owner: Optional[str] = None):
+        """
+        Named lock with an expiry, held in the locks table.
+
+        Works across processes sharing the database. A holder that dies
+        releases the lock implicitly when its lease expires; live holders
+        call renew() well within ttl_seconds.
+
+        Args:
+            session_factory: Creates database sessions
+            name: Lock name
+            ttl_seconds: Lease length
+            owner: Holder id (defaults to host:pid:random)
+        """
+        self.session_factory = session_factory
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.owner = owner or default_owner()
+
+    def acquire(self) -> bool:
+        """Take the lock if it is free, expired or already ours; returns True on success"""
+        now = datetime.utcnow()
+        expires = now + timedelta(seconds=self.ttl_seconds)
+        db = self.session_factory()
+        try:
+            db.execute(
+                insert(locks_t)
+                .values(name=self.name, owner=self.owner, acquired_at=now, expires_at=expires)
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            result = db.execute(
+                update(locks_t)
+                .where(
+                    locks_t.c.name == self.name,
+                    (locks_t.c.owner == self.owner) | (locks_t.c.expires_at < now)
+                )
+                .values(owner=self.owner, acquired_at=now, expires_at=expires)
+            )
+            db.commit()
+            return result.rowcount > 0
+        finally:
+            db.close()
+
+    def renew(self) -> bool:
+        """Extend our lease; returns False if the lock was lost"""
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(locks_t)
+                .where(locks_t.c.name == self.name, locks_t.c.owner == self.owner)
+                .values(expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds))
+            )
+            db.commit()
+            if result.rowcount == 0:
+                logger.warning(f"Lock '{self.name}' lost by {self.owner}")
+            return result.rowcount > 0
+        finally:
+            db.close()
+
+    def release(self):
+        db = self.session_factory()
+        try:
+            db.execute(delete(locks_t).where(locks_t.c.name == self.name, locks_t.c.owner == self.owner))
+            db.commit()
+        finally:
+            db.close()
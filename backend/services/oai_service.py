@@ -0,0 +1,329 @@
+import json
+import time
+import logging
+import httpx
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.models import HarvestCheckpoint, content_hash
+from backend.services.arxiv_service import RateBudget
+from backend.services.paper_versions import upsert_papers
+
+if TYPE_CHECKING:
+    from backend.services.paper_service import PaperService
+
+logger = logging.getLogger(__name__)
+
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+RAW_NS = "{http://arxiv.org/OAI/arXivRaw/}"
+
+
+class OaiError(Exception):
+    """OAI-PMH protocol error returned by the repository"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+def _clean(value: Optional[str]) -> str:
+    """Collapse the hard line wrapping arXiv uses in titles and abstracts"""
+    return " ".join((value or "").split())
+
+
+def _split_authors(authors: str) -> List[str]:
+    """Split an arXivRaw author string ("A, B and C") into names"""
+    names = _clean(authors).replace(" and ", ", ").split(",")
+    return [name.strip() for name in names if name.strip()]
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse an arXivRaw version date into naive UTC, as stored by the ORM"""
+    return parsedate_to_datetime(value).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_arxiv_raw(record: ET.Element) -> Optional[Dict[str, Any]]:
+    """
+    Convert one OAI <record> in arXivRaw format to a papers row.
+
+    Args:
+        record: <record> element
+
+    Returns:
+        Column values for papers, or None for deleted records
+    """
+    header = record.find(f"{OAI_NS}header")
+    if header is not None and header.get("status") == "deleted":
+        return None
+
+    raw = record.find(f"{OAI_NS}metadata/{RAW_NS}arXivRaw")
+    if raw is None:
+        return None
+
+    versions = raw.findall(f"{RAW_NS}version")
+    if not versions:
+        return None
+
+    base_id = raw.findtext(f"{RAW_NS}id").strip()
+    latest = versions[-1].get("version", "v1")
+    arxiv_id = f"{base_id}{latest}"
+    categories = (raw.findtext(f"{RAW_NS}categories") or "").split()
+    title = _clean(raw.findtext(f"{RAW_NS}title"))
+    abstract = _clean(raw.findtext(f"{RAW_NS}abstract"))
+
+    return {
+        "arxiv_id": arxiv_id,
+        "base_id": base_id,
+        "content_hash": content_hash(title, abstract),
+        "title": title,
+        "authors": _split_authors(raw.findtext(f"{RAW_NS}authors") or ""),
+        "abstract": abstract,
+        "published_date": _parse_date(versions[0].findtext(f"{RAW_NS}date")),
+        "updated_date": _parse_date(versions[-1].findtext(f"{RAW_NS}date")),
+        "pdf_url": f"https://arxiv.org/pdf/{arxiv_id}",
+        "pdf_local_path": None,
+        "categories": categories,
+        "primary_category": categories[0] if categories else "",
+    }
+
+
+class OaiHarvester:
+    def __init__(
+        self,
+        base_url: str,
+        batch_size: int = 500,
+        rate_limit_delay: float = 3.0,
+        max_retries: int = 5,
+        paper_service: Optional["PaperService"] = None
+    ):
+        """
+        Initialize OAI-PMH bulk harvester for historical backfill.
+
+        Args:
+            base_url: OAI-PMH endpoint of the repository
+            batch_size: Rows per batched insert
+            rate_limit_delay: Seconds between page requests (default 3.0)
+            max_retries: Retries per page on 503/5xx and transport errors
+            paper_service: Queues analysis of harvested papers; the shared one if omitted
+        """
+        self.base_url = base_url
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.budget = RateBudget(rate_limit_delay)
+        self._paper_service = paper_service
+
+    @property
+    def paper_service(self) -> "PaperService":
+        if self._paper_service is None:
+            from backend.dependencies import get_paper_service
+            self._paper_service = get_paper_service()
+        return self._paper_service
+
+    def _iter_page(self, params: Dict[str, str], skip: int = 0) -> Iterator[Tuple[str, Any]]:
+        """
+        Fetch one ListRecords page and parse it incrementally.
+
+        The response is fed to an XMLPullParser chunk by chunk and each record
+        is detached from the tree once parsed, so memory stays constant no
+        matter how large the page is. A page that fails partway is fetched
+        again, and the records already yielded from it are skipped (a page is
+        the same list of records every time it is requested).
+
+        Args:
+            params: Query parameters of the page
+            skip: Records at the start of the page to skip (stored by an interrupted run)
+
+        Yields:
+            ("record", (position in the page, row dict)) for every live record, then ("token", str or None)
+        """
+        delivered = skip  # Records of this page yielded by earlier, failed attempts or runs
+        for attempt in range(self.max_retries + 1):
+            self.budget.acquire()
+            try:
+                with httpx.stream("GET", self.base_url, params=params, timeout=120.0) as response:
+                    if response.status_code >= 500:
+                        delay = float(response.headers.get("Retry-After", 0) or 0)
+                        if attempt < self.max_retries:
+                            logger.warning(f"OAI server returned {response.status_code}, retrying in {delay:.0f}s")
+                            time.sleep(delay)
+                            continue
+                    response.raise_for_status()
+
+                    parser = ET.XMLPullParser(events=("start", "end"))
+                    container = None
+                    token = None
+                    position = 0
+                    for chunk in response.iter_bytes():
+                        parser.feed(chunk)
+                        for event, elem in parser.read_events():
+                            if event == "start":
+                                if elem.tag == f"{OAI_NS}ListRecords":
+                                    container = elem
+                                continue
+                            if elem.tag == f"{OAI_NS}record":
+                                position += 1
+                                fresh = position > delivered
+                                row = parse_arxiv_raw(elem) if fresh else None
+                                if container is not None:
+                                    container.remove(elem)
+                                if fresh:
+                                    delivered = position
+                                    if row is not None:
+                                        yield "record", (position, row)
+                            elif elem.tag == f"{OAI_NS}resumptionToken":
+                                token = (elem.text or "").strip() or None
+                            elif elem.tag == f"{OAI_NS}error":
+                                code = elem.get("code", "unknown")
+                                if code == "noRecordsMatch":
+                                    break
+                                raise OaiError(code, (elem.text or "").strip())
+                    parser.close()
+                    yield "token", token
+                    return
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"OAI request failed ({e}), retrying")
+                time.sleep(2 ** attempt)
+
+        raise OaiError("unavailable", f"OAI server still failing after {self.max_retries} retries")
+
+    def _insert_batch(self, db: Session, rows: List[Dict[str, Any]], feed_id: Optional[int]) -> int:
+        """
+        Store rows by base id (see upsert_papers) and queue analysis of new papers
+        and of papers whose title or abstract changed (the caller commits).
+
+        Returns:
+            Papers added
+        """
+        if not rows:
+            return 0
+
+        now = datetime.utcnow()
+        for row in rows:
+            row.setdefault("created_at", now)
+
+        added, changed = upsert_papers(db, rows)
+        for paper_id in added + changed:
+            self.paper_service.enqueue_analysis(db, paper_id)
+
+        if feed_id is not None:
+            db.execute(
+                text("""
+                    INSERT OR IGNORE INTO paper_feeds (paper_id, feed_id)
+                    SELECT id, :feed_id FROM papers WHERE base_id IN (SELECT value FROM json_each(:ids))
+                """),
+                {"feed_id": feed_id, "ids": json.dumps([row["base_id"] for row in rows])}
+            )
+        return len(added)
+
+    def harvest(
+        self,
+        db: Session,
+        name: str,
+        set_spec: str = "cs",
+        from_date: Optional[str] = None,
+        until_date: Optional[str] = None,
+        categories: Sequence[str] = ("cs.CR",),
+        feed_id: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        restart: bool = False
+    ) -> HarvestCheckpoint:
+        """
+        Harvest records into papers, resuming from the named checkpoint.
+
+        Each batch is committed with the counters and the position in the page
+        it reached, and the resumption token with the page's last batch, so an
+        interrupted harvest fetches the page it stopped in again and skips the
+        records already stored and counted.
+
+        Args:
+            db: Database session
+            name: Checkpoint name identifying this harvest
+            set_spec: OAI set to harvest (e.g. "cs")
+            from_date: Lower datestamp bound (YYYY-MM-DD)
+            until_date: Upper datestamp bound (YYYY-MM-DD)
+            categories: Keep only records listing one of these categories (empty keeps all)
+            feed_id: Tag harvested papers with this feed
+            max_pages: Stop after this many pages; run again to continue
+            restart: Discard an existing checkpoint and start over
+
+        Returns:
+            The checkpoint after the run
+        """
+        params = {"set": set_spec, "from": from_date, "until": until_date, "categories": list(categories)}
+        checkpoint = db.query(HarvestCheckpoint).filter(HarvestCheckpoint.name == name).first()
+
+        if checkpoint and (restart or checkpoint.params != params):
+            if not restart:
+                logger.warning(f"Checkpoint '{name}' has different parameters, starting over")
+            db.delete(checkpoint)
+            db.commit()
+            checkpoint = None
+
+        if checkpoint is None:
+            checkpoint = HarvestCheckpoint(name=name, params=params)
+            db.add(checkpoint)
+            db.commit()
+        elif checkpoint.completed_at is not None:
+            logger.info(f"Harvest '{name}' already completed at {checkpoint.completed_at}")
+            return checkpoint
+        else:
+            logger.info(f"Resuming harvest '{name}' after {checkpoint.records_seen} records")
+
+        wanted = set(categories)
+        pages = 0
+
+        while True:
+            if checkpoint.resumption_token:
+                request = {"verb": "ListRecords", "resumptionToken": checkpoint.resumption_token}
+            else:
+                request = {"verb": "ListRecords", "metadataPrefix": "arXivRaw", "set": set_spec}
+                if from_date:
+                    request["from"] = from_date
+                if until_date:
+                    request["until"] = until_date
+
+            batch: List[Dict[str, Any]] = []
+            seen = 0  # Records since the last commit
+            for kind, value in self._iter_page(request, skip=checkpoint.page_position or 0):
+                if kind == "token":
+                    checkpoint.papers_added += self._insert_batch(db, batch, feed_id)
+                    checkpoint.records_seen += seen
+                    checkpoint.page_position = None
+                    checkpoint.resumption_token = value
+                    checkpoint.updated_at = datetime.utcnow()
+                    if value is None:
+                        checkpoint.completed_at = checkpoint.updated_at
+                    db.commit()
+                    break
+
+                position, row = value
+                seen += 1
+                if wanted and wanted.isdisjoint(row["categories"]):
+                    continue
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    checkpoint.papers_added += self._insert_batch(db, batch, feed_id)
+                    checkpoint.records_seen += seen
+                    checkpoint.page_position = position
+                    checkpoint.updated_at = datetime.utcnow()
+                    db.commit()
+                    batch, seen = [], 0
+
+            pages += 1
+            logger.info(f"Harvest '{name}': page {pages}, {checkpoint.records_seen} records seen, "
+                        f"{checkpoint.papers_added} papers added")
+
+            if checkpoint.completed_at is not None:
+                logger.info(f"Harvest '{name}' complete")
+                return checkpoint
+            if max_pages is not None and pages >= max_pages:
+                logger.info(f"Harvest '{name}' paused after {pages} pages")
+                return checkpoint
+
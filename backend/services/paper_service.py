@@ -1,115 +1,369 @@
+import asyncio
 import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, text
-from typing import List, Optional, Tuple
-from datetime import datetime
-
-from backend.models import Paper, GrokAnalysis, Bookmark
-from backend.services.arxiv_service import ArxivService
-from backend.services.grok_service import GrokService
+from sqlalchemy import desc, exists, func, intersect, or_, select, text
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, timezone
+
+from backend.models import (
+    Paper, GrokAnalysis, Bookmark, Feed, paper_feeds,
+    paper_categories, paper_authors, category_counts, author_counts,
+    content_hash, split_arxiv_id
+)
+from backend.services.job_queue import JobQueue, PermanentFailure, RetryLater
+from backend.services.event_bus import record_event
+from backend.schemas import PaperList
 from backend.config import settings
 
+if TYPE_CHECKING:
+    import arxiv
+    from backend.services.arxiv_service import ArxivService
+    from backend.services.grok_service import GrokService
+    from backend.services.pdf_store import PdfStore
+
 logger = logging.getLogger(__name__)
 
+# Categories with at least this many papers are listed by walking the
+# published_date index (stopping after a page of matches) instead of sorting
+# every paper in the category
+_WALK_CATEGORY_MIN_PAPERS = 1000
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """arXiv API datetimes are timezone-aware; stored ones are naive UTC"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
-class PaperService:
-    def __init__(self, arxiv_service: ArxivService, grok_service: GrokService):
-        self.arxiv_service = arxiv_service
-        self.grok_service = grok_service
 
-    async def fetch_new_papers(self, db: Session, days_back: int = 7) -> Tuple[int, int]:
+class AnalysisError(Exception):
+    """Grok returned no usable analysis; the job is retried"""
+
+
+class FetchAborted(Exception):
+    """A running fetch was told to stop (e.g. its lock was lost); papers stored so far are kept"""
+
+
+class PaperService:
+    def __init__(
+        self,
+        arxiv_service: Optional["ArxivService"] = None,
+        grok_service: Optional["GrokService"] = None,
+        job_queue: Optional[JobQueue] = None,
+        pdf_store: Optional["PdfStore"] = None
+    ):
+        """
+        Args:
+            arxiv_service: arXiv client; the shared provider's instance if omitted
+            grok_service: Grok client; the shared provider's instance if omitted
+            job_queue: Queue for analysis jobs; built from settings if omitted
+            pdf_store: Where downloaded PDFs go; the shared provider's instance if omitted
         """
-        Fetch new papers from arXiv, analyze with Grok, and store in database.
+        self._arxiv_service = arxiv_service
+        self._grok_service = grok_service
+        self._pdf_store = pdf_store
+        self.job_queue = job_queue or JobQueue(
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            lease_seconds=settings.JOB_LEASE_SECONDS,
+            backoff_base=settings.JOB_BACKOFF_BASE_SECONDS,
+            backoff_max=settings.JOB_BACKOFF_MAX_SECONDS
+        )
+
+    async def fetch_new_papers(
+        self,
+        db: Session,
+        days_back: int = 7,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Tuple[int, int, int]:
+        """
+        Fetch new papers from arXiv, store them and queue their Grok analysis.
+
+        Papers already stored under another version (or with a newer
+        updated_date) have their metadata refreshed in place; they are only
+        analyzed again if their title or abstract changed.
+
+        Analysis runs on the job worker pool; this returns once papers are stored.
+        Database work, PDF downloads and the PDF quota sweep run in a worker
+        thread (one paper at a time, so the session is never shared), and
+        other jobs and requests keep being served meanwhile.
 
         Args:
             db: Database session
             days_back: How many days back to search
+            should_stop: Polled before each paper; once it returns True the
+                fetch raises FetchAborted (papers stored so far are kept)
 
         Returns:
-            Tuple of (papers_added, papers_skipped)
+            Tuple of (papers_added, papers_updated, papers_skipped)
         """
-        papers_added = 0
-        papers_skipped = 0
+        counts = {"added": 0, "updated": 0, "skipped": 0}
 
         try:
-            # Search arXiv
-            results = self.arxiv_service.search_papers(
-                query=settings.ARXIV_SEARCH_QUERY,
-                max_results=settings.ARXIV_MAX_RESULTS,
-                days_back=days_back
-            )
+            feeds_by_id, feed_specs = await asyncio.to_thread(self._feed_specs, db)
+            results = await self.arxiv_service.search_feeds(feed_specs, days_back=days_back)
 
             logger.info(f"Processing {len(results)} papers from arXiv")
 
-            for arxiv_paper in results:
-                arxiv_id = arxiv_paper.get_short_id()
-
-                # Check if already exists
-                existing = db.query(Paper).filter(Paper.arxiv_id == arxiv_id).first()
-                if existing:
-                    logger.debug(f"Paper already exists: {arxiv_id}")
-                    papers_skipped += 1
-                    continue
-
-                # Download PDF
-                pdf_storage = settings.get_pdf_storage_path()
-                pdf_path = self.arxiv_service.download_pdf(arxiv_paper, pdf_storage)
-
-                # Create paper record
-                paper = Paper(
-                    arxiv_id=arxiv_id,
-                    title=arxiv_paper.title,
-                    authors=[author.name for author in arxiv_paper.authors],
-                    abstract=arxiv_paper.summary,
-                    published_date=arxiv_paper.published,
-                    updated_date=arxiv_paper.updated,
-                    pdf_url=arxiv_paper.pdf_url,
-                    pdf_local_path=str(pdf_path) if pdf_path else None,
-                    categories=[cat for cat in arxiv_paper.categories],
-                    primary_category=arxiv_paper.primary_category
-                )
-
-                db.add(paper)
-                db.flush()  # Get paper.id
-
-                # Analyze with Grok
-                try:
-                    key_points = await self.grok_service.analyze_paper(
-                        title=paper.title,
-                        abstract=paper.abstract
-                    )
-
-                    if key_points:
-                        analysis = GrokAnalysis(
-                            paper_id=paper.id,
-                            key_points=key_points,
-                            model_version=self.grok_service.model
-                        )
-                        db.add(analysis)
-                        logger.info(f"Added paper with Grok analysis: {arxiv_id}")
-                    else:
-                        logger.warning(f"Grok analysis failed for {arxiv_id}, paper added without analysis")
-
-                except Exception as e:
-                    logger.error(f"Grok analysis error for {arxiv_id}: {e}")
-
-                db.commit()
-                papers_added += 1
-
-            logger.info(f"Fetch complete: {papers_added} added, {papers_skipped} skipped")
-            return papers_added, papers_skipped
+            for arxiv_id, (arxiv_paper, feed_ids) in results.items():
+                if should_stop is not None and should_stop():
+                    raise FetchAborted(f"Fetch stopped after {sum(counts.values())} of {len(results)} papers")
+                matched_feeds = [feeds_by_id[feed_id] for feed_id in feed_ids]
+                outcome = await asyncio.to_thread(self._store_result, db, arxiv_id, arxiv_paper, matched_feeds)
+                counts[outcome] += 1
+
+            logger.info(f"Fetch complete: {counts['added']} added, {counts['updated']} updated, "
+                        f"{counts['skipped']} skipped")
+            await asyncio.to_thread(self._finish_fetch, db, counts["added"], counts["updated"])
+            return counts["added"], counts["updated"], counts["skipped"]
 
         except Exception as e:
             logger.error(f"Error in fetch_new_papers: {e}")
             db.rollback()
             raise
 
+    @staticmethod
+    def _feed_specs(db: Session) -> Tuple[Dict[int, Feed], List[Tuple[Optional[int], str, int]]]:
+        """Enabled feeds by id, and the (feed id, query, max results) to crawl"""
+        # Crawl every enabled feed; without any, fall back to the configured query
+        feeds = db.query(Feed).filter(Feed.enabled == True).order_by(Feed.id).all()  # noqa: E712
+        feed_specs = [
+            (feed.id, feed.query, feed.max_results or settings.ARXIV_MAX_RESULTS)
+            for feed in feeds
+        ] or [(None, settings.ARXIV_SEARCH_QUERY, settings.ARXIV_MAX_RESULTS)]
+        return {feed.id: feed for feed in feeds}, feed_specs
+
+    def _store_result(self, db: Session, arxiv_id: str, arxiv_paper: "arxiv.Result",
+                      matched_feeds: List[Feed]) -> str:
+        """
+        Store one fetched paper and commit (blocking; runs in a worker thread).
+
+        Returns:
+            "added", "updated" or "skipped"
+        """
+        # Any stored version of this paper (arxiv_id catches rows not yet given a base_id)
+        base_id, _ = split_arxiv_id(arxiv_id)
+        existing = db.query(Paper)\
+                     .filter(or_(Paper.base_id == base_id, Paper.arxiv_id == arxiv_id))\
+                     .order_by(desc(Paper.id))\
+                     .first()
+        if existing:
+            new_tags = [feed for feed in matched_feeds if feed not in existing.feeds]
+            if new_tags:
+                existing.feeds.extend(new_tags)
+            updated = self.refresh_metadata(db, existing, arxiv_paper)
+            if not updated:
+                logger.debug(f"Paper already exists: {arxiv_id}")
+            db.commit()
+            return "updated" if updated else "skipped"
+
+        # Download PDF
+        pdf_path = self.arxiv_service.download_pdf(arxiv_paper, self.pdf_store)
+
+        # Create paper record
+        paper = Paper(
+            arxiv_id=arxiv_id,
+            title=arxiv_paper.title,
+            authors=[author.name for author in arxiv_paper.authors],
+            abstract=arxiv_paper.summary,
+            published_date=arxiv_paper.published,
+            updated_date=arxiv_paper.updated,
+            pdf_url=arxiv_paper.pdf_url,
+            pdf_local_path=str(pdf_path) if pdf_path else None,
+            categories=[cat for cat in arxiv_paper.categories],
+            primary_category=arxiv_paper.primary_category,
+            base_id=base_id,
+            content_hash=content_hash(arxiv_paper.title, arxiv_paper.summary),
+            feeds=matched_feeds
+        )
+
+        db.add(paper)
+        db.flush()  # Get paper.id
+
+        # Queue Grok analysis and tell open viewers; committed atomically with the paper
+        self.enqueue_analysis(db, paper.id)
+        record_event(db, "paper_added", PaperList.model_validate(paper).model_dump(mode="json"))
+
+        db.commit()
+        return "added"
+
+    def _finish_fetch(self, db: Session, papers_added: int, papers_updated: int):
+        """Queue the follow-up jobs of a fetch and sweep the PDF store (blocking; runs in a worker thread)"""
+        if papers_added:
+            self.enqueue_digest(db, datetime.utcnow().date())
+        if papers_added or papers_updated:
+            self.enqueue_fts_merge(db)
+            db.commit()
+        if papers_added:
+            self.pdf_store.enforce_quota()
+
+    def refresh_metadata(self, db: Session, paper: Paper, result: "arxiv.Result") -> bool:
+        """
+        Bring a stored paper up to date with a newer version from arXiv (the caller commits).
+
+        Only columns whose value changed are written, so the FTS, facet and
+        stats triggers fire only for what actually changed. A new version's PDF
+        is downloaded again. Re-analysis is queued only if the content hash of
+        title and abstract changed, not for re-wrapped text or new metadata.
+
+        Args:
+            db: Database session
+            paper: Stored paper with the same base id
+            result: arXiv API result
+
+        Returns:
+            True if anything was updated
+        """
+        arxiv_id = result.get_short_id()
+        updated_date = _naive_utc(result.updated)
+        if arxiv_id == paper.arxiv_id and updated_date == paper.updated_date:
+            return False
+
+        # The API can list an older version than the one stored (e.g. from OAI-PMH)
+        if split_arxiv_id(arxiv_id)[1] < split_arxiv_id(paper.arxiv_id)[1] or (
+                updated_date and paper.updated_date and updated_date < paper.updated_date):
+            return False
+
+        old_hash = paper.content_hash or content_hash(paper.title, paper.abstract)
+        values = {
+            "arxiv_id": arxiv_id,
+            "base_id": split_arxiv_id(arxiv_id)[0],
+            "title": result.title,
+            "authors": [author.name for author in result.authors],
+            "abstract": result.summary,
+            "updated_date": updated_date,
+            "pdf_url": result.pdf_url,
+            "categories": list(result.categories),
+            "primary_category": result.primary_category,
+            "content_hash": content_hash(result.title, result.summary),
+        }
+        changed = [name for name, value in values.items() if getattr(paper, name) != value]
+        if not changed:
+            return False
+
+        for name in changed:
+            setattr(paper, name, values[name])
+        if "arxiv_id" in changed:
+            pdf_path = self.arxiv_service.download_pdf(result, self.pdf_store)
+            paper.pdf_local_path = str(pdf_path) if pdf_path else None
+
+        reanalyze = values["content_hash"] != old_hash
+        if reanalyze:
+            self.enqueue_analysis(db, paper.id)
+        logger.info(f"Updated {paper.base_id} to {arxiv_id} ({', '.join(changed)})"
+                    + ("; re-analysis queued" if reanalyze else ""))
+        return True
+
+    @property
+    def arxiv_service(self) -> "ArxivService":
+        # Resolved on first use so read-only paths never import the arXiv client
+        if self._arxiv_service is None:
+            from backend.dependencies import get_arxiv_service
+            self._arxiv_service = get_arxiv_service()
+        return self._arxiv_service
+
+    @property
+    def grok_service(self) -> "GrokService":
+        if self._grok_service is None:
+            from backend.dependencies import get_grok_service
+            self._grok_service = get_grok_service()
+        return self._grok_service
+
+    @property
+    def pdf_store(self) -> "PdfStore":
+        if self._pdf_store is None:
+            from backend.dependencies import get_pdf_store
+            self._pdf_store = get_pdf_store()
+        return self._pdf_store
+
+    def enqueue_analysis(self, db: Session, paper_id: int):
+        """Queue a Grok analysis job for a paper (the caller commits)"""
+        self.job_queue.enqueue(
+            db,
+            "analyze_paper",
+            {"paper_id": paper_id},
+            dedupe_key=f"analyze_paper:{paper_id}"
+        )
+
+    def enqueue_fts_merge(self, db: Session):
+        """
+        Queue merging of the search index's segments after an ingest (the caller commits).
+
+        The job waits FTS_MERGE_DELAY_SECONDS, so the ingests of a busy
+        period are merged once.
+        """
+        self.job_queue.enqueue(
+            db,
+            "merge_fts",
+            {},
+            dedupe_key="merge_fts",
+            priority=300,
+            delay=settings.FTS_MERGE_DELAY_SECONDS
+        )
+
+    def enqueue_digest(self, db: Session, day: date):
+        """
+        Queue rendering of the day's digest (the caller commits).
+
+        It runs after the analysis jobs queued before it, so the digest
+        usually has their key points on its first render.
+        """
+        self.job_queue.enqueue(
+            db,
+            "render_digest",
+            {"day": day.isoformat()},
+            dedupe_key=f"render_digest:{day.isoformat()}",
+            priority=200
+        )
+
+    async def run_analysis_job(self, db: Session, payload: dict):
+        """
+        Job handler: analyze a paper with Grok and store the key points.
+
+        Raises:
+            AnalysisError: If Grok returned nothing usable (the job is retried)
+            RetryLater: If Grok is throttling or its circuit is open (no attempt is used)
+            PermanentFailure: If Grok rejected the request (4xx other than 429), e.g. a bad API key
+        """
+        from backend.services.grok_service import GrokRequestError, GrokUnavailable
+
+        paper = db.query(Paper).filter(Paper.id == payload["paper_id"]).first()
+        if not paper:
+            logger.info(f"Paper {payload['paper_id']} no longer exists, skipping analysis")
+            return
+
+        try:
+            key_points = await self.grok_service.analyze_paper(
+                title=paper.title,
+                abstract=paper.abstract
+            )
+        except GrokUnavailable as e:
+            raise RetryLater(e.retry_after, str(e))
+        except GrokRequestError as e:
+            # The same request would be rejected again; only exhausted retries are worth another attempt
+            if e.status is not None and 400 <= e.status < 500 and e.status != 429:
+                raise PermanentFailure(str(e))
+            raise
+        if not key_points:
+            raise AnalysisError(f"No key points returned for {paper.arxiv_id}")
+
+        analysis = paper.grok_analysis or GrokAnalysis(paper_id=paper.id)
+        analysis.key_points = key_points
+        analysis.model_version = self.grok_service.model
+        analysis.analyzed_at = datetime.utcnow()
+        db.add(analysis)
+        record_event(db, "analysis_ready", {"paper_id": paper.id})
+        db.commit()
+        logger.info(f"Added Grok analysis: {paper.arxiv_id}")
+
     def get_papers(
         self,
         db: Session,
         limit: int = 20,
         offset: int = 0,
-        bookmarked_only: bool = False
+        bookmarked_only: bool = False,
+        feed: Optional[str] = None,
+        category: Optional[str] = None,
+        author: Optional[str] = None
     ) -> Tuple[List[Paper], int]:
         """
         Get paginated list of papers, newest first.
@@ -119,16 +373,26 @@ class PaperService:
             limit: Number of papers to return
             offset: Offset for pagination
             bookmarked_only: If True, only return bookmarked papers
+            feed: If set, only return papers matched by the feed with this name
+            category: If set, only return papers listed in this arXiv category
+            author: If set, only return papers by this author (case-insensitive)
 
         Returns:
             Tuple of (papers list, total count)
         """
-        query = db.query(Paper)
+        category_papers = None
+        if category:
+            # Maintained by triggers, so no need to count the matching rows
+            category_papers = db.query(category_counts.c.papers)\
+                                .filter(category_counts.c.category == category)\
+                                .scalar() or 0
 
-        if bookmarked_only:
-            query = query.join(Bookmark)
+        query = self._filter_papers(db.query(Paper), bookmarked_only, feed, category, author, category_papers)
 
-        total = query.count()
+        if category and not (bookmarked_only or feed or author):
+            total = category_papers
+        else:
+            total = query.count()
 
         papers = query.order_by(desc(Paper.published_date))\
                      .limit(limit)\
@@ -137,6 +401,112 @@ class PaperService:
 
         return papers, total
 
+    @staticmethod
+    def _filter_papers(
+        query,
+        bookmarked_only: bool,
+        feed: Optional[str],
+        category: Optional[str],
+        author: Optional[str],
+        category_papers: Optional[int] = None
+    ):
+        """
+        Apply the paper list filters to a query over Paper.
+
+        Args:
+            category_papers: Papers in category, if known; picks the plan for newest-first listing
+        """
+        if bookmarked_only:
+            query = query.join(Bookmark)
+
+        if feed:
+            query = query.join(paper_feeds, paper_feeds.c.paper_id == Paper.id)\
+                         .join(Feed, Feed.id == paper_feeds.c.feed_id)\
+                         .filter(Feed.name == feed)
+
+        if category:
+            in_category = paper_categories.c.category == category
+            if category_papers is not None and category_papers >= _WALK_CATEGORY_MIN_PAPERS:
+                query = query.filter(exists().where(paper_categories.c.paper_id == Paper.id, in_category))
+            else:
+                query = query.filter(Paper.id.in_(select(paper_categories.c.paper_id).where(in_category)))
+
+        if author:
+            query = query.filter(Paper.id.in_(
+                select(paper_authors.c.paper_id).where(paper_authors.c.name == author.strip())
+            ))
+
+        return query
+
+    def get_facets(
+        self,
+        db: Session,
+        limit: int = 20,
+        bookmarked_only: bool = False,
+        feed: Optional[str] = None,
+        category: Optional[str] = None,
+        author: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Paper counts per category and per author for the papers a list query matches.
+
+        Without filters the counts are read from the trigger-maintained
+        category_counts / author_counts tables; with filters they are grouped
+        from the normalized tables for the matching papers only.
+
+        Args:
+            db: Database session
+            limit: Maximum categories and maximum authors returned (most papers first)
+            bookmarked_only: Count only bookmarked papers
+            feed: Count only papers matched by the feed with this name
+            category: Count only papers listed in this category
+            author: Count only papers by this author
+
+        Returns:
+            Dict with total, categories and authors ({value, papers} lists)
+        """
+        if not (bookmarked_only or feed or category or author):
+            total = db.query(func.count(Paper.id)).scalar()
+            facets = {}
+            for name, table, column in (
+                ("categories", category_counts, category_counts.c.category),
+                ("authors", author_counts, author_counts.c.name),
+            ):
+                rows = db.query(column, table.c.papers)\
+                         .order_by(desc(table.c.papers), column)\
+                         .limit(limit)\
+                         .all()
+                facets[name] = [{"value": value, "papers": papers} for value, papers in rows]
+            return {"total": total, **facets}
+
+        if bookmarked_only or feed:
+            ids = self._filter_papers(db.query(Paper.id), bookmarked_only, feed, category, author).subquery()
+        else:
+            # Category / author only: the normalized tables alone identify the papers
+            matches = []
+            if category:
+                matches.append(select(paper_categories.c.paper_id.label("id"))
+                               .where(paper_categories.c.category == category))
+            if author:
+                matches.append(select(paper_authors.c.paper_id.label("id"))
+                               .where(paper_authors.c.name == author.strip()))
+            ids = (matches[0] if len(matches) == 1 else intersect(*matches)).subquery()
+        total = db.query(func.count()).select_from(ids).scalar()
+        facets = {}
+        for name, column in (
+            ("categories", paper_categories.c.category),
+            ("authors", paper_authors.c.name),
+        ):
+            papers = func.count().label("papers")
+            rows = db.query(column, papers)\
+                     .filter(column.table.c.paper_id.in_(select(ids.c.id)))\
+                     .group_by(column)\
+                     .order_by(desc(papers), column)\
+                     .limit(limit)\
+                     .all()
+            facets[name] = [{"value": value, "papers": count} for value, count in rows]
+        return {"total": total, **facets}
+
     def get_paper_by_id(self, db: Session, paper_id: int) -> Optional[Paper]:
         """Get single paper by ID with all relationships loaded"""
         return db.query(Paper).filter(Paper.id == paper_id).first()
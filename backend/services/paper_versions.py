@@ -0,0 +1,95 @@
+"""
+Version-aware storing of papers from bulk sources (OAI-PMH harvest, corpus import).
+
+A paper is one row per base id holding its newest known version, as the API
+fetch keeps it (PaperService.refresh_metadata): a newer version updates the
+stored row in place and an older one is ignored.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from backend.models import Paper, content_hash, split_arxiv_id
+
+papers_t = Paper.__table__
+
+# Columns an incoming version may overwrite; created_at stays, pdf_local_path is decided here
+UPDATED_FIELDS = [
+    "arxiv_id", "base_id", "title", "authors", "abstract", "published_date", "updated_date",
+    "pdf_url", "categories", "primary_category", "content_hash",
+]
+
+
+def recency(row) -> tuple:
+    """Sort key of a paper row: arXiv version, then updated_date"""
+    return split_arxiv_id(row["arxiv_id"])[1], row["updated_date"] or datetime.min
+
+
+def upsert_papers(conn, rows: List[Dict[str, Any]]) -> Tuple[List[int], List[int]]:
+    """
+    Store papers, one row per base id (the caller commits).
+
+    Papers not stored under any version are inserted. A stored older (or the
+    same) version is updated in place when anything differs, and a stored
+    newer version is left alone. Incoming pdf_local_path values are ignored:
+    the stored PDF is kept while the version is unchanged and cleared when it
+    changes, so pdf_store downloads the new version.
+
+    Args:
+        conn: Connection or session
+        rows: Papers' column values; base_id and content_hash are derived when missing
+
+    Returns:
+        (ids of inserted papers, ids of updated papers whose title or abstract changed)
+    """
+    incoming: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        values = {k: v for k, v in row.items() if k in papers_t.c and k not in ("id", "pdf_local_path")}
+        values.setdefault("base_id", split_arxiv_id(values["arxiv_id"])[0])
+        values.setdefault("content_hash", content_hash(values["title"], values["abstract"]))
+        current = incoming.get(values["base_id"])
+        if current is None or recency(values) >= recency(current):
+            incoming[values["base_id"]] = values
+    if not incoming:
+        return [], []
+
+    # Newest stored version per base id (arxiv_id catches rows not yet given a base_id)
+    stored = {}
+    for row in conn.execute(
+        select(papers_t)
+        .where(or_(papers_t.c.base_id.in_(list(incoming)),
+                   papers_t.c.arxiv_id.in_([values["arxiv_id"] for values in incoming.values()])))
+        .order_by(papers_t.c.id)
+    ).mappings():
+        base_id = row["base_id"] or split_arxiv_id(row["arxiv_id"])[0]
+        if base_id not in stored or recency(row) >= recency(stored[base_id]):
+            stored[base_id] = row
+
+    inserts, updates, changed = [], [], []
+    for base_id, values in incoming.items():
+        local = stored.get(base_id)
+        if local is None:
+            inserts.append(values | {"pdf_local_path": None})
+            continue
+        if recency(values) < recency(local):
+            continue
+        new = {field: values[field] for field in UPDATED_FIELDS if field in values}
+        # The local PDF is of the stored version; another version is fetched again
+        new["pdf_local_path"] = local["pdf_local_path"] if values["arxiv_id"] == local["arxiv_id"] else None
+        if all(local[field] == value for field, value in new.items()):
+            continue
+        updates.append(new | {"paper_id": local["id"]})
+        if new["content_hash"] != (local["content_hash"] or content_hash(local["title"], local["abstract"])):
+            changed.append(local["id"])
+
+    added = []
+    if inserts:
+        conn.execute(insert(papers_t).on_conflict_do_nothing(index_elements=["arxiv_id"]), inserts)
+        added = list(conn.execute(
+            select(papers_t.c.id).where(papers_t.c.arxiv_id.in_([values["arxiv_id"] for values in inserts]))
+        ).scalars())
+    if updates:
+        conn.execute(update(papers_t).where(papers_t.c.id == bindparam("paper_id")), updates)
+    return added, changed
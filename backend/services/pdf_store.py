@@ -0,0 +1,261 @@
+"""
+Content-addressed PDF store.
+
+Each distinct PDF is stored once under its SHA-256, sharded two levels deep
+(ab/cd/abcd....pdf) so no directory grows past a few hundred entries.
+pdf_blobs indexes every stored file with its size and last access, and
+Paper.pdf_local_path points at the blob, so identical files (e.g. two
+versions of a paper with the same PDF) share one copy.
+
+With a quota set, the least recently used blobs are evicted until the store
+fits. Blobs used by a bookmarked paper are never evicted. Eviction clears
+pdf_local_path of the papers that used the blob in the same transaction
+that drops its index row, and the file is only unlinked after that commit,
+so no paper ever points at a missing file.
+"""
+import os
+import uuid
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import exists, func, select, update, delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import sessionmaker
+
+from backend import metrics
+from backend.models import Bookmark, Paper, PdfBlob
+
+logger = logging.getLogger(__name__)
+
+blobs_t = PdfBlob.__table__
+
+pdf_store_bytes = metrics.REGISTRY.gauge("pdf_store_bytes", "Bytes of PDF held in the local store")
+pdf_store_evictions = metrics.REGISTRY.counter("pdf_store_evictions_total", "PDFs evicted to stay within the quota")
+pdf_store_dedup_hits = metrics.REGISTRY.counter(
+    "pdf_store_dedup_hits_total", "Downloaded PDFs that were already stored")
+
+# Reads within this interval of the last recorded one do not write the access time again
+_TOUCH_INTERVAL = timedelta(hours=1)
+
+_EVICTION_BATCH = 100
+
+
+class StoredPdf(NamedTuple):
+    path: Path
+    sha256: str
+    size: int
+    deduplicated: bool  # True if an identical file was already stored
+
+
+class PdfStore:
+    def __init__(self, root: Path, session_factory: sessionmaker, quota_bytes: int = 0):
+        """
+        Args:
+            root: Store directory (blobs live in two levels of hash-prefix subdirectories)
+            session_factory: Creates database sessions for the pdf_blobs index
+            quota_bytes: Evict least recently used PDFs above this size (0 = unlimited)
+        """
+        self.root = Path(root)
+        self.session_factory = session_factory
+        self.quota_bytes = quota_bytes
+        self.staging = self.root / ".staging"
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / f"{sha256}.pdf"
+
+    def save(self, chunks: Iterable[bytes]) -> StoredPdf:
+        """
+        Stream a PDF into the store, hashing it as it is written.
+
+        The file is staged under the store root and renamed into place, so a
+        failed download never leaves a partial blob. If an identical file is
+        already stored the staged copy is discarded.
+
+        Args:
+            chunks: File content
+
+        Returns:
+            Where the PDF is stored
+        """
+        self.staging.mkdir(parents=True, exist_ok=True)
+        staged = self.staging / f"{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(staged, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            return self._adopt(staged, digest.hexdigest(), size)
+        finally:
+            staged.unlink(missing_ok=True)
+
+    def add_file(self, path: Path, move: bool = True) -> StoredPdf:
+        """
+        Store an existing file (e.g. a PDF from the old flat layout).
+
+        Args:
+            path: File to store
+            move: Remove the original once it is stored
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        if not move:
+            self.staging.mkdir(parents=True, exist_ok=True)
+            staged = self.staging / f"{uuid.uuid4().hex}.part"
+            with open(path, "rb") as src, open(staged, "wb") as dst:
+                for chunk in iter(lambda: src.read(1 << 20), b""):
+                    dst.write(chunk)
+            path = staged
+        try:
+            return self._adopt(path, digest.hexdigest(), os.path.getsize(path))
+        finally:
+            Path(path).unlink(missing_ok=True)
+
+    def _adopt(self, source: Path, sha256: str, size: int) -> StoredPdf:
+        """Move source into its blob path (unless already stored) and index it"""
+        target = self.blob_path(sha256)
+        deduplicated = target.exists()
+        if deduplicated:
+            pdf_store_dedup_hits.inc()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source, target)
+
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            db.execute(
+                insert(blobs_t)
+                .values(sha256=sha256, path=str(target), size=size, created_at=now, last_accessed_at=now)
+                .on_conflict_do_update(index_elements=["sha256"], set_={"last_accessed_at": now})
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        return StoredPdf(target, sha256, size, deduplicated)
+
+    def touch(self, path: str):
+        """Record a read of the blob at path, at most once per hour"""
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(blobs_t)
+                .where(blobs_t.c.path == path, blobs_t.c.last_accessed_at < now - _TOUCH_INTERVAL)
+                .values(last_accessed_at=now)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def usage(self, db) -> int:
+        """Bytes held by indexed blobs"""
+        return db.query(func.coalesce(func.sum(blobs_t.c.size), 0)).scalar()
+
+    def enforce_quota(self) -> int:
+        """
+        Evict least recently used blobs not used by a bookmarked paper until the store fits the quota.
+
+        Returns:
+            Number of blobs evicted
+        """
+        if self.quota_bytes <= 0:
+            return 0
+
+        evicted = 0
+        db = self.session_factory()
+        try:
+            used = self.usage(db)
+            pdf_store_bytes.set(used)
+            bookmarked = exists().where(
+                Paper.pdf_local_path == blobs_t.c.path,
+                Bookmark.paper_id == Paper.id
+            )
+            while used > self.quota_bytes:
+                candidates = db.execute(
+                    select(blobs_t.c.sha256, blobs_t.c.path, blobs_t.c.size)
+                    .where(~bookmarked)
+                    .order_by(blobs_t.c.last_accessed_at)
+                    .limit(_EVICTION_BATCH)
+                ).all()
+                if not candidates:
+                    logger.warning(
+                        f"PDF store is {used / 1e6:.0f} MB, over its {self.quota_bytes / 1e6:.0f} MB quota, "
+                        f"but every remaining PDF belongs to a bookmarked paper")
+                    break
+
+                for sha256, path, size in candidates:
+                    if used <= self.quota_bytes:
+                        break
+                    db.execute(update(Paper.__table__)
+                               .where(Paper.pdf_local_path == path)
+                               .values(pdf_local_path=None))
+                    db.execute(delete(blobs_t).where(blobs_t.c.sha256 == sha256))
+                    db.commit()
+                    Path(path).unlink(missing_ok=True)
+                    used -= size
+                    evicted += 1
+                    pdf_store_evictions.inc()
+                    logger.debug(f"Evicted PDF {sha256[:12]} ({size / 1e6:.1f} MB)")
+
+            pdf_store_bytes.set(used)
+        finally:
+            db.close()
+
+        if evicted:
+            logger.info(f"Evicted {evicted} PDFs; store is now {used / 1e6:.0f} MB")
+        return evicted
+
+    def verify(self) -> Dict[str, Any]:
+        """
+        Reconcile the index, the papers and the files on disk.
+
+        Index rows whose file is gone are dropped (clearing the papers that
+        used them), paper paths that are not indexed blobs are cleared, and
+        blob files missing from the index are indexed.
+
+        Returns:
+            Counts of missing_files, cleared_papers and indexed_files
+        """
+        report = {"missing_files": 0, "cleared_papers": 0, "indexed_files": 0}
+        db = self.session_factory()
+        try:
+            for sha256, path in db.execute(select(blobs_t.c.sha256, blobs_t.c.path)).all():
+                if not Path(path).exists():
+                    db.execute(update(Paper.__table__).where(Paper.pdf_local_path == path)
+                               .values(pdf_local_path=None))
+                    db.execute(delete(blobs_t).where(blobs_t.c.sha256 == sha256))
+                    report["missing_files"] += 1
+
+            result = db.execute(
+                update(Paper.__table__)
+                .where(Paper.pdf_local_path.isnot(None),
+                       ~exists().where(blobs_t.c.path == Paper.pdf_local_path))
+                .values(pdf_local_path=None)
+            )
+            report["cleared_papers"] = result.rowcount
+            db.commit()
+
+            indexed = {path for (path,) in db.execute(select(blobs_t.c.path))}
+            now = datetime.utcnow()
+            for path in self.root.glob("??/??/*.pdf"):
+                if str(path) not in indexed:
+                    db.execute(
+                        insert(blobs_t)
+                        .values(sha256=path.stem, path=str(path), size=path.stat().st_size,
+                                created_at=now, last_accessed_at=now)
+                        .on_conflict_do_nothing(index_elements=["sha256"])
+                    )
+                    report["indexed_files"] += 1
+            db.commit()
+        finally:
+            db.close()
+        return report
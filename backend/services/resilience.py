@@ -0,0 +1,221 @@
+"""
+Client-side protection for upstream APIs: adaptive concurrency, a circuit
+breaker and Retry-After parsing.
+
+Both classes are asyncio-only and share one instance per upstream service
+per process. Their state is exported as metrics labelled with the service name.
+"""
+import re
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from backend import metrics
+
+logger = logging.getLogger(__name__)
+
+concurrency_limit = metrics.REGISTRY.gauge(
+    "upstream_concurrency_limit", "Current adaptive concurrency limit", labels=("service",))
+in_flight = metrics.REGISTRY.gauge(
+    "upstream_in_flight", "Upstream calls currently in flight", labels=("service",))
+circuit_state = metrics.REGISTRY.gauge(
+    "upstream_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", labels=("service",))
+circuit_transitions = metrics.REGISTRY.counter(
+    "upstream_circuit_transitions_total", "Circuit breaker state changes", labels=("service", "state"))
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After or rate-limit reset header.
+
+    Accepts delta-seconds ("30"), HTTP dates and Go-style durations ("1m30s",
+    "250ms") as sent in x-ratelimit-reset-* headers.
+
+    Returns:
+        Non-negative seconds, or None if the header is missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _UNIT_SECONDS[u] for n, u in parts)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        service: str,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        latency_target: float = 30.0,
+        decrease_factor: float = 0.5
+    ):
+        """
+        AIMD concurrency limit for calls to one upstream service.
+
+        Each success under the latency target adds 1/limit (about +1 per round
+        trip of the whole window). A throttled call or one slower than the
+        target multiplies the limit by decrease_factor, at most once per
+        latency_target so that one burst of 429s does not collapse it to the
+        minimum.
+
+        Args:
+            service: Name used in logs and metric labels
+            initial: Starting limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            latency_target: Calls slower than this count as congestion (seconds)
+            decrease_factor: Multiplier applied on congestion
+        """
+        self.service = service
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        concurrency_limit.set(self._limit, service=service)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        in_flight.set(self._in_flight, service=self.service)
+
+    async def release(self, latency: Optional[float] = None, throttled: bool = False):
+        """
+        Return a slot and adjust the limit.
+
+        Args:
+            latency: Duration of a completed call; None if it did not complete
+            throttled: The upstream answered 429 / asked us to slow down
+        """
+        if throttled or (latency is not None and latency > self.latency_target):
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target:
+                self._last_decrease = now
+                previous = self.limit
+                self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                if self.limit != previous:
+                    logger.warning(f"{self.service}: concurrency limit {previous} -> {self.limit} "
+                                   f"({'throttled' if throttled else f'latency {latency:.1f}s'})")
+        elif latency is not None:
+            previous = self.limit
+            self._limit = min(self.max_limit, self._limit + 1 / max(self._limit, 1))
+            if self.limit != previous:
+                logger.info(f"{self.service}: concurrency limit {previous} -> {self.limit}")
+
+        concurrency_limit.set(self._limit, service=self.service)
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+        in_flight.set(self._in_flight, service=self.service)
+
+
+class CircuitOpenError(Exception):
+    """The upstream is considered down; retry after `retry_after` seconds"""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"{service} circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, service: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Stop calling an upstream after consecutive failures.
+
+        After failure_threshold consecutive failures the circuit opens and
+        calls fail fast with CircuitOpenError. After reset_timeout one probe
+        call is let through (half-open). Success closes the circuit, and
+        failure opens it again.
+
+        Args:
+            service: Name used in logs and metric labels
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before probing
+        """
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        circuit_state.set(0, service=service)
+
+    def _transition(self, state: str, reason: str = ""):
+        if state == self.state:
+            return
+        log = logger.warning if state == self.OPEN else logger.info
+        log(f"{self.service}: circuit {self.state} -> {state}" + (f" ({reason})" if reason else ""))
+        self.state = state
+        circuit_state.set(self._STATE_VALUES[state], service=self.service)
+        circuit_transitions.inc(service=self.service, state=state)
+
+    def before_call(self):
+        """
+        Raises:
+            CircuitOpenError: If the circuit is open (or half-open with a probe in flight)
+        """
+        if self.state == self.OPEN:
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.service, remaining)
+            self._transition(self.HALF_OPEN, "probing")
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.service, self.reset_timeout)
+            self._probe_in_flight = True
+
+    def record_success(self):
+        self.failures = 0
+        self._probe_in_flight = False
+        self._transition(self.CLOSED)
+
+    def record_failure(self, reason: str = ""):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._transition(self.OPEN, f"{self.failures} consecutive failures, last: {reason}")
+
+    def record_neutral(self):
+        """A call that says nothing about health (e.g. 4xx); frees a half-open probe slot"""
+        self._probe_in_flight = False
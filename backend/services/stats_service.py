@@ -0,0 +1,106 @@
+"""
+Timeline statistics served from the paper_stats aggregate table.
+
+paper_stats holds one row per (category, publication day), kept current by
+triggers, so a timeline reads at most (days in range x categories) rows no
+matter how many papers are stored. Weeks and months are summed from the daily
+rows at query time.
+"""
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.models import paper_stats
+
+ALL_CATEGORIES = "*"  # paper_stats key counting every paper once
+
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the bucket holding day (weeks start on Monday)"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, bucket: str) -> date:
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+class StatsService:
+    def timeline(
+        self,
+        db: Session,
+        bucket: str = "day",
+        categories: Optional[List[str]] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Papers and analyzed papers per time bucket, one series per category.
+
+        Args:
+            db: Database session
+            bucket: "day", "week" or "month"
+            categories: Categories to report; all papers ("*") if omitted
+            since: First publication day included (default: 90 days before until)
+            until: Last publication day included (default: today)
+
+        Returns:
+            Dict with bucket, since, until and series ({category, points}); every
+            bucket in the range has a point, zero-filled when nothing was published
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket!r}")
+        categories = list(dict.fromkeys(categories or [ALL_CATEGORIES]))
+        until = until or date.today()
+        since = since or until - timedelta(days=90)
+
+        if bucket == "week":
+            start = func.date(paper_stats.c.day, "weekday 0", "-6 days")
+        elif bucket == "month":
+            start = func.strftime("%Y-%m-01", paper_stats.c.day)
+        else:
+            start = paper_stats.c.day
+        start = start.label("start")
+
+        rows = db.execute(
+            select(
+                paper_stats.c.category,
+                start,
+                func.sum(paper_stats.c.papers),
+                func.sum(paper_stats.c.analyzed)
+            )
+            .where(
+                paper_stats.c.category.in_(categories),
+                paper_stats.c.day >= since.isoformat(),
+                paper_stats.c.day <= until.isoformat()
+            )
+            .group_by(paper_stats.c.category, start)
+        )
+        counts = {(category, start): (papers, analyzed) for category, start, papers, analyzed in rows}
+
+        starts = []
+        current = bucket_start(since, bucket)
+        while current <= until:
+            starts.append(current)
+            current = _next_bucket(current, bucket)
+
+        series = []
+        for category in categories:
+            points = []
+            for current in starts:
+                papers, analyzed = counts.get((category, current.isoformat()), (0, 0))
+                points.append({"start": current, "papers": papers, "analyzed": analyzed})
+            series.append({"category": category, "points": points})
+
+        return {"bucket": bucket, "since": since, "until": until, "series": series}
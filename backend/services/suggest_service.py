@@ -0,0 +1,261 @@
+"""
+Search-as-you-type suggestions.
+
+Term completions come from papers_fts_vocab (an fts5vocab view over the FTS
+index). fts5vocab counts documents by walking each term's posting list, so a
+short prefix of a common word is too slow to answer per keystroke; the
+vocabulary is instead snapshotted into memory by a background thread and
+searched with bisect. Until the first snapshot exists the view is queried
+directly.
+
+Title matches use the FTS index with a prefix query, newest first so FTS5 can
+stop at the limit. SQL runs under a shared time budget enforced with SQLite's
+progress handler; a query that runs out of time is interrupted and the
+response is marked partial.
+"""
+import re
+import time
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend import metrics
+
+logger = logging.getLogger(__name__)
+
+suggest_partial = metrics.REGISTRY.counter(
+    "search_suggest_partial_total", "Suggestion requests cut short by the latency budget")
+
+# Same token rule as FTS5's unicode61 tokenizer for the text users type
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Progress handler granularity in SQLite VM instructions
+_PROGRESS_STEPS = 1000
+
+# After a database change the vocabulary snapshot is rebuilt once it is this old,
+# so a long ingest does not keep the refresh thread busy
+_STALE_VOCABULARY_MIN_AGE = 30.0
+
+
+class SuggestService:
+    def __init__(
+        self,
+        budget_ms: float = 50.0,
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+        vocabulary_ttl: float = 300.0
+    ):
+        """
+        Initialize suggestion service.
+
+        Args:
+            budget_ms: Time allowed for the SQL behind one suggestion request
+            cache_size: Prefixes kept in the in-memory cache
+            cache_ttl: Seconds a cached answer is served before it is recomputed
+            vocabulary_ttl: Seconds before the vocabulary snapshot is rebuilt in the background
+        """
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.vocabulary_ttl = vocabulary_ttl
+        self._cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Requests run on threadpool threads; held for every cache access, never around the SQL
+        self._cache_lock = threading.Lock()
+        self._vocab_missing = False
+        # (built_at, sorted terms, document counts) - replaced whole, so readers need no lock
+        self._vocabulary: Optional[Tuple[float, List[str], List[int]]] = None
+        self._vocabulary_stale = False
+        self._refresh_lock = threading.Lock()
+
+    @staticmethod
+    def parse_query(query: str) -> Tuple[List[str], Optional[str]]:
+        """
+        Split typed text into complete tokens and the prefix being typed.
+
+        Returns:
+            (complete tokens, prefix) - prefix is None when the text ends in a separator
+        """
+        tokens = _TOKEN.findall(query.lower())
+        if tokens and query and not query[-1].isspace() and _TOKEN.match(query[-1]):
+            return tokens[:-1], tokens[-1]
+        return tokens, None
+
+    def suggest(self, db: Session, query: str, limit: int = 5) -> Dict[str, Any]:
+        """
+        Term completions and title matches for a partially typed query.
+
+        Args:
+            db: Database session
+            query: Text typed so far
+            limit: Maximum terms and maximum papers returned
+
+        Returns:
+            Dict with query, terms ({term, completion, papers}), papers ({id, arxiv_id, title}) and partial
+        """
+        tokens, prefix = self.parse_query(query)
+        key = (tuple(tokens), prefix, limit)
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                self._cache.move_to_end(key)
+                return {**cached[1], "query": query}
+
+        result = {"query": query, "terms": [], "papers": [], "partial": False}
+        if not tokens and not prefix:
+            return result
+
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        with self._time_budget(db, deadline):
+            if prefix:
+                terms = self._run(db, self._complete_term, prefix, limit)
+                if terms is None:
+                    result["partial"] = True
+                else:
+                    context = " ".join(tokens)
+                    result["terms"] = [
+                        {"term": term, "completion": f"{context} {term}".strip(), "papers": papers}
+                        for term, papers in terms
+                    ]
+            papers = self._run(db, self._match_titles, tokens, prefix, limit)
+            if papers is None:
+                result["partial"] = True
+            else:
+                result["papers"] = papers
+
+        if result["partial"]:
+            suggest_partial.inc()
+            logger.debug(f"Suggestions for {query!r} cut short after {self.budget_ms:.0f}ms")
+        else:
+            self._store(key, result)
+        return result
+
+    def invalidate(self):
+        """Forget cached answers after a database change (the vocabulary is refreshed in the background)"""
+        with self._cache_lock:
+            self._cache.clear()
+        self._vocabulary_stale = True
+        self._vocab_missing = False
+
+    @contextmanager
+    def _time_budget(self, db: Session, deadline: float):
+        """Interrupt any statement on this session's connection once deadline passes"""
+        dbapi_connection = db.connection().connection.dbapi_connection
+        dbapi_connection.set_progress_handler(lambda: int(time.perf_counter() > deadline), _PROGRESS_STEPS)
+        try:
+            yield
+        finally:
+            dbapi_connection.set_progress_handler(None, 0)
+
+    @staticmethod
+    def _run(db: Session, query, *args):
+        """Run one suggestion query; None if the budget interrupted it"""
+        try:
+            return query(db, *args)
+        except OperationalError as e:
+            if "interrupted" not in str(e.orig):
+                raise
+            return None
+
+    def refresh_vocabulary(self):
+        """Snapshot papers_fts_vocab into memory (runs in a background thread)"""
+        from backend.database import SessionLocal
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            rows = db.execute(text("SELECT term, doc FROM papers_fts_vocab ORDER BY term")).all()
+        except OperationalError as e:
+            logger.warning(f"Could not read papers_fts_vocab: {e.orig}")
+            return
+        finally:
+            db.close()
+
+        self._vocabulary_stale = False
+        self._vocabulary = (time.monotonic(), [row.term for row in rows], [row.doc for row in rows])
+        logger.info(f"Suggestion vocabulary refreshed: {len(rows)} terms in {time.perf_counter() - started:.2f}s")
+
+    def _maybe_refresh_vocabulary(self):
+        """Start a background refresh when there is no snapshot or it has expired"""
+        if self._vocab_missing:
+            return
+        if self._vocabulary:
+            age = time.monotonic() - self._vocabulary[0]
+            max_age = min(self.vocabulary_ttl, _STALE_VOCABULARY_MIN_AGE) if self._vocabulary_stale else self.vocabulary_ttl
+            if age < max_age:
+                return
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # a refresh is already running
+
+        def run():
+            try:
+                self.refresh_vocabulary()
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=run, name="suggest-vocabulary", daemon=True).start()
+
+    def _complete_term(self, db: Session, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """Index terms starting with prefix, most documents first"""
+        if self._vocab_missing:
+            return []
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+        self._maybe_refresh_vocabulary()
+        vocabulary = self._vocabulary
+        if vocabulary:
+            _, terms, docs = vocabulary
+            matches = range(bisect_left(terms, prefix), bisect_left(terms, upper))
+            return [(terms[i], docs[i]) for i in heapq.nlargest(limit, matches, key=docs.__getitem__)]
+
+        try:
+            rows = db.execute(
+                text("""
+                    SELECT term, doc FROM papers_fts_vocab
+                    WHERE term >= :prefix AND term < :upper
+                    ORDER BY doc DESC
+                    LIMIT :limit
+                """),
+                {"prefix": prefix, "upper": upper, "limit": limit}
+            )
+        except OperationalError as e:
+            if "no such table" not in str(e.orig):
+                raise
+            logger.warning("papers_fts_vocab is missing; run scripts/init_db.py to enable term suggestions")
+            self._vocab_missing = True
+            return []
+        return [(row.term, row.doc) for row in rows]
+
+    @staticmethod
+    def _match_titles(db: Session, tokens: List[str], prefix: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Most recently added papers whose title holds every token (the last one as a prefix)"""
+        phrases = [f'"{token}"' for token in tokens]
+        if prefix:
+            phrases.append(f'"{prefix}"*')
+        rows = db.execute(
+            text("""
+                SELECT papers.id, papers.arxiv_id, papers.title
+                FROM papers_fts
+                JOIN papers ON papers.id = papers_fts.rowid
+                WHERE papers_fts MATCH :match
+                ORDER BY papers_fts.rowid DESC
+                LIMIT :limit
+            """),
+            {"match": "{title} : (" + " ".join(phrases) + ")", "limit": limit}
+        )
+        return [{"id": row.id, "arxiv_id": row.arxiv_id, "title": row.title} for row in rows]
+
+    def _store(self, key: Tuple, result: Dict[str, Any]):
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
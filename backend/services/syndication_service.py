@@ -0,0 +1,279 @@
+"""
+Atom and JSON Feed documents of the newest papers with their Grok key points.
+
+Each (format, filter) document is cached as bytes together with its entries
+rendered one by one and a watermark: the newest paper id and the latest
+analysis time it includes. A request is answered from the cache without
+touching the database while the ChangeWatcher reports no writes since the
+document was built. After a write, one cheap query reads the watermark; if
+nothing relevant changed the document is kept, otherwise only papers added
+since the watermark (and entries whose analysis arrived since) are rendered
+and spliced into the cached entry list. Documents are rebuilt from scratch
+after rebuild_seconds to pick up edits and deletions.
+"""
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy import desc, func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, joinedload
+
+from backend import metrics
+from backend.models import Paper, GrokAnalysis, paper_categories
+
+logger = logging.getLogger(__name__)
+
+syndication_builds = metrics.REGISTRY.counter(
+    "syndication_builds_total",
+    "Feed document requests by how they were answered (cached, unchanged, incremental, rebuilt)",
+    labels=("outcome",))
+
+FORMATS = {
+    "atom": "application/atom+xml; charset=utf-8",
+    "json": "application/feed+json; charset=utf-8",
+}
+
+FEED_TITLE = "Gothic arXiv GenAI×Cybersecurity Feed"
+
+
+@dataclass
+class FeedDocument:
+    body: bytes
+    etag: str
+    last_modified: datetime
+    media_type: str
+    # Newest first: (paper id, entry updated time, rendered entry)
+    entries: List[Tuple[int, datetime, bytes]] = field(default_factory=list)
+    watermark: Tuple[int, Optional[datetime]] = (0, None)
+    generation: int = -1
+    built_at: float = 0.0
+
+
+def _abs_url(arxiv_id: str) -> str:
+    return f"https://arxiv.org/abs/{arxiv_id}"
+
+
+def _rfc3339(value: datetime) -> str:
+    return value.replace(microsecond=0).isoformat() + "Z"
+
+
+def _key_points_html(paper: Paper) -> str:
+    analysis = paper.grok_analysis
+    if not analysis or not analysis.key_points:
+        return ""
+    items = "".join(f"<li>{escape(point)}</li>" for point in analysis.key_points)
+    return f"<ul>{items}</ul>"
+
+
+def _updated(paper: Paper) -> datetime:
+    analysis = paper.grok_analysis
+    return max(paper.created_at, analysis.analyzed_at) if analysis else paper.created_at
+
+
+def render_atom_entry(paper: Paper) -> bytes:
+    authors = "".join(f"<author><name>{escape(name)}</name></author>" for name in paper.authors)
+    categories = "".join(f"<category term={quoteattr(category)}/>" for category in paper.categories)
+    content = _key_points_html(paper)
+    return (
+        "<entry>"
+        f"<id>{escape(_abs_url(paper.arxiv_id))}</id>"
+        f"<title>{escape(paper.title)}</title>"
+        f"<link rel=\"alternate\" href={quoteattr(_abs_url(paper.arxiv_id))}/>"
+        f"<link rel=\"related\" type=\"application/pdf\" href={quoteattr(paper.pdf_url)}/>"
+        f"<published>{_rfc3339(paper.published_date)}</published>"
+        f"<updated>{_rfc3339(_updated(paper))}</updated>"
+        f"{authors}{categories}"
+        f"<summary>{escape(paper.abstract)}</summary>"
+        + (f"<content type=\"html\">{escape(content)}</content>" if content else "")
+        + "</entry>"
+    ).encode("utf-8")
+
+
+def render_json_item(paper: Paper) -> bytes:
+    analysis = paper.grok_analysis
+    item = {
+        "id": paper.arxiv_id,
+        "url": _abs_url(paper.arxiv_id),
+        "title": paper.title,
+        "summary": paper.abstract,
+        "content_html": _key_points_html(paper) or f"<p>{escape(paper.abstract)}</p>",
+        "date_published": _rfc3339(paper.published_date),
+        "date_modified": _rfc3339(_updated(paper)),
+        "authors": [{"name": name} for name in paper.authors],
+        "tags": paper.categories,
+        "attachments": [{"url": paper.pdf_url, "mime_type": "application/pdf"}],
+        "_arxiv": {"key_points": analysis.key_points if analysis else []},
+    }
+    return json.dumps(item, ensure_ascii=False).encode("utf-8")
+
+
+class SyndicationService:
+    def __init__(self, watcher, entries: int = 50, cache_size: int = 64, rebuild_seconds: float = 3600.0):
+        """
+        Args:
+            watcher: ChangeWatcher whose generation says whether the database changed
+            entries: Papers per feed document
+            cache_size: Feed documents (format x filter x host) kept in memory
+            rebuild_seconds: Age at which a document is rebuilt from scratch
+        """
+        self.watcher = watcher
+        self.entries = entries
+        self.cache_size = cache_size
+        self.rebuild_seconds = rebuild_seconds
+        self._cache: "OrderedDict[tuple, FeedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def document(
+        self,
+        db: Session,
+        fmt: str,
+        base_url: str,
+        q: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> FeedDocument:
+        """
+        The feed document for a format and filter, from the cache when still current.
+
+        Args:
+            db: Database session (not used when the cached document is current)
+            fmt: "atom" or "json"
+            base_url: Application root URL (ending in /)
+            q: Optional full-text query filter
+            category: Optional arXiv category filter
+
+        Raises:
+            ValueError: If q is not a valid full-text query
+        """
+        key = (fmt, base_url, q, category)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                if self.watcher.running and cached.generation == self.watcher.generation:
+                    syndication_builds.inc(outcome="cached")
+                    return cached
+
+            generation = self.watcher.generation
+            watermark = self._watermark(db)
+            expired = cached is None or time.monotonic() - cached.built_at > self.rebuild_seconds
+
+            if not expired and watermark == cached.watermark:
+                cached.generation = generation
+                syndication_builds.inc(outcome="unchanged")
+                return cached
+
+            try:
+                if expired or watermark[0] < cached.watermark[0]:
+                    entries = self._render(fmt, self._papers(db, q, category).limit(self.entries).all())
+                    outcome = "rebuilt"
+                else:
+                    entries = self._update_entries(db, fmt, cached, q, category)
+                    outcome = "incremental"
+            except OperationalError as e:
+                if not q:
+                    raise
+                raise ValueError(f"Invalid search query: {e.orig}")
+
+            document = self._assemble(fmt, entries, base_url, q, category)
+            document.watermark = watermark
+            document.generation = generation
+            document.built_at = cached.built_at if outcome == "incremental" else time.monotonic()
+            self._cache[key] = document
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        syndication_builds.inc(outcome=outcome)
+        return document
+
+    @staticmethod
+    def _watermark(db: Session) -> Tuple[int, Optional[datetime]]:
+        """Newest paper id and latest analysis time in the whole database"""
+        row = db.execute(select(
+            select(func.max(Paper.id)).scalar_subquery(),
+            select(func.max(GrokAnalysis.analyzed_at)).scalar_subquery()
+        )).one()
+        return row[0] or 0, row[1]
+
+    @staticmethod
+    def _papers(db: Session, q: Optional[str], category: Optional[str]):
+        """Newest papers (by ingest order) matching the filters, with their analyses"""
+        query = db.query(Paper).options(joinedload(Paper.grok_analysis))
+        if q:
+            query = query.filter(Paper.id.in_(
+                text("SELECT rowid FROM papers_fts WHERE papers_fts MATCH :q").bindparams(q=q)
+            ))
+        if category:
+            query = query.filter(Paper.id.in_(
+                select(paper_categories.c.paper_id).where(paper_categories.c.category == category)
+            ))
+        return query.order_by(desc(Paper.id))
+
+    @staticmethod
+    def _render(fmt: str, papers: List[Paper]) -> List[Tuple[int, datetime, bytes]]:
+        render = render_atom_entry if fmt == "atom" else render_json_item
+        return [(paper.id, _updated(paper), render(paper)) for paper in papers]
+
+    def _update_entries(self, db: Session, fmt: str, cached: FeedDocument, q, category):
+        """Render papers added since the cached watermark and re-render entries analyzed since"""
+        newest_id, analyzed_at = cached.watermark
+        papers = self._papers(db, q, category)
+        added = self._render(fmt, papers.filter(Paper.id > newest_id).limit(self.entries).all())
+
+        kept = cached.entries[:self.entries - len(added)]
+        reanalyzed = []
+        if kept:
+            query = papers.join(GrokAnalysis).filter(Paper.id.in_([paper_id for paper_id, _, _ in kept]))
+            if analyzed_at is not None:
+                query = query.filter(GrokAnalysis.analyzed_at > analyzed_at)
+            reanalyzed = query.all()
+        rerendered = {entry[0]: entry for entry in self._render(fmt, reanalyzed)}
+
+        return added + [rerendered.get(entry[0], entry) for entry in kept]
+
+    @staticmethod
+    def _assemble(fmt, entries, base_url: str, q, category) -> FeedDocument:
+        """Concatenate rendered entries into a document with its validators"""
+        params = urlencode([(name, value) for name, value in (("q", q), ("category", category)) if value])
+        self_url = f"{base_url}feed.{fmt}" + (f"?{params}" if params else "")
+        title = FEED_TITLE + "".join(
+            f" - {label} {value}" for label, value in (("search", q), ("category", category)) if value
+        )
+        # The newest entry update dates the document, so it is stable across incremental renders
+        updated = max((stamp for _, stamp, _ in entries), default=None)
+        if fmt == "atom":
+            updated_text = _rfc3339(updated or datetime.utcnow())
+            body = (
+                "<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+                "<feed xmlns=\"http://www.w3.org/2005/Atom\">"
+                f"<id>{escape(self_url)}</id>"
+                f"<title>{escape(title)}</title>"
+                f"<link rel=\"self\" href={quoteattr(self_url)}/>"
+                f"<link rel=\"alternate\" href={quoteattr(base_url)}/>"
+                f"<updated>{updated_text}</updated>"
+            ).encode("utf-8") + b"".join(entry for _, _, entry in entries) + b"</feed>"
+        else:
+            head = json.dumps({
+                "version": "https://jsonfeed.org/version/1.1",
+                "title": title,
+                "home_page_url": base_url,
+                "feed_url": self_url,
+            }, ensure_ascii=False).encode("utf-8")
+            body = head[:-1] + b", \"items\": [" + b", ".join(entry for _, _, entry in entries) + b"]}"
+
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        return FeedDocument(
+            body=body,
+            etag=etag,
+            last_modified=(updated or datetime.utcnow()).replace(microsecond=0),
+            media_type=FORMATS[fmt],
+            entries=entries
+        )
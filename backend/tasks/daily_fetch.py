@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
 Daily task to fetch new papers from arXiv and analyze with Grok.
-This script should be run by Task Scheduler or cron.
+This script should be run by Task Scheduler or cron, unless the server's
+built-in scheduler is enabled (SCHEDULER_ENABLED). Both take the same DB
+lock, so runs never overlap.
 """
 import sys
 import asyncio
@@ -13,23 +15,14 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.database import SessionLocal
-from backend.services.arxiv_service import ArxivService
-from backend.services.grok_service import GrokService
-from backend.services.paper_service import PaperService
+from backend.dependencies import get_paper_service
+from backend.tasks.worker import create_worker
+from backend.tasks.scheduler import run_fetch
 from backend.config import settings
+from backend.logging_setup import configure_logging
 
-# Configure logging
-log_dir = Path("logs")
-log_dir.mkdir(exist_ok=True)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_dir / 'daily_fetch.log'),
-        logging.StreamHandler()
-    ]
-)
+# Log to logs/daily_fetch.log from a background thread
+configure_logging("daily_fetch.log")
 
 logger = logging.getLogger(__name__)
 
@@ -44,20 +37,33 @@ async def main():
 
     try:
         # Initialize services
-        arxiv_service = ArxivService()
-        grok_service = GrokService(api_key=settings.GROK_API_KEY)
-        paper_service = PaperService(arxiv_service, grok_service)
+        paper_service = get_paper_service()
 
-        # Fetch new papers
-        papers_added, papers_skipped = await paper_service.fetch_new_papers(
-            db=db,
-            days_back=settings.ARXIV_DAYS_BACK
+        # Fetch new papers under the shared fetch lock (skips if the server is fetching)
+        run = await run_fetch(
+            paper_service,
+            SessionLocal,
+            trigger="task-scheduler",
+            days_back=settings.ARXIV_DAYS_BACK,
+            lock_ttl=settings.FETCH_LOCK_TTL_SECONDS
         )
+        if run["status"] == "skipped":
+            logger.info("Another fetch is already running; nothing to do")
+            return
+        if run["status"] == "failed":
+            raise RuntimeError(run["error"])
+
+        # Run the queued analysis jobs before exiting
+        worker = create_worker(paper_service)
+        await worker.drain()
+        stats = paper_service.job_queue.stats(db)
 
         logger.info("=" * 80)
         logger.info(f"Daily fetch completed successfully")
-        logger.info(f"Papers added: {papers_added}")
-        logger.info(f"Papers skipped: {papers_skipped}")
+        logger.info(f"Papers added: {run['papers_added']}")
+        logger.info(f"Papers updated: {run['papers_updated']}")
+        logger.info(f"Papers skipped: {run['papers_skipped']}")
+        logger.info(f"Jobs still queued (retrying later): {stats['queued']}, dead: {stats['dead']}")
         logger.info("=" * 80)
 
     except Exception as e:
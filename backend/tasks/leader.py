@@ -0,0 +1,82 @@
+"""
+Leader election between server workers.
+
+With several uvicorn workers only one may run the job worker pool and the
+fetch scheduler. Every worker competes for the "leader" DB lock; the holder
+starts the background tasks and renews its lease, the others retry at the
+same cadence. A leader that dies loses the lock when its lease expires and a
+follower takes over.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.models import Lock
+from backend.services.locks import DbLock
+
+logger = logging.getLogger(__name__)
+
+LEADER_LOCK = "leader"
+
+
+class LeaderElection:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        on_elected: Callable[[], Awaitable[None]],
+        on_deposed: Callable[[], Awaitable[None]],
+        ttl_seconds: int = 30
+    ):
+        """
+        Args:
+            session_factory: Creates database sessions
+            on_elected: Starts the leader-only tasks
+            on_deposed: Stops them (on losing the lock or on shutdown)
+            ttl_seconds: Lock lease; renewed and retried every third of it
+        """
+        self.lock = DbLock(session_factory, LEADER_LOCK, ttl_seconds=ttl_seconds)
+        self.on_elected = on_elected
+        self.on_deposed = on_deposed
+        self.is_leader = False
+        self._stopping: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def current_leader(db: Session) -> Optional[str]:
+        """Owner of the leader lock, if any worker holds it"""
+        lock = db.query(Lock).filter(Lock.name == LEADER_LOCK).first()
+        return lock.owner if lock else None
+
+    async def _step(self):
+        if self.is_leader:
+            if not await asyncio.to_thread(self.lock.renew):
+                self.is_leader = False
+                logger.warning(f"Worker {self.lock.owner} lost leadership, stopping background tasks")
+                await self.on_deposed()
+        elif await asyncio.to_thread(self.lock.acquire):
+            self.is_leader = True
+            logger.info(f"Worker {self.lock.owner} elected leader, starting background tasks")
+            await self.on_elected()
+
+    async def run(self):
+        """Campaign for leadership until stop() is called, then step down"""
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            try:
+                await self._step()
+            except Exception as e:
+                logger.error(f"Leader election error: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.lock.ttl_seconds / 3)
+            except asyncio.TimeoutError:
+                pass
+
+        if self.is_leader:
+            self.is_leader = False
+            await self.on_deposed()
+            await asyncio.to_thread(self.lock.release)
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
@@ -0,0 +1,239 @@
+"""
+In-process scheduler for the periodic arXiv fetch.
+
+The fetch holds the "fetch" DB lock while it runs, so runs never overlap
+across processes: the in-server scheduler, a manual trigger and
+daily_fetch.py launched by the OS scheduler all go through run_fetch().
+"""
+import asyncio
+import random
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import TaskRun
+from backend.services.locks import DbLock
+
+logger = logging.getLogger(__name__)
+
+FETCH_LOCK = "fetch"
+
+
+def _run_summary(run: Optional[TaskRun]) -> Optional[Dict[str, Any]]:
+    if run is None:
+        return None
+    return {
+        "id": run.id,
+        "trigger": run.trigger,
+        "owner": run.owner,
+        "status": run.status,
+        "papers_added": run.papers_added,
+        "papers_updated": run.papers_updated,
+        "papers_skipped": run.papers_skipped,
+        "error": run.error,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+    }
+
+
+def _record_run(session_factory: sessionmaker, run_id: Optional[int], **values) -> int:
+    db = session_factory()
+    try:
+        run = db.query(TaskRun).filter(TaskRun.id == run_id).first() if run_id else TaskRun(task="fetch")
+        for key, value in values.items():
+            setattr(run, key, value)
+        db.add(run)
+        db.commit()
+        return run.id
+    finally:
+        db.close()
+
+
+async def run_fetch(
+    paper_service,
+    session_factory: sessionmaker,
+    trigger: str,
+    days_back: int,
+    lock_ttl: int = 600
+) -> Dict[str, Any]:
+    """
+    Run one fetch under the cross-process fetch lock and record it in task_runs.
+
+    Args:
+        paper_service: Service that performs the fetch
+        session_factory: Creates database sessions
+        trigger: What started the run (schedule, manual, task-scheduler)
+        days_back: How many days back to search
+        lock_ttl: Lock lease in seconds; renewed every third of it. If the lease
+            is lost, the fetch stops before its next paper and the run is recorded as failed
+
+    Returns:
+        Summary of the recorded run (status "skipped" if another fetch holds the lock)
+    """
+    lock = DbLock(session_factory, FETCH_LOCK, ttl_seconds=lock_ttl)
+
+    if not await asyncio.to_thread(lock.acquire):
+        logger.info(f"Fetch ({trigger}) skipped: another fetch holds the lock")
+        now = datetime.utcnow()
+        run_id = await asyncio.to_thread(_record_run, session_factory, None, trigger=trigger, owner=lock.owner,
+                                         status="skipped", started_at=now, finished_at=now)
+        return {"id": run_id, "status": "skipped", "trigger": trigger}
+
+    run_id = await asyncio.to_thread(_record_run, session_factory, None, trigger=trigger, owner=lock.owner,
+                                     status="running", started_at=datetime.utcnow())
+
+    lock_lost = False
+
+    async def heartbeat():
+        nonlocal lock_lost
+        interval = lock_ttl / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await asyncio.to_thread(lock.renew)
+            except Exception as e:
+                # e.g. "database is locked": retry well before the lease runs out
+                logger.warning(f"Renewing the fetch lock failed, retrying: {e}")
+                interval = lock_ttl / 30
+                continue
+            if not renewed:
+                # Another process may take the lock and fetch; stop before the next paper
+                logger.error(f"Fetch ({trigger}) lost the fetch lock, stopping")
+                lock_lost = True
+                return
+            interval = lock_ttl / 3
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    result: Dict[str, Any] = {}
+    db = session_factory()
+    try:
+        added, updated, skipped = await paper_service.fetch_new_papers(
+            db=db, days_back=days_back, should_stop=lambda: lock_lost)
+        result = dict(status="success", papers_added=added, papers_updated=updated, papers_skipped=skipped)
+    except Exception as e:
+        logger.error(f"Fetch ({trigger}) failed: {e}", exc_info=True)
+        result = dict(status="failed", error=f"{type(e).__name__}: {e}")
+    finally:
+        db.close()
+        heartbeat_task.cancel()
+        await asyncio.to_thread(lock.release)
+        await asyncio.to_thread(_record_run, session_factory, run_id, finished_at=datetime.utcnow(), **result)
+
+    return {"id": run_id, "trigger": trigger, **result}
+
+
+class FetchScheduler:
+    def __init__(
+        self,
+        paper_service,
+        session_factory: sessionmaker,
+        interval_minutes: int = 1440,
+        jitter_seconds: int = 300,
+        days_back: int = 7,
+        lock_ttl: int = 600
+    ):
+        """
+        Periodic fetch running on the server's event loop with warm services.
+
+        Args:
+            paper_service: Service that performs the fetch
+            session_factory: Creates database sessions
+            interval_minutes: Time between runs
+            jitter_seconds: Random delay added to each run
+            days_back: How many days back to search
+            lock_ttl: Fetch lock lease in seconds
+        """
+        self.paper_service = paper_service
+        self.session_factory = session_factory
+        self.interval = timedelta(minutes=interval_minutes)
+        self.jitter_seconds = jitter_seconds
+        self.days_back = days_back
+        self.lock_ttl = lock_ttl
+        self.enabled = False
+        self.next_run_at: Optional[datetime] = None
+        self._current: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._current is not None and not self._current.done()
+
+    def _last_run(self, db) -> Optional[TaskRun]:
+        return db.query(TaskRun)\
+                 .filter(TaskRun.task == "fetch", TaskRun.status != "skipped")\
+                 .order_by(TaskRun.started_at.desc())\
+                 .first()
+
+    def _schedule_next(self):
+        """Next run: one interval (plus jitter) after the last run in any process"""
+        db = self.session_factory()
+        try:
+            last = self._last_run(db)
+        finally:
+            db.close()
+
+        now = datetime.utcnow()
+        jitter = timedelta(seconds=random.uniform(0, self.jitter_seconds))
+        due = (last.started_at + self.interval) if last else now
+        self.next_run_at = max(due, now) + jitter
+
+    async def run_now(self, trigger: str = "manual") -> Dict[str, Any]:
+        """Run a fetch immediately on this event loop"""
+        return await run_fetch(self.paper_service, self.session_factory, trigger,
+                               self.days_back, self.lock_ttl)
+
+    def trigger(self) -> bool:
+        """
+        Start a manual run in the background.
+
+        Returns:
+            False if a run started by this process is still in progress
+        """
+        if self.running:
+            return False
+        self._current = asyncio.create_task(self.run_now("manual"))
+        return True
+
+    async def run(self):
+        """Scheduling loop; returns after stop()"""
+        self.enabled = True
+        self._stopping = asyncio.Event()
+        logger.info(f"Fetch scheduler started (interval {self.interval}, jitter {self.jitter_seconds}s)")
+
+        while not self._stopping.is_set():
+            await asyncio.to_thread(self._schedule_next)
+            delay = (self.next_run_at - datetime.utcnow()).total_seconds()
+            logger.info(f"Next scheduled fetch at {self.next_run_at:%Y-%m-%d %H:%M:%S} UTC")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=max(delay, 0))
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            if self.running:
+                await asyncio.shield(self._current)
+                continue
+            self._current = asyncio.create_task(self.run_now("schedule"))
+            await asyncio.shield(self._current)
+
+        self.enabled = False
+        logger.info("Fetch scheduler stopped")
+
+    async def stop(self):
+        """Stop scheduling and wait for a run in progress to finish"""
+        if self._stopping is not None:
+            self._stopping.set()
+        if self.running:
+            await self._current
+
+    def status(self, db) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "interval_minutes": self.interval.total_seconds() / 60,
+            "jitter_seconds": self.jitter_seconds,
+            "next_run_at": self.next_run_at if self.enabled else None,
+            "last_run": _run_summary(self._last_run(db)),
+        }
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Job worker pool for queued background work (Grok analysis etc.).
+
+Runs inside the web server when JOB_WORKER_IN_PROCESS is set, or as a
+separate process:
+
+    python -m backend.tasks.worker            # run until interrupted
+    python -m backend.tasks.worker --drain    # process runnable jobs and exit
+"""
+import os
+import socket
+import asyncio
+import logging
+import argparse
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.services.job_queue import JobQueue, PermanentFailure, RetryLater
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Session, dict], Awaitable[None]]
+
+
+def build_handlers(paper_service) -> Dict[str, JobHandler]:
+    """Map job kinds to the service methods that execute them"""
+    from backend.dependencies import get_digest_service, get_fts_maintenance
+    return {
+        "analyze_paper": paper_service.run_analysis_job,
+        "render_digest": get_digest_service().run_render_job,
+        "merge_fts": get_fts_maintenance().run_merge_job,
+    }
+
+
+class JobWorker:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Pool of asyncio tasks that claim and execute jobs.
+
+        Args:
+            session_factory: Creates a database session per job
+            queue: Job queue to claim from
+            handlers: Job kind -> async handler(db, payload)
+            concurrency: Number of jobs executed at once
+            poll_interval: Idle sleep between claim attempts
+            worker_id: Identifies this pool in job leases
+        """
+        self.session_factory = session_factory
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    def _claim(self):
+        db = self.session_factory()
+        try:
+            self.queue.reap_expired(db)
+            job = self.queue.claim(db, list(self.handlers), self.worker_id)
+            if job is not None:
+                db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def _finish(self, job, error: Optional[str], retry_later: Optional[RetryLater] = None,
+                permanent: bool = False):
+        db = self.session_factory()
+        try:
+            if retry_later is not None:
+                self.queue.defer(db, job, retry_later.delay, str(retry_later))
+            elif error is None:
+                self.queue.complete(db, job)
+            else:
+                self.queue.fail(db, job, error, permanent)
+        finally:
+            db.close()
+
+    async def run_one(self) -> bool:
+        """
+        Claim and execute one job.
+
+        Returns:
+            False if no job was runnable
+        """
+        job = await asyncio.to_thread(self._claim)
+        if job is None:
+            return False
+
+        logger.debug(f"Worker {self.worker_id} running job {job.id} ({job.kind}), attempt {job.attempts}")
+        error, retry_later, permanent = None, None, False
+        db = self.session_factory()
+        try:
+            await self.handlers[job.kind](db, job.payload)
+        except RetryLater as e:
+            db.rollback()
+            retry_later = e
+        except PermanentFailure as e:
+            db.rollback()
+            error, permanent = f"{type(e).__name__}: {e}", True
+        except Exception as e:
+            db.rollback()
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            db.close()
+
+        await asyncio.to_thread(self._finish, job, error, retry_later, permanent)
+        return True
+
+    async def _loop(self, exit_when_idle: bool):
+        while not self._stopping.is_set():
+            try:
+                if await self.run_one():
+                    continue
+            except Exception as e:
+                logger.error(f"Worker loop error: {e}", exc_info=True)
+            if exit_when_idle:
+                return
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """Process jobs until stop() is called"""
+        logger.info(f"Job worker {self.worker_id} started with concurrency {self.concurrency}")
+        await asyncio.gather(*(self._loop(exit_when_idle=False) for _ in range(self.concurrency)))
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    async def drain(self):
+        """Process jobs until none is runnable right now, then return"""
+        await asyncio.gather(*(self._loop(exit_when_idle=True) for _ in range(self.concurrency)))
+
+    def stop(self):
+        self._stopping.set()
+
+
+def create_worker(paper_service, concurrency: Optional[int] = None) -> JobWorker:
+    """Build a worker pool wired to the application's database and settings"""
+    from backend.config import settings
+    from backend.database import SessionLocal
+
+    return JobWorker(
+        SessionLocal,
+        paper_service.job_queue,
+        build_handlers(paper_service),
+        concurrency=concurrency or settings.JOB_WORKER_CONCURRENCY
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run the background job worker pool")
+    parser.add_argument("--drain", action="store_true", help="Exit once no job is runnable")
+    parser.add_argument("--concurrency", type=int, help="Jobs executed at once")
+    args = parser.parse_args()
+
+    from backend.dependencies import get_paper_service
+
+    worker = create_worker(get_paper_service(), args.concurrency)
+
+    if args.drain:
+        await worker.drain()
+        return
+
+    try:
+        await worker.run()
+    except asyncio.CancelledError:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
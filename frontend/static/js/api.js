@@ -3,8 +3,44 @@
  */
 
 const API_BASE = '/api';
+const SUGGEST_CACHE_SIZE = 500;
 
 class ApiClient {
+    constructor() {
+        // Cache keys already revalidated in this session; later reads are served from the cache alone
+        this.revalidated = new Set();
+        // Uncached requests in flight, so concurrent readers share one fetch
+        this.inflight = new Map();
+        // Search suggestions by lowercased prefix (insertion order doubles as eviction order)
+        this.suggestions = new Map();
+        // Responses inlined into index.html by the server, used once in place of the first requests
+        this.bootstrap = this.readBootstrap();
+    }
+
+    /**
+     * Responses the server inlined into the page, keyed like cachedRequest keys
+     */
+    readBootstrap() {
+        const bootstrap = new Map();
+        const element = document.getElementById('bootstrap');
+        if (!element) return bootstrap;
+
+        try {
+            const data = JSON.parse(element.textContent);
+            const { limit, offset, bookmarked, response } = data.papers;
+            const params = new URLSearchParams({
+                limit: limit.toString(),
+                offset: offset.toString(),
+                bookmarked: bookmarked.toString()
+            });
+            bootstrap.set(`papers:${params}`, response);
+            if (data.paper) bootstrap.set(`paper:${data.paper.id}`, data.paper);
+        } catch (error) {
+            console.warn('Ignoring unreadable bootstrap data:', error);
+        }
+        return bootstrap;
+    }
+
     /**
      * Generic fetch wrapper with error handling
      */
@@ -35,24 +71,87 @@ class ApiClient {
         }
     }
 
+    /**
+     * Stale-while-revalidate read through the IndexedDB cache.
+     * A cached response is returned immediately and refreshed in the background once per session;
+     * onFresh is called with the new response if it differs from the cached one.
+     */
+    async cachedRequest(key, url, onFresh = null) {
+        if (this.bootstrap.has(key)) {
+            // As fresh as a response from the server, so it also counts as this session's revalidation
+            const data = this.bootstrap.get(key);
+            this.bootstrap.delete(key);
+            this.revalidated.add(key);
+            responseCache.put(key, data).catch(error => console.warn('Caching bootstrap data failed:', error));
+            return data;
+        }
+
+        const entry = await responseCache.get(key);
+        if (entry && this.revalidated.has(key)) {
+            return entry.data;
+        }
+        if (!entry && this.inflight.has(key)) {
+            return await this.inflight.get(key);
+        }
+
+        this.revalidated.add(key);
+        const revalidation = this.request(url).then(async (fresh) => {
+            await responseCache.put(key, fresh);
+            if (entry && onFresh && JSON.stringify(fresh) !== JSON.stringify(entry.data)) {
+                onFresh(fresh);
+            }
+            return fresh;
+        });
+
+        if (entry) {
+            revalidation.catch(error => {
+                this.revalidated.delete(key);
+                console.warn('Background revalidation failed:', error);
+            });
+            return entry.data;
+        }
+        const pending = revalidation
+            .catch(error => {
+                this.revalidated.delete(key);
+                throw error;
+            })
+            .finally(() => this.inflight.delete(key));
+        this.inflight.set(key, pending);
+        return await pending;
+    }
+
     /**
      * Get paginated list of papers
      */
-    async getPapers(limit = 20, offset = 0, bookmarked = false) {
+    async getPapers(limit = 20, offset = 0, bookmarked = false, onFresh = null) {
         const params = new URLSearchParams({
             limit: limit.toString(),
             offset: offset.toString(),
             bookmarked: bookmarked.toString()
         });
 
-        return await this.request(`${API_BASE}/papers?${params}`);
+        return await this.cachedRequest(`papers:${params}`, `${API_BASE}/papers?${params}`, onFresh);
     }
 
     /**
      * Get single paper by ID with Grok analysis
      */
-    async getPaper(paperId) {
-        return await this.request(`${API_BASE}/papers/${paperId}`);
+    async getPaper(paperId, onFresh = null) {
+        return await this.cachedRequest(`paper:${paperId}`, `${API_BASE}/papers/${paperId}`, onFresh);
+    }
+
+    /**
+     * Forget cached responses that a write has made stale.
+     * Cached list pages are kept but revalidated again on their next read.
+     */
+    async invalidate(...keys) {
+        for (const key of keys) {
+            this.revalidated.delete(key);
+            await responseCache.delete(key);
+        }
+        for (const key of [...this.revalidated]) {
+            if (key.startsWith('papers:')) this.revalidated.delete(key);
+        }
     }
 
     /**
@@ -67,10 +166,37 @@ class ApiClient {
         return await this.request(`${API_BASE}/papers/search?${params}`);
     }
 
+    /**
+     * Term completions and title matches for text being typed.
+     * Answers are cached in memory by prefix; pass an AbortSignal to cancel a stale request.
+     */
+    async suggest(query, signal = null, limit = 5) {
+        const key = `${query.toLowerCase()}|${limit}`;
+        if (this.suggestions.has(key)) {
+            return this.suggestions.get(key);
+        }
+
+        const params = new URLSearchParams({ q: query, limit: limit.toString() });
+        const response = await fetch(`${API_BASE}/papers/suggest?${params}`, { signal });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const result = await response.json();
+
+        if (!result.partial) {
+            this.suggestions.set(key, result);
+            if (this.suggestions.size > SUGGEST_CACHE_SIZE) {
+                this.suggestions.delete(this.suggestions.keys().next().value);
+            }
+        }
+        return result;
+    }
+
     /**
      * Add bookmark for a paper
      */
     async addBookmark(paperId, notes = null) {
+        await this.invalidate(`paper:${paperId}`);
         return await this.request(`${API_BASE}/bookmarks/`, {
             method: 'POST',
             body: JSON.stringify({
@@ -84,6 +210,7 @@ class ApiClient {
      * Remove bookmark for a paper
      */
     async removeBookmark(paperId) {
+        await this.invalidate(`paper:${paperId}`);
         return await this.request(`${API_BASE}/bookmarks/${paperId}`, {
             method: 'DELETE'
         });
@@ -95,6 +222,16 @@ class ApiClient {
     async getBookmarks() {
         return await this.request(`${API_BASE}/bookmarks/`);
     }
+
+    /**
+     * Download URL of an export (bibtex, csv or jsonl) of all papers, the bookmarks or a search
+     */
+    exportUrl(format, { bookmarked = false, query = null } = {}) {
+        const params = new URLSearchParams({ format });
+        if (bookmarked) params.set('bookmarked', 'true');
+        if (query) params.set('q', query);
+        return `${API_BASE}/export?${params}`;
+    }
 }
 
 // Export singleton instance
@@ -3,13 +3,20 @@
  * Handles state management, event listeners, and navigation
  */
 
+const SUGGEST_DEBOUNCE_MS = 150;  // Pause in typing before suggestions are requested
+
 class App {
     constructor() {
         // State
-        this.papers = [];
+        this.source = new StaticPapers([]);  // Current paper list (PagedPapers or StaticPapers)
+        this.sources = {};                   // Paged lists kept across mode switches
         this.currentIndex = 0;
         this.isSearchMode = false;
         this.isBookmarkMode = false;
+        this.isListMode = false;
+        this.suggestTimer = null;
+        this.suggestController = null;  // AbortController of the suggestion request in flight
+        this.list = new VirtualList(document.getElementById('listView'), (index) => this.handleListSelect(index));
 
         // Initialize
         this.init();
@@ -18,6 +25,92 @@ class App {
     async init() {
         this.setupEventListeners();
         await this.loadPapers();
+        this.connectEvents();
+    }
+
+    /**
+     * Follow the server's event stream, so papers fetched, analyses finished and bookmarks changed
+     * elsewhere are patched into the loaded lists instead of refetching them
+     */
+    connectEvents() {
+        if (!window.EventSource) return;
+
+        const events = new EventSource(`${API_BASE}/events`);
+        const on = (kind, handler) => events.addEventListener(kind, (e) => handler(JSON.parse(e.data)));
+        on('paper_added', (paper) => this.handlePaperAdded(paper));
+        on('analysis_ready', (data) => this.handleAnalysisReady(data.paper_id));
+        on('bookmark_changed', (data) => this.handleBookmarkChanged(data));
+        on('reset', () => this.handleEventsReset());
+    }
+
+    /**
+     * A fetch stored a new paper: insert it into the list of all papers
+     */
+    async handlePaperAdded(paper) {
+        await api.invalidate();  // Cached list pages are revalidated on their next read
+        const source = this.sources.all;
+        if (!source) return;
+
+        const wasEmpty = !source.total;
+        const index = source.insertPaper(paper);
+        if (source !== this.source) return;
+
+        if (wasEmpty) {
+            await this.showSource(source, 'Failed to load papers');
+        } else {
+            this.handleRowsMoved(index, 1);
+        }
+    }
+
+    /**
+     * Grok analyzed a paper: show its key points if it is on screen
+     */
+    async handleAnalysisReady(paperId) {
+        await api.invalidate(`paper:${paperId}`);
+        if (!this.isListMode && this.source.peek(this.currentIndex)?.id === paperId) {
+            await this.displayCurrentPaper();
+        }
+    }
+
+    /**
+     * A paper was bookmarked or unbookmarked (in this tab or another one)
+     */
+    async handleBookmarkChanged({ paper_id: paperId, bookmarked, paper }) {
+        await api.invalidate(`paper:${paperId}`);
+        for (const source of new Set([this.source, ...Object.values(this.sources)])) {
+            source.updatePaper(paperId, { is_bookmarked: bookmarked });
+        }
+
+        const isCurrent = this.source.peek(this.currentIndex)?.id === paperId;
+        const bookmarks = this.sources.bookmarks;
+        // The paper on screen stays in the bookmark list until the user moves on, so it can be bookmarked again
+        if (bookmarks && !(bookmarks === this.source && isCurrent)) {
+            const index = bookmarked ? bookmarks.insertPaper(paper) : bookmarks.removePaper(paperId);
+            if (bookmarks === this.source && index !== -1) this.handleRowsMoved(index, bookmarked ? 1 : -1);
+        }
+
+        if (isCurrent && !this.isListMode) await this.displayCurrentPaper();
+    }
+
+    /**
+     * Too much happened while disconnected to patch: reload the current list from the server
+     */
+    async handleEventsReset() {
+        await api.invalidate();
+        this.sources = {};
+        if (!this.isSearchMode) await this.loadPapers(this.isBookmarkMode);
+    }
+
+    /**
+     * A paper was inserted into or removed from the current list at index (-1: beyond the loaded pages)
+     */
+    handleRowsMoved(index, delta) {
+        const at = index === -1 ? Infinity : index;
+        if (at < this.currentIndex || (delta > 0 && at === this.currentIndex)) {
+            this.currentIndex += delta;  // Stay on the same paper
+        }
+        if (this.isListMode) this.list.rowsMoved(at, delta);
+        ui.updatePageIndicator(this.currentIndex + 1, this.source.total);
     }
 
     /**
@@ -30,12 +123,34 @@ class App {
             if (e.key === 'Enter') this.handleSearch();
         });
 
+        // Search-as-you-type suggestions
+        const searchInput = document.getElementById('searchInput');
+        searchInput.addEventListener('input', () => this.scheduleSuggest());
+        searchInput.addEventListener('keydown', (e) => {
+            if (e.key === 'Escape') this.cancelSuggest();
+        });
+        searchInput.addEventListener('blur', () => ui.hideSuggestions());
+        document.getElementById('suggestions').addEventListener('mousedown', (e) => {
+            e.preventDefault(); // Keep focus in the search box
+            const item = e.target.closest('.suggestion');
+            if (item) this.handleSuggestionPick(item);
+        });
+
         // Clear search
         document.getElementById('clearSearchBtn').addEventListener('click', () => this.handleClearSearch());
 
         // Bookmarks view
         document.getElementById('bookmarksBtn').addEventListener('click', () => this.handleBookmarksToggle());
 
+        // Overview list
+        document.getElementById('listBtn').addEventListener('click', () => this.handleListToggle());
+
+        // Export
+        document.getElementById('exportSelect').addEventListener('change', (e) => {
+            if (e.target.value) this.handleExport(e.target.value);
+            e.target.value = '';
+        });
+
         // Navigation
         document.getElementById('prevBtn').addEventListener('click', () => this.navigatePrev());
         document.getElementById('nextBtn').addEventListener('click', () => this.navigateNext());
@@ -49,38 +164,78 @@ class App {
 
             switch(e.key) {
                 case 'ArrowLeft':
+                case 'ArrowUp':
+                    if (e.key === 'ArrowUp' && !this.isListMode) break;
+                    e.preventDefault();
                     this.navigatePrev();
                     break;
                 case 'ArrowRight':
+                case 'ArrowDown':
+                    if (e.key === 'ArrowDown' && !this.isListMode) break;
+                    e.preventDefault();
                     this.navigateNext();
                     break;
+                case 'Enter':
+                    if (this.isListMode) this.handleListSelect(this.currentIndex);
+                    break;
             }
         });
     }
 
     /**
-     * Load papers from API
+     * Load papers from API, one page at a time as the user navigates.
+     * Paged lists are kept, so switching back to a mode does not fetch it again.
      */
     async loadPapers(bookmarked = false) {
+        const key = bookmarked ? 'bookmarks' : 'all';
+        if (!this.sources[key]) {
+            this.sources[key] = new PagedPapers(bookmarked);
+        }
+
+        this.isSearchMode = false;
+        this.isBookmarkMode = bookmarked;
+        await this.showSource(this.sources[key], 'Failed to load papers');
+    }
+
+    /**
+     * Make a paper source current and show its first paper (or the overview)
+     */
+    async showSource(source, errorMessage) {
         try {
-            ui.showLoading();
+            if (source.total === null) ui.showLoading();
+            await source.ensure(0);
 
-            const response = await api.getPapers(100, 0, bookmarked); // Load first 100 papers
-            this.papers = response.papers;
+            this.source = source;
+            this.currentIndex = 0;
+            source.onChange = () => this.handleSourceChange(source);
 
-            if (this.papers.length === 0) {
+            if (!source.total) {
                 ui.showNoResults();
                 return;
             }
 
-            this.currentIndex = 0;
-            this.isBookmarkMode = bookmarked;
-            await this.displayCurrentPaper();
+            if (this.isListMode) {
+                this.displayList();
+            } else {
+                await this.displayCurrentPaper();
+            }
 
         } catch (error) {
-            console.error('Failed to load papers:', error);
-            ui.showError('Failed to load papers');
+            console.error(errorMessage, error);
+            ui.showError(errorMessage);
+        }
+    }
+
+    /**
+     * A background revalidation changed loaded papers or the total
+     */
+    handleSourceChange(source) {
+        if (source !== this.source) return;
+
+        if (this.isListMode) {
+            this.list.refresh();
         }
+        ui.updatePageIndicator(this.currentIndex + 1, this.source.total);
     }
 
     /**
@@ -94,20 +249,16 @@ class App {
             return;
         }
 
+        this.cancelSuggest();
+
         try {
             ui.showLoading();
 
-            this.papers = await api.searchPapers(query, 100);
-
-            if (this.papers.length === 0) {
-                ui.showNoResults();
-                return;
-            }
+            const papers = await api.searchPapers(query, 100);
 
-            this.currentIndex = 0;
             this.isSearchMode = true;
             this.isBookmarkMode = false;
-            await this.displayCurrentPaper();
+            await this.showSource(new StaticPapers(papers), 'Search failed');
 
         } catch (error) {
             console.error('Search failed:', error);
@@ -115,13 +266,73 @@ class App {
         }
     }
 
+    /**
+     * Wait for a pause in typing, then request suggestions; each keystroke aborts the previous request
+     */
+    scheduleSuggest() {
+        const query = document.getElementById('searchInput').value;
+        this.cancelSuggest(!query.trim());
+        if (!query.trim()) return;
+
+        this.suggestTimer = setTimeout(() => this.fetchSuggestions(query), SUGGEST_DEBOUNCE_MS);
+    }
+
+    /**
+     * Drop pending suggestions: the debounce timer, the request in flight and (unless still typing) the dropdown
+     */
+    cancelSuggest(hide = true) {
+        clearTimeout(this.suggestTimer);
+        if (this.suggestController) {
+            this.suggestController.abort();
+            this.suggestController = null;
+        }
+        if (hide) ui.hideSuggestions();
+    }
+
+    async fetchSuggestions(query) {
+        const controller = new AbortController();
+        this.suggestController = controller;
+
+        try {
+            const result = await api.suggest(query, controller.signal);
+            if (controller.signal.aborted || document.getElementById('searchInput').value !== query) return;
+            ui.renderSuggestions(result);
+        } catch (error) {
+            if (error.name !== 'AbortError') console.warn('Suggestions failed:', error);
+        }
+    }
+
+    /**
+     * Complete the typed word, or open a suggested paper
+     */
+    async handleSuggestionPick(item) {
+        const searchInput = document.getElementById('searchInput');
+
+        if (item.dataset.completion) {
+            searchInput.value = `${item.dataset.completion} `;
+            this.scheduleSuggest();
+            return;
+        }
+
+        this.cancelSuggest();
+        try {
+            ui.showLoading();
+            const paper = await api.getPaper(Number(item.dataset.paperId));
+            this.isSearchMode = true;
+            this.isBookmarkMode = false;
+            await this.showSource(new StaticPapers([paper]), 'Failed to load paper');
+        } catch (error) {
+            console.error('Failed to open suggestion:', error);
+            ui.showError('Failed to load paper');
+        }
+    }
+
     /**
      * Clear search and reload all papers
      */
     async handleClearSearch() {
+        this.cancelSuggest();
         document.getElementById('searchInput').value = '';
-        this.isSearchMode = false;
-        this.isBookmarkMode = false;
         await this.loadPapers();
     }
 
@@ -134,60 +345,120 @@ class App {
             await this.handleClearSearch();
         } else {
             // Switch to bookmark mode
-            try {
-                ui.showLoading();
-
-                this.papers = await api.getBookmarks();
+            await this.loadPapers(true);
+        }
+    }
 
-                if (this.papers.length === 0) {
-                    ui.showNoResults();
-                    return;
-                }
+    /**
+     * Download the papers of the current mode (all, bookmarks or the search) in the chosen format
+     */
+    handleExport(format) {
+        const query = document.getElementById('searchInput').value.trim();
+        const link = document.createElement('a');
+        link.href = api.exportUrl(format, {
+            bookmarked: this.isBookmarkMode,
+            query: this.isSearchMode && query.length >= 2 ? query : null
+        });
+        link.download = '';  // File name comes from Content-Disposition
+        link.click();
+    }
 
-                this.currentIndex = 0;
-                this.isSearchMode = false;
-                this.isBookmarkMode = true;
-                await this.displayCurrentPaper();
+    /**
+     * Toggle between the single-paper view and the overview list
+     */
+    async handleListToggle() {
+        this.isListMode = !this.isListMode;
+        document.getElementById('listBtn').textContent = this.isListMode ? 'DETAIL' : 'LIST';
 
-            } catch (error) {
-                console.error('Failed to load bookmarks:', error);
-                ui.showError('Failed to load bookmarks');
-            }
+        if (!this.source.total) return;
+        if (this.isListMode) {
+            this.displayList();
+        } else {
+            await this.displayCurrentPaper();
         }
     }
 
+    /**
+     * Open a paper picked in the overview list
+     */
+    async handleListSelect(index) {
+        this.currentIndex = index;
+        this.isListMode = false;
+        document.getElementById('listBtn').textContent = 'LIST';
+        await this.displayCurrentPaper();
+    }
+
+    /**
+     * Show the overview list around the current paper
+     */
+    displayList() {
+        ui.showList();
+        this.list.setSource(this.source, this.currentIndex);
+        ui.updatePageIndicator(this.currentIndex + 1, this.source.total);
+    }
+
     /**
      * Display current paper with full details
      */
     async displayCurrentPaper() {
-        if (this.papers.length === 0) {
+        if (!this.source.total) {
             ui.showNoResults();
             return;
         }
 
+        const index = this.currentIndex;
         try {
-            const paperSummary = this.papers[this.currentIndex];
+            const paperSummary = await this.source.get(index);
 
-            // Fetch full paper details including Grok analysis
-            const paper = await api.getPaper(paperSummary.id);
+            // Fetch full paper details including Grok analysis (cached; re-rendered if the server has newer data)
+            const paper = await api.getPaper(paperSummary.id, (fresh) => {
+                if (this.currentIndex === index && !this.isListMode) ui.renderPaper(fresh);
+            });
+
+            if (this.currentIndex !== index || this.isListMode) return; // User moved on while loading
 
             ui.renderPaper(paper);
-            ui.updatePageIndicator(this.currentIndex + 1, this.papers.length);
+            ui.updatePageIndicator(index + 1, this.source.total);
             ui.showPaper();
 
+            this.prefetchPaper(index + 1);
+
         } catch (error) {
             console.error('Failed to display paper:', error);
             ui.showError('Failed to load paper details');
         }
     }
 
+    /**
+     * Warm the cache with the next paper's details so NEXT renders immediately
+     */
+    prefetchPaper(index) {
+        if (index >= this.source.total) return;
+
+        this.source.get(index)
+            .then(summary => summary && api.getPaper(summary.id))
+            .catch(error => console.warn('Prefetch failed:', error));
+    }
+
+    /**
+     * Move to another paper in the current list
+     */
+    moveTo(index) {
+        this.currentIndex = index;
+        if (this.isListMode) {
+            this.list.select(index);
+            ui.updatePageIndicator(index + 1, this.source.total);
+        } else {
+            this.displayCurrentPaper();
+        }
+    }
+
     /**
      * Navigate to previous paper
      */
     navigatePrev() {
         if (this.currentIndex > 0) {
-            this.currentIndex--;
-            this.displayCurrentPaper();
+            this.moveTo(this.currentIndex - 1);
         }
     }
 
@@ -195,9 +466,8 @@ class App {
      * Navigate to next paper
      */
     navigateNext() {
-        if (this.currentIndex < this.papers.length - 1) {
-            this.currentIndex++;
-            this.displayCurrentPaper();
+        if (this.currentIndex < this.source.total - 1) {
+            this.moveTo(this.currentIndex + 1);
         }
     }
 
@@ -205,9 +475,10 @@ class App {
      * Toggle bookmark for current paper
      */
     async handleBookmarkToggle() {
-        if (this.papers.length === 0) return;
+        if (!this.source.total) return;
 
-        const paper = this.papers[this.currentIndex];
+        const paper = this.source.peek(this.currentIndex);
+        if (!paper) return;
 
         try {
             if (paper.is_bookmarked) {
@@ -222,6 +493,9 @@ class App {
                 console.log('Bookmark added');
             }
 
+            // The other paged list holds its own copy of this paper; build it again next time it is opened
+            delete this.sources[this.isBookmarkMode ? 'all' : 'bookmarks'];
+
             // Update UI
             await this.displayCurrentPaper();
 
@@ -0,0 +1,98 @@
+/**
+ * IndexedDB Cache - Keeps fetched paper pages and details across reloads
+ * Every method resolves quietly when IndexedDB is unavailable (private mode, old browsers)
+ */
+
+const CACHE_DB_NAME = 'arxiv-feed-viewer';
+const CACHE_DB_VERSION = 1;
+const CACHE_STORE = 'entries';
+const CACHE_MAX_AGE_MS = 14 * 24 * 60 * 60 * 1000; // Entries older than this are pruned on startup
+
+class ResponseCache {
+    constructor() {
+        this.dbPromise = this.open();
+        this.dbPromise.then(() => this.prune());
+    }
+
+    /**
+     * Open (and on first use create) the cache database
+     */
+    open() {
+        if (!window.indexedDB) {
+            return Promise.resolve(null);
+        }
+
+        return new Promise((resolve) => {
+            const request = indexedDB.open(CACHE_DB_NAME, CACHE_DB_VERSION);
+            request.onupgradeneeded = () => {
+                request.result.createObjectStore(CACHE_STORE, { keyPath: 'key' });
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => {
+                console.warn('IndexedDB unavailable, caching disabled:', request.error);
+                resolve(null);
+            };
+            request.onblocked = () => resolve(null);
+        });
+    }
+
+    /**
+     * Run one request against the store and resolve with its result (null on failure)
+     */
+    async run(mode, operation) {
+        const db = await this.dbPromise;
+        if (!db) return null;
+
+        return new Promise((resolve) => {
+            try {
+                const request = operation(db.transaction(CACHE_STORE, mode).objectStore(CACHE_STORE));
+                request.onsuccess = () => resolve(request.result ?? null);
+                request.onerror = () => resolve(null);
+            } catch (error) {
+                console.warn('Cache operation failed:', error);
+                resolve(null);
+            }
+        });
+    }
+
+    /**
+     * Get a cached entry: { key, data, cachedAt } or null
+     */
+    async get(key) {
+        return await this.run('readonly', store => store.get(key));
+    }
+
+    /**
+     * Store a response under a key
+     */
+    async put(key, data) {
+        return await this.run('readwrite', store => store.put({ key, data, cachedAt: Date.now() }));
+    }
+
+    /**
+     * Drop one entry
+     */
+    async delete(key) {
+        return await this.run('readwrite', store => store.delete(key));
+    }
+
+    /**
+     * Delete entries older than CACHE_MAX_AGE_MS
+     */
+    async prune() {
+        const db = await this.dbPromise;
+        if (!db) return;
+
+        const cutoff = Date.now() - CACHE_MAX_AGE_MS;
+        const request = db.transaction(CACHE_STORE, 'readwrite').objectStore(CACHE_STORE).openCursor();
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (!cursor) return;
+            if (cursor.value.cachedAt < cutoff) cursor.delete();
+            cursor.continue();
+        };
+    }
+}
+
+// Export singleton instance
+const responseCache = new ResponseCache();
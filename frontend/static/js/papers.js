@@ -0,0 +1,170 @@
+/**
+ * Paper Sources - Lazily paged paper lists
+ * Both sources expose the same interface: total, peek(index), get(index), ensure(index)
+ */
+
+const PAGE_SIZE = 100;       // Largest page the API serves
+const PREFETCH_MARGIN = 20;  // Fetch the next page when this close to the end of the loaded ones
+
+/**
+ * All papers (or all bookmarked papers), fetched one page at a time as they are needed
+ */
+class PagedPapers {
+    constructor(bookmarked = false) {
+        this.bookmarked = bookmarked;
+        this.total = null;
+        this.pages = new Map();    // page number -> array of paper summaries
+        this.pending = new Map();  // page number -> in-flight promise
+        this.onChange = null;      // called when a background revalidation changed loaded data
+    }
+
+    /**
+     * Paper summary at index if its page is loaded, otherwise undefined
+     */
+    peek(index) {
+        const page = this.pages.get(Math.floor(index / PAGE_SIZE));
+        return page ? page[index % PAGE_SIZE] : undefined;
+    }
+
+    /**
+     * Load the page holding index (and prefetch the next one when near its end)
+     */
+    async ensure(index) {
+        const pageNumber = Math.floor(index / PAGE_SIZE);
+        await this.loadPage(pageNumber);
+
+        const nextStart = (pageNumber + 1) * PAGE_SIZE;
+        if (nextStart - index <= PREFETCH_MARGIN && nextStart < this.total) {
+            this.loadPage(pageNumber + 1).catch(error => console.warn('Prefetch failed:', error));
+        }
+    }
+
+    /**
+     * Paper summary at index, loading its page if needed
+     */
+    async get(index) {
+        await this.ensure(index);
+        return this.peek(index);
+    }
+
+    loadPage(pageNumber) {
+        if (this.pages.has(pageNumber)) return Promise.resolve();
+        if (this.pending.has(pageNumber)) return this.pending.get(pageNumber);
+
+        const promise = api.getPapers(PAGE_SIZE, pageNumber * PAGE_SIZE, this.bookmarked,
+            fresh => this.storePage(pageNumber, fresh, true))
+            .then(response => this.storePage(pageNumber, response, false))
+            .finally(() => this.pending.delete(pageNumber));
+        this.pending.set(pageNumber, promise);
+        return promise;
+    }
+
+    storePage(pageNumber, response, revalidated) {
+        this.pages.set(pageNumber, response.papers);
+        this.total = response.total;
+        if (revalidated && this.onChange) this.onChange();
+    }
+
+    /**
+     * Insert a paper announced by the server into the loaded pages, keeping newest publication first.
+     * Loaded pages from the first gap on are dropped, since the insert shifts them by one.
+     * Returns the paper's index, or -1 if it is already listed or falls beyond the loaded pages.
+     */
+    insertPaper(paper) {
+        if (this.total === null || this.find(paper.id)) return -1;
+
+        let index = -1;
+        let carry = null;
+        let number = 0;
+        for (; this.pages.has(number); number++) {
+            const page = this.pages.get(number);
+            if (index !== -1) {
+                page.unshift(carry);
+            } else {
+                let at = page.findIndex(other => other.published_date <= paper.published_date);
+                if (at === -1 && page.length < PAGE_SIZE) at = page.length;  // Older than the whole list
+                if (at === -1) continue;
+                page.splice(at, 0, paper);
+                index = number * PAGE_SIZE + at;
+            }
+            if (page.length <= PAGE_SIZE) break;  // Was the last page of the list
+            carry = page.pop();
+        }
+
+        // Either the last page of the list or the first gap: everything after it has shifted
+        this.dropPagesFrom(number + 1);
+        this.total++;
+        return index;
+    }
+
+    /**
+     * Remove a paper from the loaded pages, pulling the following ones forward.
+     * Returns the index it had, or -1 if it was not loaded.
+     */
+    removePaper(paperId) {
+        const found = this.find(paperId);
+        if (!found) return -1;
+
+        let number = found.number;
+        let page = this.pages.get(number);
+        page.splice(found.offset, 1);
+        this.total--;
+        while (this.pages.has(number + 1)) {
+            const next = this.pages.get(number + 1);
+            page.push(next.shift());
+            page = next;
+            number++;
+        }
+        // A page left one short that is not the last one would never be completed
+        this.dropPagesFrom((number + 1) * PAGE_SIZE < this.total ? number : number + 1);
+        return found.number * PAGE_SIZE + found.offset;
+    }
+
+    /**
+     * Apply changes (e.g. is_bookmarked) to the loaded copy of a paper
+     */
+    updatePaper(paperId, changes) {
+        const found = this.find(paperId);
+        if (found) Object.assign(this.pages.get(found.number)[found.offset], changes);
+    }
+
+    find(paperId) {
+        for (const [number, page] of this.pages) {
+            const offset = page.findIndex(paper => paper.id === paperId);
+            if (offset !== -1) return { number, offset };
+        }
+        return null;
+    }
+
+    dropPagesFrom(pageNumber) {
+        for (const number of [...this.pages.keys()]) {
+            if (number >= pageNumber) this.pages.delete(number);
+        }
+    }
+}
+
+/**
+ * A list fetched in one go (search results)
+ */
+class StaticPapers {
+    constructor(papers) {
+        this.papers = papers;
+        this.total = papers.length;
+        this.onChange = null;
+    }
+
+    peek(index) {
+        return this.papers[index];
+    }
+
+    async ensure(index) {}
+
+    async get(index) {
+        return this.papers[index];
+    }
+
+    updatePaper(paperId, changes) {
+        const paper = this.papers.find(paper => paper.id === paperId);
+        if (paper) Object.assign(paper, changes);
+    }
+}
@@ -14,6 +14,18 @@ const ui = {
         return `${year}-${month}-${day}`;
     },
 
+    /**
+     * Replace an element's children with one text element per item
+     */
+    renderItems(container, items, className) {
+        container.replaceChildren(...items.map(item => {
+            const el = document.createElement('div');
+            el.className = className;
+            el.textContent = item;
+            return el;
+        }));
+    },
+
     /**
      * Render a paper in the three-column layout
      */
@@ -25,14 +37,11 @@ const ui = {
         document.getElementById('paperCategory').textContent = paper.primary_category;
 
         // Authors
-        const authorsContainer = document.getElementById('paperAuthors');
-        authorsContainer.innerHTML = paper.authors
-            .map(author => `<div class="author">${author}</div>`)
-            .join('');
+        this.renderItems(document.getElementById('paperAuthors'), paper.authors, 'author');
 
         // PDF link
         const pdfLink = document.getElementById('pdfLink');
-        pdfLink.href = paper.pdf_url;
+        pdfLink.href = `/api/papers/${paper.id}/pdf`;  // Local copy if stored, otherwise redirects to arXiv
 
         // Bookmark button
         const bookmarkBtn = document.getElementById('bookmarkBtn');
@@ -50,13 +59,74 @@ const ui = {
         // Right column: Grok insights
         const grokContainer = document.getElementById('grokAnalysis');
         if (paper.grok_analysis && paper.grok_analysis.key_points) {
-            const insights = paper.grok_analysis.key_points
-                .map(point => `<div class="insight">${point}</div>`)
-                .join('');
-            grokContainer.innerHTML = insights;
+            this.renderItems(grokContainer, paper.grok_analysis.key_points, 'insight');
         } else {
-            grokContainer.innerHTML = '<div class="no-analysis">[ NO ANALYSIS AVAILABLE ]</div>';
+            this.renderItems(grokContainer, ['[ NO ANALYSIS AVAILABLE ]'], 'no-analysis');
+        }
+    },
+
+    /**
+     * Create an empty overview row; VirtualList reuses rows as it scrolls
+     */
+    createListRow() {
+        const row = document.createElement('div');
+        row.className = 'list-row';
+        for (const part of ['list-row-meta', 'list-row-title']) {
+            const el = document.createElement('div');
+            el.className = part;
+            row.appendChild(el);
+        }
+        return row;
+    },
+
+    /**
+     * Fill an overview row with a paper summary (or a placeholder while its page loads)
+     */
+    fillListRow(row, paper, index) {
+        const [meta, title] = row.children;
+        const number = String(index + 1).padStart(4, '0');
+        if (!paper) {
+            meta.textContent = `${number}  ...`;
+            title.textContent = '[ LOADING ]';
+            return;
         }
+        meta.textContent = `${number}  ${paper.arxiv_id}  ${this.formatDate(paper.published_date)}  ` +
+            `${paper.primary_category}${paper.is_bookmarked ? '  ★' : ''}`;
+        title.textContent = paper.title;
+    },
+
+    /**
+     * Show term completions and title matches under the search box
+     */
+    renderSuggestions(result) {
+        const container = document.getElementById('suggestions');
+        const items = [];
+
+        for (const term of result.terms) {
+            const el = document.createElement('div');
+            el.className = 'suggestion suggestion-term';
+            el.dataset.completion = term.completion;
+            el.textContent = term.completion;
+            const count = document.createElement('span');
+            count.className = 'suggestion-count';
+            count.textContent = `${term.papers}`;
+            el.appendChild(count);
+            items.push(el);
+        }
+        for (const paper of result.papers) {
+            const el = document.createElement('div');
+            el.className = 'suggestion suggestion-paper';
+            el.dataset.paperId = paper.id;
+            el.textContent = `${paper.arxiv_id}  ${paper.title}`;
+            items.push(el);
+        }
+
+        container.replaceChildren(...items);
+        container.classList.toggle('hidden', items.length === 0);
+    },
+
+    hideSuggestions() {
+        document.getElementById('suggestions').classList.add('hidden');
     },
 
     /**
@@ -80,6 +150,7 @@ const ui = {
     showLoading() {
         document.getElementById('loadingSpinner').classList.remove('hidden');
         document.getElementById('paperView').classList.add('hidden');
+        document.getElementById('listView').classList.add('hidden');
         document.getElementById('noResults').classList.add('hidden');
     },
 
@@ -89,7 +160,18 @@ const ui = {
     showPaper() {
         document.getElementById('loadingSpinner').classList.add('hidden');
         document.getElementById('paperView').classList.remove('hidden');
+        document.getElementById('listView').classList.add('hidden');
+        document.getElementById('noResults').classList.add('hidden');
+    },
+
+    /**
+     * Show the virtualized overview list
+     */
+    showList() {
+        document.getElementById('loadingSpinner').classList.add('hidden');
+        document.getElementById('paperView').classList.add('hidden');
         document.getElementById('noResults').classList.add('hidden');
+        document.getElementById('listView').classList.remove('hidden');
     },
 
     /**
@@ -98,6 +180,7 @@ const ui = {
     showNoResults() {
         document.getElementById('loadingSpinner').classList.add('hidden');
         document.getElementById('paperView').classList.add('hidden');
+        document.getElementById('listView').classList.add('hidden');
         document.getElementById('noResults').classList.remove('hidden');
     },
 
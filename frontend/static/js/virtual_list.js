@@ -0,0 +1,144 @@
+/**
+ * Virtual List - Overview of a paper source that only keeps visible rows in the DOM
+ * Rows have a fixed height; a spacer gives the scrollbar the full list height and a small
+ * pool of row elements is repositioned and refilled as the user scrolls.
+ */
+
+const LIST_ROW_HEIGHT = 64;  // px, must match .list-row in gothic.css
+const LIST_OVERSCAN = 8;     // Extra rows rendered above and below the viewport
+
+class VirtualList {
+    constructor(container, onSelect) {
+        this.container = container;
+        this.onSelect = onSelect;
+        this.source = null;
+        this.selectedIndex = 0;
+        this.framePending = false;
+        this.pool = [];
+        this.requested = new Set();  // Page ranges already asked for from the current source
+
+        this.spacer = document.createElement('div');
+        this.spacer.className = 'list-spacer';
+        this.container.appendChild(this.spacer);
+
+        this.container.addEventListener('scroll', () => this.scheduleRender());
+        window.addEventListener('resize', () => this.scheduleRender());
+        this.container.addEventListener('click', (e) => {
+            const row = e.target.closest('.list-row');
+            if (row && row.dataset.index !== undefined) {
+                this.onSelect(Number(row.dataset.index));
+            }
+        });
+    }
+
+    /**
+     * Show a paper source, scrolled so that selectedIndex is visible
+     */
+    setSource(source, selectedIndex = 0) {
+        this.source = source;
+        this.selectedIndex = selectedIndex;
+        this.requested.clear();
+        this.refresh();
+        this.scrollToIndex(selectedIndex);
+    }
+
+    /**
+     * Re-render after the source's data changed
+     */
+    refresh() {
+        this.spacer.style.height = `${(this.source ? this.source.total || 0 : 0) * LIST_ROW_HEIGHT}px`;
+        this.scheduleRender();
+    }
+
+    /**
+     * Re-render after a row was inserted (delta 1) or removed (delta -1) at index, keeping the rows
+     * on screen in place; pages the source dropped are requested again
+     */
+    rowsMoved(index, delta) {
+        if (index < this.selectedIndex || (delta > 0 && index === this.selectedIndex)) {
+            this.selectedIndex += delta;
+        }
+        this.requested.clear();
+        this.refresh();
+        if (index * LIST_ROW_HEIGHT < this.container.scrollTop) {
+            this.container.scrollTop += delta * LIST_ROW_HEIGHT;
+        }
+    }
+
+    select(index) {
+        this.selectedIndex = index;
+        this.scrollToIndex(index);
+        this.scheduleRender();
+    }
+
+    /**
+     * Scroll the minimum distance needed to bring a row into view
+     */
+    scrollToIndex(index) {
+        const top = index * LIST_ROW_HEIGHT;
+        const viewTop = this.container.scrollTop;
+        const viewHeight = this.container.clientHeight;
+        if (top < viewTop) {
+            this.container.scrollTop = top;
+        } else if (top + LIST_ROW_HEIGHT > viewTop + viewHeight) {
+            this.container.scrollTop = top + LIST_ROW_HEIGHT - viewHeight;
+        }
+    }
+
+    scheduleRender() {
+        if (this.framePending) return;
+        this.framePending = true;
+        requestAnimationFrame(() => {
+            this.framePending = false;
+            this.render();
+        });
+    }
+
+    /**
+     * Fill the row pool for the visible range and request pages that are not loaded yet
+     */
+    render() {
+        if (!this.source || !this.source.total) return;
+
+        const total = this.source.total;
+        const first = Math.max(0, Math.floor(this.container.scrollTop / LIST_ROW_HEIGHT) - LIST_OVERSCAN);
+        const last = Math.min(total - 1,
+            Math.ceil((this.container.scrollTop + this.container.clientHeight) / LIST_ROW_HEIGHT) + LIST_OVERSCAN);
+        const count = Math.max(0, last - first + 1);
+
+        while (this.pool.length < count) {
+            const row = ui.createListRow();
+            this.spacer.appendChild(row);
+            this.pool.push(row);
+        }
+        this.pool.forEach((row, i) => {
+            row.classList.toggle('hidden', i >= count);
+        });
+
+        let missing = false;
+        for (let i = 0; i < count; i++) {
+            const index = first + i;
+            const row = this.pool[i];
+            const paper = this.source.peek(index);
+            row.style.transform = `translateY(${index * LIST_ROW_HEIGHT}px)`;
+            row.dataset.index = index;
+            row.classList.toggle('selected', index === this.selectedIndex);
+            ui.fillListRow(row, paper, index);
+            missing = missing || !paper;
+        }
+
+        const range = `${Math.floor(first / PAGE_SIZE)}-${Math.floor(last / PAGE_SIZE)}`;
+        if (missing && !this.requested.has(range)) {
+            const source = this.source;
+            this.requested.add(range);
+            Promise.all([source.ensure(first), source.ensure(last)])
+                .then(() => {
+                    if (source === this.source) this.refresh();
+                })
+                .catch(error => {
+                    this.requested.delete(range);
+                    console.error('Failed to load list page:', error);
+                });
+        }
+    }
+}
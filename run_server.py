@@ -13,9 +13,11 @@ if __name__ == "__main__":
     import uvicorn
     from backend.config import settings
 
+    # Workers share the database; one of them is elected to run background jobs
     uvicorn.run(
         "backend.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        workers=settings.WORKERS,
+        reload=settings.DEBUG and settings.WORKERS == 1
     )
@@ -11,8 +11,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.database import SessionLocal
 from backend.models import Paper, GrokAnalysis
-from backend.services.grok_service import GrokService
-from backend.config import settings
+from backend.dependencies import get_paper_service
+from backend.tasks.worker import create_worker
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,7 +21,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 async def main():
-    """Add Grok analysis to papers missing it"""
+    """Queue Grok analysis for papers missing it and run the queue"""
     print("=" * 80)
     print("Adding Grok analysis to papers without it")
     print("=" * 80)
@@ -30,7 +30,7 @@ async def main():
 
     try:
         # Find papers without Grok analysis
-        papers_without_analysis = db.query(Paper)\
+        papers_without_analysis = db.query(Paper.id)\
             .outerjoin(GrokAnalysis)\
             .filter(GrokAnalysis.id == None)\
             .all()
@@ -41,48 +41,27 @@ async def main():
 
         print(f"\nFound {len(papers_without_analysis)} papers without analysis")
 
-        # Initialize Grok service
-        grok = GrokService(api_key=settings.GROK_API_KEY)
-        logger.info(f"Using Grok model: {grok.model}")
+        # Initialize services
+        paper_service = get_paper_service()
+        logger.info(f"Using Grok model: {paper_service.grok_service.model}")
 
-        analyzed = 0
-        failed = 0
+        # Jobs already queued for a paper are not duplicated
+        for (paper_id,) in papers_without_analysis:
+            paper_service.enqueue_analysis(db, paper_id)
+        db.commit()
 
-        for paper in papers_without_analysis:
-            print(f"\nAnalyzing: {paper.title[:60]}...")
+        await create_worker(paper_service).drain()
 
-            try:
-                # Analyze with Grok
-                key_points = await grok.analyze_paper(
-                    title=paper.title,
-                    abstract=paper.abstract
-                )
-
-                if key_points:
-                    # Create analysis record
-                    analysis = GrokAnalysis(
-                        paper_id=paper.id,
-                        key_points=key_points,
-                        model_version=grok.model
-                    )
-                    db.add(analysis)
-                    db.commit()
-
-                    analyzed += 1
-                    print(f"  -> Added {len(key_points)} key points")
-                else:
-                    failed += 1
-                    logger.warning(f"No analysis returned for paper {paper.id}")
-
-            except Exception as e:
-                failed += 1
-                logger.error(f"Failed to analyze paper {paper.id}: {e}")
-                db.rollback()
+        stats = paper_service.job_queue.stats(db)
+        remaining = db.query(Paper.id)\
+            .outerjoin(GrokAnalysis)\
+            .filter(GrokAnalysis.id == None)\
+            .count()
 
         print("\n" + "=" * 80)
         print(f"Analysis complete!")
-        print(f"  Analyzed: {analyzed}")
-        print(f"  Failed: {failed}")
+        print(f"  Analyzed: {len(papers_without_analysis) - remaining}")
+        print(f"  Still missing: {remaining} (queued for retry: {stats['queued']}, dead: {stats['dead']})")
         print("=" * 80)
 
     finally:
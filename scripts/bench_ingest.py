@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+End-to-end ingest throughput harness against local arXiv and Grok stand-ins.
+
+Starts the stand-in servers from scripts/standins with the requested latency
+and fault rates, points a throwaway instance at them (ARXIV_API_URL,
+GROK_API_URL), then runs the real pipeline: fetch_new_papers over several
+saved feeds, followed by the job worker until every analysis job is done or
+dead. Reports papers/minute, retries and wasted upstream calls.
+
+Usage:
+    python scripts/bench_ingest.py
+    python scripts/bench_ingest.py --grok-throttle-rate 0.2 --grok-malformed-rate 0.1 --output ingest.json
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.standins.faults import Faults
+from scripts.standins.arxiv_server import ArxivStandin
+from scripts.standins.grok_server import GrokStandin
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ingest throughput against local stand-ins")
+    parser.add_argument("--papers", type=int, default=150, help="Papers in the stand-in arXiv pool")
+    parser.add_argument("--feeds", type=int, default=3, help="Saved feeds to crawl")
+    parser.add_argument("--max-results", type=int, default=100, help="Results per feed")
+    parser.add_argument("--pdf-bytes", type=int, default=256 * 1024)
+    parser.add_argument("--arxiv-latency", type=float, default=0.05)
+    parser.add_argument("--arxiv-throttle-rate", type=float, default=0.0)
+    parser.add_argument("--arxiv-error-rate", type=float, default=0.05)
+    parser.add_argument("--arxiv-malformed-rate", type=float, default=0.0)
+    parser.add_argument("--arxiv-delay", type=float, default=0.0, help="ARXIV_RATE_LIMIT_DELAY")
+    parser.add_argument("--grok-latency", type=float, default=0.2)
+    parser.add_argument("--grok-throttle-rate", type=float, default=0.05)
+    parser.add_argument("--grok-error-rate", type=float, default=0.05)
+    parser.add_argument("--grok-malformed-rate", type=float, default=0.05)
+    parser.add_argument("--grok-delay", type=float, default=0.0, help="GROK_RATE_LIMIT_DELAY")
+    parser.add_argument("--concurrency", type=int, default=4, help="Job worker concurrency")
+    parser.add_argument("--timeout", type=float, default=600, help="Give up on the queue after N seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's log output")
+    return parser.parse_args()
+
+
+# Not waited for: render_digest defers itself by minutes while analyses are pending, which
+# would make the run measure that delay instead of ingest
+UNTIMED_JOB_KINDS = {"render_digest"}
+
+
+async def drain_queue(worker, queue, session_factory, timeout: float) -> bool:
+    """Run the worker until no job (other than UNTIMED_JOB_KINDS) is queued or running; False on timeout"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await worker.drain()
+        db = session_factory()
+        try:
+            stats = queue.stats(db)
+        finally:
+            db.close()
+        active = sum(
+            counts.get("queued", 0) + counts.get("running", 0)
+            for kind, counts in stats["depth"].items() if kind not in UNTIMED_JOB_KINDS
+        )
+        if active == 0:
+            return True
+        await asyncio.sleep(0.1)  # remaining jobs are backing off
+    return False
+
+
+async def run(args, arxiv_standin: ArxivStandin, grok_standin: GrokStandin) -> dict:
+    from sqlalchemy import func
+
+    from backend import metrics
+    from backend.database import SessionLocal, init_db
+    from backend.dependencies import get_paper_service
+    from backend.models import Feed, Paper, GrokAnalysis, Job
+    from backend.tasks.worker import create_worker
+
+    init_db()
+    db = SessionLocal()
+    try:
+        for n in range(1, args.feeds):
+            db.add(Feed(name=f"bench-{n}", query=f"cat:cs.CR AND abs:topic{n}"))
+        db.commit()
+        queries = [feed.query for feed in db.query(Feed).filter(Feed.enabled == True)]  # noqa: E712
+    finally:
+        db.close()
+    expected = len({i for q in queries for i in arxiv_standin.matching(q)[:args.max_results]})
+
+    paper_service = get_paper_service()
+    worker = create_worker(paper_service, args.concurrency)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        added, _, skipped = await paper_service.fetch_new_papers(db, days_back=7)
+    finally:
+        db.close()
+    fetch_seconds = time.perf_counter() - started
+
+    drained = await drain_queue(worker, paper_service.job_queue, SessionLocal, args.timeout)
+    total_seconds = time.perf_counter() - started
+    analysis_seconds = total_seconds - fetch_seconds
+
+    db = SessionLocal()
+    try:
+        papers = db.query(func.count(Paper.id)).scalar()
+        analyses = db.query(func.count(GrokAnalysis.id)).scalar()
+        timed = Job.kind.notin_(UNTIMED_JOB_KINDS)  # Left queued when the run stops
+        jobs = db.query(func.count(Job.id)).filter(timed).scalar()
+        attempts = db.query(func.coalesce(func.sum(Job.attempts), 0)).filter(timed).scalar()
+        dead = db.query(func.count(Job.id)).filter(Job.state == "dead").scalar()
+        with_pdf = db.query(func.count(Paper.id)).filter(Paper.pdf_local_path.isnot(None)).scalar()
+    finally:
+        db.close()
+
+    arxiv_calls = arxiv_standin.faults.snapshot()
+    pdf_calls = arxiv_standin.pdf_faults.snapshot()
+    chat_calls = grok_standin.faults.snapshot()
+
+    return {
+        "completed": drained,
+        "papers": {
+            "expected": expected,
+            "stored": papers,
+            "with_pdf": with_pdf,
+            "analyzed": analyses,
+            "fetch_added": added,
+            "fetch_skipped": skipped,
+        },
+        "timing": {
+            "fetch_seconds": round(fetch_seconds, 2),
+            "analysis_seconds": round(analysis_seconds, 2),
+            "total_seconds": round(total_seconds, 2),
+            "fetch_papers_per_minute": round(60 * papers / fetch_seconds, 1) if fetch_seconds else None,
+            "papers_per_minute": round(60 * analyses / total_seconds, 1) if total_seconds else None,
+        },
+        "arxiv": {
+            "query_calls": arxiv_calls,
+            "pdf_calls": pdf_calls,
+            "wasted_calls": sum(v for k, v in {**arxiv_calls, **pdf_calls}.items()
+                                if k.endswith(("_throttled", "_error", "_malformed"))),
+        },
+        "grok": {
+            "chat_calls": chat_calls,
+            "in_call_retries": int(metrics.grok_retries.value()),
+            "parse_outcomes": {o: int(metrics.grok_parse_outcomes.value(outcome=o))
+                               for o in ("clean", "recovered", "repaired", "failed")},
+            "tokens": {t: int(metrics.grok_tokens.value(type=t)) for t in ("prompt", "completion")},
+            "jobs": jobs,
+            "job_attempts": attempts,
+            "job_retries": attempts - jobs,
+            "dead_jobs": dead,
+            "wasted_calls": chat_calls.get("chat", 0) - analyses,
+        },
+    }
+
+
+def main():
+    args = parse_args()
+
+    arxiv_standin = ArxivStandin(
+        papers=args.papers,
+        pdf_bytes=args.pdf_bytes,
+        faults=Faults(latency=args.arxiv_latency, throttle_rate=args.arxiv_throttle_rate,
+                      error_rate=args.arxiv_error_rate, malformed_rate=args.arxiv_malformed_rate,
+                      retry_after=0.5, seed=args.seed),
+        pdf_faults=Faults(latency=args.arxiv_latency, error_rate=args.arxiv_error_rate, seed=args.seed + 1),
+    ).start()
+    grok_standin = GrokStandin(Faults(
+        latency=args.grok_latency, jitter=args.grok_latency / 2,
+        throttle_rate=args.grok_throttle_rate, error_rate=args.grok_error_rate,
+        malformed_rate=args.grok_malformed_rate, retry_after=1.0, seed=args.seed + 2
+    )).start()
+
+    # Throwaway instance wired to the stand-ins; set before backend modules load settings
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_ingest_"))
+    os.environ.update({
+        "DATABASE_PATH": str(work_dir / "ingest.db"),
+        "PDF_STORAGE_PATH": str(work_dir / "pdfs"),
+        "DIGEST_PATH": str(work_dir / "digests"),
+        "ARXIV_API_URL": arxiv_standin.url,
+        "GROK_API_URL": grok_standin.url,
+        "ARXIV_RATE_LIMIT_DELAY": str(args.arxiv_delay),
+        "GROK_RATE_LIMIT_DELAY": str(args.grok_delay),
+        "ARXIV_MAX_RESULTS": str(args.max_results),
+        "JOB_BACKOFF_BASE_SECONDS": "0.5",
+        "JOB_BACKOFF_MAX_SECONDS": "5",
+        "FTS_MERGE_DELAY_SECONDS": "0",  # Merge within the run instead of waiting on a delayed job
+        "SLOW_QUERY_MS": "0",
+        "DEBUG": "false",
+    })
+    os.environ.setdefault("GROK_API_KEY", "standin")
+
+    # Injected faults make the pipeline log an error per failed call; hide them by default
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    print("=" * 80)
+    print(f"INGEST BENCHMARK - {args.feeds} feeds, pool of {args.papers} papers, work dir {work_dir}")
+    print(f"arXiv: {arxiv_standin.url}   Grok: {grok_standin.url}")
+    print("=" * 80)
+
+    try:
+        results = asyncio.run(run(args, arxiv_standin, grok_standin))
+    finally:
+        arxiv_standin.stop()
+        grok_standin.stop()
+
+    results = {
+        "benchmark": "ingest",
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "parameters": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        **results,
+    }
+
+    p, t, a, g = results["papers"], results["timing"], results["arxiv"], results["grok"]
+    print(f"Papers:   {p['stored']}/{p['expected']} stored, {p['with_pdf']} with PDF, {p['analyzed']} analyzed")
+    print(f"Time:     fetch {t['fetch_seconds']}s, analysis {t['analysis_seconds']}s, total {t['total_seconds']}s")
+    print(f"Rate:     {t['fetch_papers_per_minute']} papers/min fetched, {t['papers_per_minute']} papers/min end to end")
+    print(f"arXiv:    {a['query_calls'].get('query', 0)} queries, {a['pdf_calls'].get('pdf', 0)} PDFs, "
+          f"{a['wasted_calls']} wasted calls")
+    print(f"Grok:     {g['chat_calls'].get('chat', 0)} calls, {g['in_call_retries']} in-call retries, "
+          f"{g['job_retries']} job retries, {g['dead_jobs']} dead, {g['wasted_calls']} wasted calls")
+    print("Parsing:  " + ", ".join(f"{n} {o}" for o, n in g["parse_outcomes"].items()))
+    if not results["completed"]:
+        print(f"[WARN] Queue not drained within {args.timeout:.0f}s")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
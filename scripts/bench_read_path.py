@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Read-path benchmark over a synthetic corpus.
+
+Generates papers, Grok analyses and bookmarks into a temporary SQLite
+database, then drives the real FastAPI app in-process and reports p50/p95/p99
+latency, throughput and SQL statements per request for:
+
+    - GET /api/papers/ at several offsets (newest-first pagination)
+    - GET /api/papers/?bookmarked=true
+    - GET /api/papers/search with common, medium and rare terms
+    - GET /api/papers/suggest over 1-5 letter prefixes of corpus words
+    - GET /api/papers/{id}
+    - GET /api/bookmarks/
+
+Results are written as JSON tagged with the git commit so runs can be compared:
+
+    python scripts/bench_read_path.py --output bench/read_path.json
+    python scripts/bench_read_path.py --compare bench/read_path.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta
+
+project_root = Path(__file__).parent.parent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the read endpoints on a synthetic corpus")
+    parser.add_argument("--papers", type=int, default=100_000, help="Papers in the synthetic corpus")
+    parser.add_argument("--bookmarks", type=int, default=2_000, help="Bookmarked papers")
+    parser.add_argument("--analyzed", type=float, default=0.9, help="Fraction of papers with an analysis")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per scenario")
+    parser.add_argument("--seed", type=int, default=1234, help="Corpus and request seed")
+    parser.add_argument("--db", type=Path, help="Reuse (or keep) the corpus at this path")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to print deltas against")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Point the app at the benchmark database before backend modules load settings
+db_path = args.db or Path(tempfile.mkdtemp(prefix="bench_read_")) / "bench.db"
+os.environ["DATABASE_PATH"] = str(db_path)
+os.environ["DIGEST_PATH"] = str(db_path.parent / "digests")
+os.environ.setdefault("GROK_API_KEY", "unused")
+os.environ["JOB_WORKER_IN_PROCESS"] = "false"
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["SLOW_QUERY_MS"] = "0"
+os.environ["DEBUG"] = "false"
+os.chdir(project_root)  # StaticFiles and FileResponse paths are relative
+
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+
+from backend.database import (
+    engine, init_db, drop_fts_triggers, create_fts_triggers, rebuild_fts,
+    drop_facet_triggers, rebuild_facets, drop_stats_triggers, rebuild_stats
+)
+from backend.models import Paper, GrokAnalysis, Bookmark, paper_feeds, content_hash
+
+# Word frequencies follow a rough Zipf curve so FTS terms range from very common to rare
+VOCABULARY = (
+    "language model attack security llm adversarial prompt injection detection agent "
+    "jailbreak defense privacy leakage backdoor poisoning robustness evaluation benchmark "
+    "malware phishing vulnerability fuzzing code generation watermark membership inference "
+    "federated differential alignment red teaming guardrail retrieval augmented tool "
+    "supply chain intrusion anomaly graph transformer diffusion deepfake authentication "
+    "steganography side channel firmware smart contract blockchain honeypot forensics "
+    "cryptanalysis homomorphic zero knowledge obfuscation decompilation sandbox exfiltration"
+).split()
+SEARCH_TERMS = {"common": "model", "medium": "watermark", "rare": "honeypot", "phrase": '"prompt injection"'}
+CATEGORIES = ["cs.CR", "cs.AI", "cs.LG", "cs.CL", "cs.SE", "cs.NI"]
+BATCH = 5_000
+
+
+def zipf_words(rng: random.Random, count: int) -> str:
+    return " ".join(VOCABULARY[min(int(rng.paretovariate(1.1)) - 1, len(VOCABULARY) - 1)]
+                    if rng.random() < 0.6 else rng.choice(VOCABULARY) for _ in range(count))
+
+
+def generate_corpus(papers: int, bookmarks: int, analyzed: float, seed: int):
+    """Bulk-load the synthetic corpus with the FTS, facet and stats triggers off, then rebuild each once"""
+    rng = random.Random(seed)
+    start_date = datetime(2021, 1, 1)
+    span = (datetime(2026, 1, 1) - start_date).total_seconds()
+
+    init_db()
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        drop_fts_triggers(conn)
+        drop_facet_triggers(conn)
+        drop_stats_triggers(conn)
+
+        for first in range(1, papers + 1, BATCH):
+            paper_rows, analysis_rows, feed_rows = [], [], []
+            for paper_id in range(first, min(first + BATCH, papers + 1)):
+                published = start_date + timedelta(seconds=rng.random() * span)
+                categories = ["cs.CR"] + rng.sample(CATEGORIES[1:], rng.randint(0, 2))
+                # Drawn in this order so a seed generates the same corpus as before
+                title = zipf_words(rng, rng.randint(6, 14)).capitalize()
+                authors = [f"Author {rng.randint(1, 20000)}" for _ in range(rng.randint(1, 8))]
+                abstract = zipf_words(rng, rng.randint(120, 220))
+                paper_rows.append({
+                    "id": paper_id,
+                    "arxiv_id": f"{published:%y%m}.{paper_id:05d}v1",
+                    "base_id": f"{published:%y%m}.{paper_id:05d}",
+                    "content_hash": content_hash(title, abstract),
+                    "title": title,
+                    "authors": authors,
+                    "abstract": abstract,
+                    "published_date": published,
+                    "updated_date": published,
+                    "pdf_url": f"https://arxiv.org/pdf/{published:%y%m}.{paper_id:05d}v1",
+                    "categories": categories,
+                    "primary_category": categories[0],
+                    "created_at": published,
+                })
+                feed_rows.append({"paper_id": paper_id, "feed_id": 1})
+                if rng.random() < analyzed:
+                    analysis_rows.append({
+                        "paper_id": paper_id,
+                        "key_points": [zipf_words(rng, 14)[:120] for _ in range(rng.randint(5, 7))],
+                        "analyzed_at": published,
+                        "model_version": "synthetic",
+                    })
+            conn.execute(insert(Paper.__table__), paper_rows)
+            conn.execute(insert(paper_feeds), feed_rows)
+            if analysis_rows:
+                conn.execute(insert(GrokAnalysis.__table__), analysis_rows)
+
+        bookmarked = rng.sample(range(1, papers + 1), min(bookmarks, papers))
+        conn.execute(insert(Bookmark.__table__), [
+            {"paper_id": paper_id, "bookmarked_at": datetime(2026, 1, 1)} for paper_id in bookmarked
+        ])
+
+        create_fts_triggers(conn)
+        rebuild_fts(conn)
+        rebuild_facets(conn)
+        rebuild_stats(conn)
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return time.perf_counter() - started
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_scenario(client, name: str, make_url, requests: int, warmup: int) -> dict:
+    """Issue warmup + timed GETs; make_url(i) returns the URL of the i-th request"""
+    for i in range(warmup):
+        client.get(make_url(i))
+
+    latencies, queries = [], []
+    started = time.perf_counter()
+    for i in range(requests):
+        url = make_url(warmup + i)
+        t0 = time.perf_counter()
+        response = client.get(url)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{name}: GET {url} returned {response.status_code}")
+        queries.append(int(response.headers.get("x-db-queries", 0)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "requests": requests,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "db_queries_per_request": round(statistics.fmean(queries), 1),
+    }
+    print(f"  {name:<28} p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+          f"{result['throughput_rps']:8.1f} req/s  {result['db_queries_per_request']:6.1f} queries/req")
+    return result
+
+
+def git_revision() -> dict:
+    def git(*cmd):
+        try:
+            return subprocess.run(["git", *cmd], cwd=project_root, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def print_comparison(previous: dict, current: dict):
+    print("\nChange vs " + str((previous.get("git") or {}).get("commit", "?"))[:10] + ":")
+    for name, result in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        deltas = []
+        for key in ("p50_ms", "p99_ms"):
+            if before[key]:
+                deltas.append(f"{key[:3]} {100 * (result[key] - before[key]) / before[key]:+6.1f}%")
+        print(f"  {name:<28} " + "  ".join(deltas))
+
+
+def main():
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    print("=" * 80)
+    print(f"READ-PATH BENCHMARK - {args.papers:,} papers, database {db_path}")
+    print("=" * 80)
+
+    corpus_seconds = None
+    reuse = args.db is not None and args.db.exists() and args.db.stat().st_size > 0
+    if reuse:
+        print("Reusing existing corpus")
+    else:
+        corpus_seconds = generate_corpus(args.papers, args.bookmarks, args.analyzed, args.seed)
+        print(f"Generated corpus in {corpus_seconds:.1f}s ({db_path.stat().st_size / 1e6:.0f} MB)")
+
+    with engine.connect() as conn:
+        papers = conn.exec_driver_sql("SELECT count(*) FROM papers").scalar()
+        bookmark_count = conn.exec_driver_sql("SELECT count(*) FROM bookmarks").scalar()
+
+    rng = random.Random(args.seed)
+    paper_ids = [rng.randint(1, papers) for _ in range(args.requests + args.warmup)]
+    offsets = sorted({o for o in (0, 100, 1_000, 10_000, papers // 2, papers - 20) if 0 <= o < papers})
+
+    scenarios = {}
+    with TestClient(app) as client:
+        for offset in offsets:
+            scenarios[f"list offset={offset}"] = run_scenario(
+                client, f"list offset={offset}", lambda i, o=offset: f"/api/papers/?limit=20&offset={o}",
+                args.requests, args.warmup)
+        scenarios["list bookmarked"] = run_scenario(
+            client, "list bookmarked", lambda i: "/api/papers/?limit=20&bookmarked=true",
+            args.requests, args.warmup)
+        scenarios["list category"] = run_scenario(
+            client, "list category", lambda i: f"/api/papers/?limit=20&category={CATEGORIES[-1]}",
+            args.requests, args.warmup)
+        scenarios["list author"] = run_scenario(
+            client, "list author", lambda i: f"/api/papers/?limit=20&author=Author%20{paper_ids[i] % 20000 + 1}",
+            args.requests, args.warmup)
+        scenarios["facets"] = run_scenario(
+            client, "facets", lambda i: "/api/facets/", args.requests, args.warmup)
+        scenarios["timeline"] = run_scenario(
+            client, "timeline", lambda i: "/api/stats/timeline?bucket=week&since=2021-01-01&until=2025-12-31"
+            f"&category=*&category={CATEGORIES[1]}", args.requests, args.warmup)
+        scenarios["facets category"] = run_scenario(
+            client, "facets category", lambda i: f"/api/facets/?category={CATEGORIES[-1]}",
+            max(args.requests // 10, 5), max(args.warmup // 10, 1))
+        for label, term in SEARCH_TERMS.items():
+            scenarios[f"search {label}"] = run_scenario(
+                client, f"search {label}", lambda i, t=term: f"/api/papers/search?q={t}&limit=20",
+                args.requests, args.warmup)
+        prefixes = sorted({word[:n] for word in VOCABULARY for n in range(1, 6)})
+        rng.shuffle(prefixes)
+        scenarios["suggest"] = run_scenario(
+            client, "suggest", lambda i: f"/api/papers/suggest?q={prefixes[i % len(prefixes)]}",
+            args.requests, args.warmup)
+        scenarios["detail"] = run_scenario(
+            client, "detail", lambda i: f"/api/papers/{paper_ids[i]}", args.requests, args.warmup)
+        scenarios["bookmarks"] = run_scenario(
+            client, "bookmarks", lambda i: "/api/bookmarks/",
+            max(args.requests // 10, 5), max(args.warmup // 10, 1))
+
+    results = {
+        "benchmark": "read_path",
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "corpus": {
+            "papers": papers,
+            "bookmarks": bookmark_count,
+            "seed": args.seed,
+            "generation_seconds": round(corpus_seconds, 1) if corpus_seconds else None,
+        },
+        "scenarios": scenarios,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        print_comparison(json.loads(args.compare.read_text()), results)
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark driven by `python -X importtime`.
+
+Imports a module (backend.main by default) in fresh interpreters, reports
+the median cumulative import time and the slowest imports made directly by
+that module (each including its own imports), and exits non-zero when the
+budget is exceeded or when a module that must stay deferred (arxiv, httpx,
+...) is imported at startup.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --module backend.tasks.worker --budget-ms 600
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+# Heavy dependencies that only the fetch/analysis paths may import
+DEFERRED_MODULES = ["arxiv", "httpx", "feedparser", "requests"]
+
+
+def measure(module: str) -> dict:
+    """Import `module` in a fresh interpreter and parse the -X importtime report"""
+    env = dict(os.environ)
+    env.setdefault("GROK_API_KEY", "startup-benchmark")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    entries = []  # (name, cumulative us, depth), in report order: imports before their importer
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            _, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(cumulative_us), len(indent)))
+
+    total_us, top_level = None, []
+    for position, (name, cumulative_us, depth) in enumerate(entries):
+        if name != module:
+            continue
+        total_us = cumulative_us
+        # The module's own imports are the entries just above it, one level (two spaces) deeper
+        for child, child_us, child_depth in reversed(entries[:position]):
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 2:
+                top_level.append((child, child_us))
+        break
+
+    return {"total_ms": (total_us or 0) / 1000, "imported": {name for name, _, _ in entries}, "top_level": top_level}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time budget check")
+    parser.add_argument("--module", default="backend.main", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=900.0, help="Median import time budget")
+    parser.add_argument("--allow", action="append", default=[],
+                        help="Deferred module that may be imported (repeatable)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(run["total_ms"] for run in runs)
+    slowest = sorted(runs[-1]["top_level"], key=lambda item: item[1], reverse=True)[:10]
+    leaked = sorted(
+        name for name in DEFERRED_MODULES
+        if name not in args.allow and name in runs[-1]["imported"]
+    )
+
+    print("=" * 80)
+    print(f"Cold import of {args.module}: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    print(f"Slowest top-level imports (made by {args.module}):")
+    for name, cumulative_us in slowest:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    if leaked:
+        print(f"Deferred modules imported at startup: {', '.join(leaked)}")
+    print("=" * 80)
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "module": args.module,
+            "runs_ms": [run["total_ms"] for run in runs],
+            "median_ms": median_ms,
+            "budget_ms": args.budget_ms,
+            "slowest": slowest,
+            "leaked": leaked,
+        }, indent=2))
+
+    failed = False
+    if median_ms > args.budget_ms:
+        print(f"[FAIL] Startup budget exceeded by {median_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if leaked:
+        print("[FAIL] Heavy modules must be imported lazily")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("[OK] Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
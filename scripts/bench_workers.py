@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Multi-worker read scaling benchmark.
+
+Starts the real server under uvicorn with 1, 2, 4... worker processes against
+an existing corpus, drives it with concurrent keep-alive clients running a mix
+of read requests (list pages, paper details, facets, search) and reports
+throughput, latency and scaling efficiency relative to one worker.
+
+Build a corpus first, e.g. with the read-path benchmark:
+
+    python scripts/bench_read_path.py --db bench/corpus.db --requests 1
+    python scripts/bench_workers.py --db bench/corpus.db --workers 1,2,4
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import statistics
+import subprocess
+import http.client
+import multiprocessing
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure read throughput across uvicorn worker counts")
+    parser.add_argument("--db", type=Path, required=True, help="Existing corpus database")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client processes")
+    parser.add_argument("--duration", type=float, default=15.0, help="Timed seconds per worker count")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Untimed seconds per worker count")
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args()
+
+
+def request_mix(papers: int, rng: random.Random) -> str:
+    """One URL from the read mix the frontend generates"""
+    roll = rng.random()
+    if roll < 0.4:
+        return f"/api/papers/?limit=20&offset={rng.randrange(0, min(papers, 2000), 20)}"
+    if roll < 0.8:
+        return f"/api/papers/{rng.randint(1, papers)}"
+    if roll < 0.9:
+        return "/api/facets/"
+    return "/api/papers/search?q=honeypot&limit=20"
+
+
+def client_loop(port: int, papers: int, seed: int, warmup_until: float, stop_at: float, results):
+    """Issue requests over one keep-alive connection; report timed latencies in ms"""
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies, errors = [], 0
+    while True:
+        now = time.perf_counter()
+        if now >= stop_at:
+            break
+        try:
+            connection.request("GET", request_mix(papers, rng))
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            ok = False
+        if now >= warmup_until:
+            if ok:
+                latencies.append((time.perf_counter() - now) * 1000)
+            else:
+                errors += 1
+    connection.close()
+    results.put((latencies, errors))
+
+
+def wait_until_healthy(port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become healthy")
+
+
+def run(workers: int, args, papers: int) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_PATH": str(args.db.resolve()),
+        "DIGEST_PATH": str(args.db.resolve().parent / "digests"),
+        "GROK_API_KEY": env.get("GROK_API_KEY", "unused"),
+        "JOB_WORKER_IN_PROCESS": "false",
+        "SCHEDULER_ENABLED": "false",
+        "SLOW_QUERY_MS": "0",
+        "DEBUG": "false",
+    })
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=project_root, env=env
+    )
+    try:
+        wait_until_healthy(args.port)
+
+        results = multiprocessing.Queue()
+        warmup_until = time.perf_counter() + args.warmup
+        stop_at = warmup_until + args.duration
+        clients = [
+            multiprocessing.Process(target=client_loop,
+                                    args=(args.port, papers, seed, warmup_until, stop_at, results))
+            for seed in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        collected = [results.get() for _ in clients]
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = sorted(ms for batch, _ in collected for ms in batch)
+    errors = sum(count for _, count in collected)
+    if not latencies:
+        raise RuntimeError(f"No successful requests with {workers} worker(s)")
+    return {
+        "workers": workers,
+        "throughput_rps": len(latencies) / args.duration,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+        "mean_ms": statistics.fmean(latencies),
+        "errors": errors,
+    }
+
+
+def main():
+    args = parse_args()
+    if not args.db.exists():
+        print(f"ERROR: {args.db} not found; create a corpus with scripts/bench_read_path.py --db {args.db}")
+        sys.exit(1)
+
+    with sqlite3.connect(args.db) as conn:
+        papers = conn.execute("SELECT max(id) FROM papers").fetchone()[0] or 0
+    if not papers:
+        print(f"ERROR: {args.db} has no papers")
+        sys.exit(1)
+
+    worker_counts = [int(count) for count in args.workers.split(",")]
+    cpus = os.cpu_count() or 1
+
+    print("=" * 80)
+    print(f"WORKER SCALING BENCHMARK - {papers:,} papers, {args.clients} clients, {cpus} CPUs")
+    print("=" * 80)
+    if max(worker_counts) > cpus:
+        print(f"Note: more workers than CPUs; scaling beyond {cpus} worker(s) is not expected")
+
+    baseline = None
+    for workers in worker_counts:
+        result = run(workers, args, papers)
+        baseline = baseline or result["throughput_rps"] / result["workers"]
+        speedup = result["throughput_rps"] / baseline
+        print(f"  {workers:>2} worker(s)  {result['throughput_rps']:8.1f} req/s  "
+              f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+              f"speedup {speedup:5.2f}x  efficiency {100 * speedup / workers:5.1f}%  "
+              f"errors {result['errors']}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
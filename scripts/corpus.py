@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Export or import the corpus (papers, Grok analyses, bookmarks, feeds)
+as compressed JSONL, e.g. to move an instance or merge two of them.
+
+Usage:
+    python scripts/corpus.py export corpus.jsonl.gz
+    python scripts/corpus.py import corpus.jsonl.gz
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.database import engine, init_db
+from backend.services.corpus_service import CorpusTransfer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the corpus to/from JSONL")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", type=Path, help="Corpus file (.jsonl.gz)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    init_db()
+    transfer = CorpusTransfer(engine, batch_size=args.batch_size)
+
+    if args.command == "export":
+        counts = transfer.export_to(args.path)
+    else:
+        if not args.path.exists():
+            print(f"ERROR: {args.path} not found")
+            sys.exit(1)
+        counts = transfer.import_from(args.path)
+
+    print("=" * 80)
+    print(f"{args.command.capitalize()} complete: {args.path}")
+    for table, count in counts.items():
+        print(f"  {table}: {count}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Maintain the papers_fts full-text index.
+
+Usage:
+    python scripts/fts_maintenance.py stats             # index size and search timings
+    python scripts/fts_maintenance.py integrity-check   # verify the index against the papers table
+    python scripts/fts_maintenance.py merge [--full]    # what the background merge_fts job does, until done
+    python scripts/fts_maintenance.py optimize          # merge every segment in one transaction
+    python scripts/fts_maintenance.py rebuild           # rebuild the index from the papers table
+
+Every command prints stats afterwards, so timings can be compared before and after.
+"""
+import sys
+import time
+import argparse
+import logging
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.exc import DatabaseError
+
+from backend.database import SessionLocal, engine, check_fts, optimize_fts, rebuild_fts
+from backend.dependencies import get_fts_maintenance
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+logging.getLogger("backend.sql.slow").setLevel(logging.ERROR)  # The timed searches are slow on purpose
+
+SAMPLE_QUERIES = ["prompt injection", "adversarial", "llm*", "jailbreak OR backdoor", "\"large language model\""]
+
+# The query /api/papers/search runs
+SEARCH_SQL = text("""
+    SELECT papers.id
+    FROM papers
+    JOIN papers_fts ON papers.id = papers_fts.rowid
+    WHERE papers_fts MATCH :query
+    ORDER BY papers.published_date DESC
+    LIMIT 20
+""")
+
+
+def print_stats(queries, runs: int):
+    """Index size, papers since the last full merge, and median search time per query"""
+    maintenance = get_fts_maintenance()
+    db = SessionLocal()
+    try:
+        blocks, size = db.execute(text("SELECT count(*), coalesce(sum(length(block)), 0) FROM papers_fts_data")).one()
+        papers = db.execute(text("SELECT count(*) FROM papers")).scalar()
+        pending = maintenance.papers_since_optimize(db)
+
+        print(f"Index: {papers} papers, {blocks} blocks, {size / 1e6:.1f} MB; "
+              f"{pending} papers added since the last full merge")
+        for query in queries:
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                db.execute(SEARCH_SQL, {"query": query}).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"  {query:<32} median {statistics.median(timings):7.2f} ms, max {max(timings):7.2f} ms")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the papers_fts full-text index")
+    parser.add_argument("command", choices=["stats", "integrity-check", "merge", "optimize", "rebuild"])
+    parser.add_argument("--full", action="store_true", help="merge: merge every segment into one")
+    parser.add_argument("--query", action="append", dest="queries",
+                        help="Search to time (repeatable; default: a few sample queries)")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per query")
+    args = parser.parse_args()
+
+    maintenance = get_fts_maintenance()
+    started_at = datetime.utcnow()
+    started = time.perf_counter()
+    failed = False
+
+    if args.command == "integrity-check":
+        try:
+            with engine.begin() as conn:
+                check_fts(conn)
+            print(f"Index is consistent with the papers table ({time.perf_counter() - started:.2f}s)")
+        except DatabaseError as e:
+            failed = True
+            print(f"ERROR: integrity check failed after {time.perf_counter() - started:.2f}s: {e.orig}")
+            print("Run 'python scripts/fts_maintenance.py rebuild' to rebuild the index")
+    elif args.command == "merge":
+        steps, _ = maintenance.merge(args.full)
+        print(f"{'Full merge' if args.full else 'Merge'}: {steps} steps in {time.perf_counter() - started:.2f}s")
+    elif args.command in ("optimize", "rebuild"):
+        with engine.begin() as conn:
+            (optimize_fts if args.command == "optimize" else rebuild_fts)(conn)
+        print(f"{args.command.capitalize()}: {time.perf_counter() - started:.2f}s")
+
+    if args.command in ("optimize", "rebuild") or (args.command == "merge" and args.full):
+        db = SessionLocal()
+        try:
+            maintenance.record_optimize(db, "manual", started_at)
+        finally:
+            db.close()
+
+    print("=" * 80)
+    print_stats(args.queries or SAMPLE_QUERIES, args.runs)
+    print("=" * 80)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
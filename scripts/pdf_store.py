@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Maintain the content-addressed PDF store.
+
+Usage:
+    python scripts/pdf_store.py stats
+    python scripts/pdf_store.py migrate [--delete-unreferenced]   # move flat data/pdfs/<id>.pdf files into the store
+    python scripts/pdf_store.py verify                            # reconcile index, papers and files
+    python scripts/pdf_store.py evict                             # apply PDF_STORAGE_QUOTA_MB now
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func
+
+from backend.database import SessionLocal, init_db
+from backend.dependencies import get_pdf_store
+from backend.models import Paper, PdfBlob
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def migrate(store, delete_unreferenced: bool):
+    """Move PDFs referenced by papers but not yet in the store into it"""
+    moved = deduplicated = missing = 0
+    db = SessionLocal()
+    try:
+        stored_paths = {path for (path,) in db.query(PdfBlob.path)}
+        papers = db.query(Paper).filter(Paper.pdf_local_path.isnot(None)).all()
+        for paper in papers:
+            if paper.pdf_local_path in stored_paths:
+                continue
+            source = Path(paper.pdf_local_path)
+            if source.is_file():
+                stored = store.add_file(source)
+                stored_paths.add(str(stored.path))
+                paper.pdf_local_path = str(stored.path)
+                moved += 1
+                deduplicated += stored.deduplicated
+            else:
+                logger.warning(f"PDF of {paper.arxiv_id} is missing: {source}")
+                paper.pdf_local_path = None
+                missing += 1
+            db.commit()
+    finally:
+        db.close()
+
+    leftovers = sorted(store.root.glob("*.pdf")) + sorted(store.root.glob("*.part"))
+    if delete_unreferenced:
+        for path in leftovers:
+            path.unlink()
+
+    print("=" * 80)
+    print(f"Moved {moved} PDFs into the store ({deduplicated} were duplicates), {missing} were missing")
+    if leftovers:
+        action = "Deleted" if delete_unreferenced else "Left"
+        print(f"{action} {len(leftovers)} unreferenced files in {store.root}"
+              + ("" if delete_unreferenced else " (--delete-unreferenced removes them)"))
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the content-addressed PDF store")
+    parser.add_argument("command", choices=["stats", "migrate", "verify", "evict"])
+    parser.add_argument("--delete-unreferenced", action="store_true",
+                        help="migrate: delete flat-layout PDFs no paper refers to")
+    args = parser.parse_args()
+
+    init_db()
+    store = get_pdf_store()
+
+    if args.command == "migrate":
+        migrate(store, args.delete_unreferenced)
+    elif args.command == "verify":
+        report = store.verify()
+        print("=" * 80)
+        print(f"Dropped {report['missing_files']} index entries whose file was missing")
+        print(f"Cleared {report['cleared_papers']} paper paths that were not stored PDFs")
+        print(f"Indexed {report['indexed_files']} stored files that were not indexed")
+        print("=" * 80)
+    elif args.command == "evict":
+        if store.quota_bytes <= 0:
+            print("PDF_STORAGE_QUOTA_MB is not set; nothing to evict")
+            return
+        evicted = store.enforce_quota()
+        print(f"Evicted {evicted} PDFs")
+
+    db = SessionLocal()
+    try:
+        blobs, size = db.query(func.count(PdfBlob.sha256), func.coalesce(func.sum(PdfBlob.size), 0)).one()
+        papers = db.query(func.count(Paper.id)).filter(Paper.pdf_local_path.isnot(None)).scalar()
+    finally:
+        db.close()
+    quota = f"{store.quota_bytes / 1e6:.1f} MB quota" if store.quota_bytes else "no quota"
+    print(f"Store {store.root}: {blobs} PDFs, {size / 1e6:.1f} MB ({quota}), used by {papers} papers")
+
+
+if __name__ == "__main__":
+    main()
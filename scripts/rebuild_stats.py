@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Recompute the timeline statistics (paper_stats) from papers and analyses.
+
+The table is kept current by database triggers; run this after editing the
+database by hand or if the counts look wrong.
+
+Usage:
+    python scripts/rebuild_stats.py
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from backend.database import engine, init_db, rebuild_stats
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    init_db()
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rebuild_stats(conn)
+        rows, papers = conn.execute(
+            text("SELECT count(*), coalesce(sum(papers), 0) FROM paper_stats WHERE category = '*'")
+        ).one()
+
+    print("=" * 80)
+    print(f"Timeline statistics rebuilt in {time.perf_counter() - started:.1f}s")
+    print(f"  {papers} papers over {rows} publication days")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
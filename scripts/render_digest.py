@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Render the daily digest of newly fetched papers to DIGEST_PATH.
+
+Fetches queue this automatically; run it to re-render a day or to fill in
+digests for days fetched before digests existed.
+
+Usage:
+    python scripts/render_digest.py                  # today (UTC)
+    python scripts/render_digest.py --day 2025-06-02
+    python scripts/render_digest.py --days 30         # the last 30 days
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.database import SessionLocal, init_db
+from backend.dependencies import get_digest_service
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render daily digests of newly fetched papers")
+    parser.add_argument("--day", type=date.fromisoformat, help="UTC day to render (default: today)")
+    parser.add_argument("--days", type=int, default=1, help="Render this many days ending at --day")
+    args = parser.parse_args()
+
+    init_db()
+    digest_service = get_digest_service()
+    last_day = args.day or datetime.utcnow().date()
+
+    print("=" * 80)
+    db = SessionLocal()
+    try:
+        # Oldest first, so the newest day ends up as index.html
+        for offset in range(args.days - 1, -1, -1):
+            day = last_day - timedelta(days=offset)
+            digest = digest_service.render(db, day)
+            print(f"  {day}: {len(digest['papers'])} papers, {digest['analyzed']} analyzed")
+    finally:
+        db.close()
+    print(f"Digests written to {digest_service.root}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
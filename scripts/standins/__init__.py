@@ -0,0 +1 @@
+# Local stand-in servers for exercising the pipeline offline
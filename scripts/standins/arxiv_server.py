@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the arXiv search API and PDF downloads.
+
+Serves an Atom feed of synthetic recent papers at /api/query and fake PDFs
+at /pdf/<id>, with configurable latency, 429/503 injection and malformed
+feeds. Each query matches a deterministic two-thirds of the pool, so
+several saved feeds overlap the way real ones do. Point the app at it with
+ARXIV_API_URL=<url>.
+"""
+import sys
+import zlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.standins.faults import Faults
+
+CATEGORY_MIX = [["cs.CR", "cs.AI"], ["cs.CR"], ["cs.CR", "cs.LG"], ["cs.CR", "cs.CL"]]
+
+
+class ArxivStandin:
+    def __init__(
+        self,
+        papers: int = 200,
+        window_hours: float = 72.0,
+        pdf_bytes: int = 256 * 1024,
+        faults: Faults = None,
+        pdf_faults: Faults = None,
+        port: int = 0
+    ):
+        """
+        Initialize the stand-in arXiv server.
+
+        Args:
+            papers: Size of the paper pool
+            window_hours: Papers are published evenly over this many recent hours
+            pdf_bytes: Size of each served PDF
+            faults: Fault injection for /api/query
+            pdf_faults: Fault injection for /pdf/ downloads
+            port: Port to bind (0 picks a free port)
+        """
+        self.papers = papers
+        self.pdf_bytes = pdf_bytes
+        self.faults = faults or Faults()
+        self.pdf_faults = pdf_faults or Faults()
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.step = timedelta(hours=window_hours) / max(papers, 1)
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        """Value for ARXIV_API_URL"""
+        return f"{self.base}/api/query"
+
+    def start(self) -> "ArxivStandin":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def matching(self, query: str):
+        """Indexes of the pool matched by a query, newest first"""
+        salt = zlib.crc32(query.encode("utf-8"))
+        return [i for i in range(self.papers) if (salt + i) % 3 != 0]
+
+    def _entry(self, index: int) -> str:
+        arxiv_id = f"{self.now:%y%m}.{index + 1:05d}v1"
+        published = (self.now - self.step * index).strftime("%Y-%m-%dT%H:%M:%SZ")
+        categories = CATEGORY_MIX[index % len(CATEGORY_MIX)]
+        return (
+            f"<entry><id>http://arxiv.org/abs/{arxiv_id}</id>"
+            f"<updated>{published}</updated><published>{published}</published>"
+            f"<title>Stand-in study {index} of prompt injection\n  against LLM agents</title>"
+            f"<summary>{escape(f'We evaluate synthetic attack {index} on large language models & tools.')}</summary>"
+            f"<author><name>Ada Lovelace</name></author><author><name>Alan Turing</name></author>"
+            f"<link href=\"http://arxiv.org/abs/{arxiv_id}\" rel=\"alternate\" type=\"text/html\"/>"
+            f"<link title=\"pdf\" href={quoteattr(f'{self.base}/pdf/{arxiv_id}')} rel=\"related\" "
+            f"type=\"application/pdf\"/>"
+            f"<arxiv:primary_category term=\"{categories[0]}\"/>"
+            + "".join(f"<category term=\"{c}\"/>" for c in categories)
+            + "</entry>"
+        )
+
+    def render_feed(self, query: dict) -> str:
+        """Atom page for search_query/start/max_results, sorted newest first"""
+        matches = self.matching(query.get("search_query", ""))
+        start = int(query.get("start", 0))
+        page = matches[start:start + int(query.get("max_results", 10))]
+        return (
+            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            "<feed xmlns=\"http://www.w3.org/2005/Atom\" "
+            "xmlns:opensearch=\"http://a9.com/-/spec/opensearch/1.1/\" "
+            "xmlns:arxiv=\"http://arxiv.org/schemas/atom\">"
+            f"<title>Stand-in arXiv query</title><updated>{self.now:%Y-%m-%dT%H:%M:%SZ}</updated>"
+            f"<opensearch:totalResults>{len(matches)}</opensearch:totalResults>"
+            f"<opensearch:startIndex>{start}</opensearch:startIndex>"
+            f"<opensearch:itemsPerPage>{len(page)}</opensearch:itemsPerPage>"
+            + "".join(self._entry(i) for i in page)
+            + "</feed>"
+        )
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path.startswith("/pdf/"):
+                    faults, kind = standin.pdf_faults, "pdf"
+                else:
+                    faults, kind = standin.faults, "query"
+
+                outcome = faults.draw(kind)
+                if faults.send_fault(self, outcome):
+                    return
+
+                if kind == "pdf":
+                    payload = b"%PDF-1.4\n" + b"0" * max(standin.pdf_bytes - 9, 0)
+                    content_type = "application/pdf"
+                else:
+                    query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                    payload = standin.render_feed(query).encode("utf-8")
+                    content_type = "application/atom+xml; charset=utf-8"
+                if outcome == "malformed":
+                    payload = payload[:len(payload) // 3]
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in arXiv API and PDF server")
+    parser.add_argument("--port", type=int, default=8802)
+    parser.add_argument("--papers", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    faults = Faults(latency=args.latency, throttle_rate=args.throttle_rate,
+                    error_rate=args.error_rate, malformed_rate=args.malformed_rate)
+    standin = ArxivStandin(args.papers, faults=faults, port=args.port)
+    print(f"Stand-in arXiv API at {standin.url}")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Fault injection shared by the HTTP stand-ins.
+
+Each request draws one outcome: throttled (429 + Retry-After), server error
+(503), malformed body or normal, after sleeping for the configured latency.
+"""
+import time
+import random
+import threading
+from collections import Counter
+
+
+class Faults:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0
+    ):
+        """
+        Args:
+            latency: Seconds added to every response
+            jitter: Extra uniform random latency in [0, jitter] seconds
+            throttle_rate: Fraction of requests answered 429 with Retry-After
+            error_rate: Fraction of requests answered 503
+            malformed_rate: Fraction of successful responses with a corrupt body
+            retry_after: Value of the Retry-After header on 429 responses
+            seed: Seed for the outcome draws
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+        self.counts = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self, kind: str = "request") -> str:
+        """Sleep for the latency and pick an outcome: throttled, error, malformed or ok"""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                outcome = "throttled"
+            elif roll < self.throttle_rate + self.error_rate:
+                outcome = "error"
+            elif self._random.random() < self.malformed_rate:
+                outcome = "malformed"
+            else:
+                outcome = "ok"
+            self.counts[kind] += 1
+            self.counts[f"{kind}_{outcome}"] += 1
+        if delay > 0:
+            time.sleep(delay)
+        return outcome
+
+    def send_fault(self, handler, outcome: str) -> bool:
+        """Write the 429/503 response for a fault outcome; returns False for ok/malformed"""
+        if outcome == "throttled":
+            handler.send_response(429)
+            handler.send_header("Retry-After", f"{self.retry_after:g}")
+        elif outcome == "error":
+            handler.send_response(503)
+        else:
+            return False
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+        return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint (Grok).
+
+Answers POST /v1/chat/completions with a JSON array of key points, with
+configurable latency, 429/503 injection and malformed replies (prose,
+truncated JSON or an object without the array). Requests with a json_schema
+response_format get {"key_points": [...]} as a schema-following server would. Point the app at it with
+GROK_API_URL=<url>.
+"""
+import sys
+import json
+import argparse
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.standins.faults import Faults
+
+MALFORMED_REPLIES = [
+    "Here are the key insights from the paper:\n- Prompt injection remains unsolved",
+    '["Attack succeeds on 4 of 5 agents", "Defense reduces success rate',
+    '```json\n{"points": "not an array"}\n```',
+]
+
+
+class GrokStandin:
+    def __init__(self, faults: Faults = None, points: int = 6, port: int = 0):
+        """
+        Initialize the stand-in chat completions server.
+
+        Args:
+            faults: Fault injection (latency, 429/503, malformed replies)
+            points: Key points per well-formed reply
+            port: Port to bind (0 picks a free port)
+        """
+        self.faults = faults or Faults()
+        self.points = points
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+        self._malformed = 0
+
+    @property
+    def url(self) -> str:
+        """Value for GROK_API_URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def start(self) -> "GrokStandin":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def completion(self, request: dict, malformed: bool) -> dict:
+        prompt = " ".join(m.get("content", "") for m in request.get("messages", []))
+        if malformed:
+            self._malformed += 1
+            content = MALFORMED_REPLIES[self._malformed % len(MALFORMED_REPLIES)]
+        else:
+            points = [f"Stand-in insight {i + 1} on the submitted paper" for i in range(self.points)]
+            structured = (request.get("response_format") or {}).get("type") == "json_schema"
+            content = json.dumps({"key_points": points} if structured else points)
+        return {
+            "id": "chatcmpl-standin",
+            "object": "chat.completion",
+            "model": request.get("model", "standin"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4},
+        }
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                outcome = standin.faults.draw("chat")
+                if standin.faults.send_fault(self, outcome):
+                    return
+
+                try:
+                    request = json.loads(body or b"{}")
+                except json.JSONDecodeError:
+                    self.send_response(400)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                payload = json.dumps(standin.completion(request, outcome == "malformed")).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in OpenAI-compatible chat server")
+    parser.add_argument("--port", type=int, default=8803)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    faults = Faults(latency=args.latency, throttle_rate=args.throttle_rate,
+                    error_rate=args.error_rate, malformed_rate=args.malformed_rate)
+    standin = GrokStandin(faults, port=args.port)
+    print(f"Stand-in chat completions at {standin.url}")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the arXiv OAI-PMH endpoint.
+
+Serves synthetic arXivRaw records with resumption tokens so bulk harvests
+can be exercised offline. Run directly to get a standalone server, or use
+OaiStandin from another script.
+"""
+import argparse
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+CATEGORY_MIX = ["cs.CR cs.AI", "cs.LG", "cs.CR", "cs.CL cs.CR", "cs.DS"]
+
+
+def _record(index: int, start: datetime) -> str:
+    """Render record number `index` as an OAI <record> element"""
+    base_id = f"2401.{index:05d}"
+    datestamp = (start + timedelta(hours=index)).strftime("%Y-%m-%d")
+
+    if index % 50 == 49:
+        return (f"<record><header status=\"deleted\"><identifier>oai:arXiv.org:{base_id}</identifier>"
+                f"<datestamp>{datestamp}</datestamp></header></record>")
+
+    versions = "".join(
+        f"<version version=\"v{v}\"><date>{format_datetime(start + timedelta(hours=index, days=v - 1), usegmt=True)}"
+        f"</date><size>{100 + index}kb</size></version>"
+        for v in range(1, index % 3 + 2)
+    )
+    return (
+        f"<record><header><identifier>oai:arXiv.org:{base_id}</identifier>"
+        f"<datestamp>{datestamp}</datestamp><setSpec>cs</setSpec></header>"
+        f"<metadata><arXivRaw xmlns=\"http://arxiv.org/OAI/arXivRaw/\">"
+        f"<id>{base_id}</id><submitter>Stand In</submitter>{versions}"
+        f"<title>Synthetic paper {index} on\n  prompt injection defenses</title>"
+        f"<authors>Ada Lovelace, Alan Turing and Grace Hopper</authors>"
+        f"<categories>{CATEGORY_MIX[index % len(CATEGORY_MIX)]}</categories>"
+        f"<abstract>{escape(f'We study synthetic attack {index} against large language models & agents.')}"
+        f"</abstract></arXivRaw></metadata></record>"
+    )
+
+
+class OaiStandin:
+    def __init__(
+        self,
+        records: int = 250,
+        page_size: int = 100,
+        error_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        port: int = 0,
+        seed: int = 0
+    ):
+        """
+        Initialize the stand-in OAI server.
+
+        Args:
+            records: Total number of records in the repository
+            page_size: Records per ListRecords page
+            error_rate: Fraction of requests answered with 503 + Retry-After
+            truncate_rate: Fraction of pages cut off halfway (connection closed mid-body)
+            port: Port to bind (0 picks a free port)
+            seed: Seed for the error injection
+        """
+        self.records = records
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.start_date = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        self.requests = 0
+        self.errors = 0
+        self.truncated = 0
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/oai"
+
+    def start(self) -> "OaiStandin":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def render_page(self, query: dict) -> str:
+        """Render the ListRecords page selected by the query parameters"""
+        if "resumptionToken" in query:
+            token = query["resumptionToken"]
+            if not token.startswith("offset:"):
+                return self._error("badResumptionToken", "Unknown token")
+            offset = int(token.split(":", 1)[1])
+        else:
+            if query.get("metadataPrefix") != "arXivRaw":
+                return self._error("cannotDisseminateFormat", "Only arXivRaw is served")
+            offset = 0
+
+        if self.records == 0:
+            return self._error("noRecordsMatch", "No records")
+
+        end = min(offset + self.page_size, self.records)
+        body = "".join(_record(i, self.start_date) for i in range(offset, end))
+        token = f"offset:{end}" if end < self.records else ""
+        body += (f"<resumptionToken cursor=\"{offset}\" completeListSize=\"{self.records}\">"
+                 f"{token}</resumptionToken>")
+        return self._envelope(f"<ListRecords>{body}</ListRecords>")
+
+    def _envelope(self, content: str) -> str:
+        return ("<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+                "<OAI-PMH xmlns=\"http://www.openarchives.org/OAI/2.0/\">"
+                f"<responseDate>{datetime.utcnow().isoformat()}Z</responseDate>"
+                f"<request verb=\"ListRecords\">{escape(self.url)}</request>{content}</OAI-PMH>")
+
+    def _error(self, code: str, message: str) -> str:
+        return self._envelope(f"<error code=\"{code}\">{escape(message)}</error>")
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                standin.requests += 1
+                if standin._random.random() < standin.error_rate:
+                    standin.errors += 1
+                    self.send_response(503)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                payload = standin.render_page(query).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if standin._random.random() < standin.truncate_rate:
+                    standin.truncated += 1
+                    payload = payload[:len(payload) // 2]
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in arXiv OAI-PMH server")
+    parser.add_argument("--port", type=int, default=8801)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    standin = OaiStandin(args.records, args.page_size, args.error_rate, args.truncate_rate, port=args.port)
+    print(f"Stand-in OAI-PMH server at {standin.url}")
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.database import SessionLocal
-from backend.services.arxiv_service import ArxivService
-from backend.services.grok_service import GrokService
-from backend.services.paper_service import PaperService
+from backend.dependencies import get_paper_service
+from backend.tasks.worker import create_worker
 from backend.config import settings
 
 # Configure logging
@@ -33,16 +32,14 @@ async def main():
 
     try:
         # Initialize services
-        arxiv_service = ArxivService()
-        grok_service = GrokService(api_key=settings.GROK_API_KEY)
-        paper_service = PaperService(arxiv_service, grok_service)
+        paper_service = get_paper_service()
 
         # Temporarily override max results
         original_max = settings.ARXIV_MAX_RESULTS
         settings.ARXIV_MAX_RESULTS = 5
 
         # Fetch papers
-        papers_added, papers_skipped = await paper_service.fetch_new_papers(
+        papers_added, papers_updated, papers_skipped = await paper_service.fetch_new_papers(
             db=db,
             days_back=7
         )
@@ -50,9 +47,13 @@ async def main():
         # Restore original max
         settings.ARXIV_MAX_RESULTS = original_max
 
+        # Run the queued Grok analyses
+        await create_worker(paper_service).drain()
+
         print("=" * 80)
         print(f"Test fetch completed!")
         print(f"Papers added: {papers_added}")
+        print(f"Papers updated: {papers_updated}")
         print(f"Papers skipped: {papers_skipped}")
         print("=" * 80)
         print("\nYou can now open http://127.0.0.1:8000 in your browser to view the papers!")
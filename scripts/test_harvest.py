@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Offline test of the OAI-PMH bulk harvest against the local stand-in server.
+Harvests into a temporary database, interrupts after one page, crashes
+partway through the next and resumes, with 503s and pages cut off halfway
+injected. Two papers are stored beforehand, one as an older and one as a
+newer version than the harvest lists.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Point the app at a throwaway database before backend modules load settings
+tmp_dir = tempfile.mkdtemp(prefix="harvest_test_")
+os.environ["DATABASE_PATH"] = str(Path(tmp_dir) / "harvest.db")
+os.environ.setdefault("GROK_API_KEY", "unused")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.database import SessionLocal, init_db
+from backend.models import Paper, Job
+from backend.services.oai_service import OaiHarvester
+from scripts.standins.oai_server import OaiStandin, CATEGORY_MIX
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+class CrashingHarvester(OaiHarvester):
+    """Dies on the crash_on-th batch insert, as a killed process would"""
+
+    def __init__(self, *args, crash_on: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.crash_on = crash_on
+        self.inserts = 0
+
+    def _insert_batch(self, db, rows, feed_id):
+        self.inserts += 1
+        if self.inserts == self.crash_on:
+            raise SimulatedCrash()
+        return super()._insert_batch(db, rows, feed_id)
+
+
+def main():
+    print("=" * 80)
+    print("TEST HARVEST - stand-in OAI server, interrupted and resumed")
+    print("=" * 80)
+
+    records, page_size = 250, 100
+    standin = OaiStandin(records=records, page_size=page_size, error_rate=0.2, truncate_rate=0.3, seed=7).start()
+    init_db()
+    db = SessionLocal()
+
+    try:
+        # 2401.00002 is harvested as v3 and 2401.00003 as v1
+        for arxiv_id, title, pdf in [("2401.00002v1", "Old title", "data/pdfs/old.pdf"),
+                                     ("2401.00003v2", "Newer title", None)]:
+            db.add(Paper(arxiv_id=arxiv_id, base_id=arxiv_id[:-2], title=title, authors=["A"], abstract="Old",
+                         published_date=datetime(2024, 1, 1), updated_date=datetime(2024, 2, 1),
+                         pdf_url="", pdf_local_path=pdf, categories=["cs.CR"], primary_category="cs.CR"))
+        db.commit()
+
+        harvester = OaiHarvester(standin.url, batch_size=40, rate_limit_delay=0)
+
+        checkpoint = harvester.harvest(db, name="test", max_pages=1)
+        assert checkpoint.completed_at is None, "harvest should pause after one page"
+        assert checkpoint.resumption_token == f"offset:{page_size}"
+
+        # Crash after the first batch of the second page was committed
+        crashing = CrashingHarvester(standin.url, batch_size=40, rate_limit_delay=0, crash_on=2)
+        try:
+            crashing.harvest(db, name="test")
+            raise AssertionError("harvest should have crashed")
+        except SimulatedCrash:
+            db.rollback()
+        assert checkpoint.resumption_token == f"offset:{page_size}"
+        assert checkpoint.page_position, "crash should leave a partly stored page"
+
+        checkpoint = harvester.harvest(db, name="test")
+        assert checkpoint.completed_at is not None, "harvest should complete on resume"
+
+        live = [i for i in range(records) if i % 50 != 49]
+        expected = sum(1 for i in live if "cs.CR" in CATEGORY_MIX[i % len(CATEGORY_MIX)].split())
+        stored = db.query(Paper).count()
+        assert stored == expected == checkpoint.papers_added + 2, (stored, expected, checkpoint.papers_added)
+        # Records of a page cut off halfway, or stored partly before a crash, are counted once
+        assert checkpoint.records_seen == len(live), (checkpoint.records_seen, len(live))
+
+        paper = db.query(Paper).filter(Paper.arxiv_id == "2401.00002v3").one()
+        assert paper.authors == ["Ada Lovelace", "Alan Turing", "Grace Hopper"]
+        assert "\n" not in paper.title
+        # The older stored version was updated in place; its PDF was of v1
+        assert db.query(Paper).filter(Paper.base_id == "2401.00002").count() == 1
+        assert paper.pdf_local_path is None
+        # The newer stored version was kept
+        assert db.query(Paper).filter(Paper.base_id == "2401.00003").one().title == "Newer title"
+        # New papers and the one whose abstract changed are queued for analysis
+        queued = {job.payload["paper_id"] for job in db.query(Job).filter(Job.kind == "analyze_paper")}
+        assert len(queued) == checkpoint.papers_added + 1 and paper.id in queued, (len(queued), checkpoint.papers_added)
+
+        print(f"[SUCCESS] {stored} papers harvested, {standin.errors} injected 503s and "
+              f"{standin.truncated} truncated pages survived")
+
+    finally:
+        db.close()
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()